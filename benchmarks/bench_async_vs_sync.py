@@ -0,0 +1,114 @@
+"""
+Benchmark: rotas de leitura síncronas (threadpool) vs. assíncronas (aiosqlite).
+
+Uso:
+    python -m benchmarks.bench_async_vs_sync [CLIENTES] [REQUISICOES_POR_CLIENTE]
+
+Monta um app FastAPI mínimo com a mesma consulta de página de transações
+exposta em duas rotas, `def` (Session + TransactionRepository) e `async def`
+(AsyncSession + AsyncTransactionRepository), e dispara CLIENTES (padrão 500)
+clientes concorrentes via httpx.AsyncClient/ASGITransport contra cada uma.
+Mede vazão e latências p50/p99 por requisição.
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_async_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'bench.db'}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.setdefault("LOG_FILE", str(_tmp / "bench.log"))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+
+from src.repositories import db as db_mod  # noqa: E402
+from src.repositories.transaction_repo import (  # noqa: E402
+    AsyncTransactionRepository,
+    TransactionRepository,
+)
+
+USERS = 50
+
+
+def _seed() -> None:
+    db_mod.init_db()
+    with db_mod.SessionLocal() as s:
+        TransactionRepository(s).bulk_add([
+            {"amount_cents": (1 + i % 50) * 100, "date": date(2025, 1 + i % 12, 1 + i % 28),
+             "description": None, "type": "Despesa", "user_id": 1 + i % USERS, "category_id": 1}
+            for i in range(50000)
+        ])
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+
+    def get_db():
+        db = db_mod.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with db_mod.async_session() as db:
+            yield db
+
+    @app.get("/sync/{user_id}")
+    def sync_page(user_id: int, db=Depends(get_db)):
+        items, _ = TransactionRepository(db).list_page(user_id=user_id, limit=50)
+        return len(items)
+
+    @app.get("/async/{user_id}")
+    async def async_page(user_id: int, db=Depends(get_async_db)):
+        items, _ = await AsyncTransactionRepository(db).list_page(user_id=user_id, limit=50)
+        return len(items)
+
+    return app
+
+
+async def _run(app: FastAPI, prefix: str, clients: int, per_client: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+
+        async def client(n: int) -> None:
+            for i in range(per_client):
+                t0 = time.perf_counter()
+                r = await http.get(f"{prefix}/{1 + (n + i) % USERS}")
+                latencies.append(time.perf_counter() - t0)
+                assert r.status_code == 200 and r.json() == 50
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client(n) for n in range(clients)))
+        elapsed = time.perf_counter() - t0
+    return elapsed, latencies
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    _seed()
+    app = _build_app()
+
+    print(f"{clients} clientes x {per_client} requisições")
+    for prefix in ("/sync", "/async"):
+        elapsed, lat = asyncio.run(_run(app, prefix, clients, per_client))
+        lat.sort()
+        p99 = lat[int(len(lat) * 0.99) - 1]
+        print(
+            f"{prefix:>7}: {len(lat) / elapsed:8.0f} req/s  "
+            f"p50={statistics.median(lat) * 1000:7.1f} ms  p99={p99 * 1000:7.1f} ms"
+        )
+        if prefix == "/async":
+            asyncio.run(db_mod.dispose_async_engine())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: FinanceService.balance varrendo as transações vs. livro de saldos.
+
+Uso:
+    python -m benchmarks.bench_balance [TRANSACOES] [CONSULTAS]
+
+Insere TRANSACOES (padrão 200 mil) transações de 100 usuários ao longo de
+3 anos (pelo TransactionRepository.bulk_add, que mantém o livro de saldos)
+e mede CONSULTAS (padrão 200) saldos atuais e em datas passadas com e sem
+o SQLBalanceLedger.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_balance_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'bench.db'}"
+os.environ.setdefault("LOG_FILE", str(_tmp / "bench.log"))
+
+from src.repositories import db as db_mod  # noqa: E402
+from src.repositories.balance_repo import SQLBalanceLedger  # noqa: E402
+from src.repositories.transaction_repo import TransactionRepository  # noqa: E402
+from src.services.finance_service import FinanceService  # noqa: E402
+
+USERS = 100
+START = date(2023, 1, 1)
+
+
+def _fill(total: int) -> None:
+    rnd = random.Random(42)
+    with db_mod.SessionLocal() as s:
+        repo = TransactionRepository(s)
+        for start in range(0, total, 20000):
+            repo.bulk_add([
+                {"amount_cents": rnd.randint(100, 50000),
+                 "date": START + timedelta(days=rnd.randrange(3 * 365)),
+                 "description": None,
+                 "type": rnd.choice(("Receita", "Despesa")),
+                 "user_id": rnd.randrange(1, USERS + 1), "category_id": 1}
+                for _ in range(start, min(start + 20000, total))
+            ])
+
+
+def _measure(fn, queries: int) -> float:
+    rnd = random.Random(7)
+    t0 = time.perf_counter()
+    for _ in range(queries):
+        fn(rnd.randrange(1, USERS + 1), START + timedelta(days=rnd.randrange(3 * 365)))
+    return (time.perf_counter() - t0) / queries * 1000
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    db_mod.init_db()
+    t0 = time.perf_counter()
+    _fill(total)
+    print(f"{total} transações inseridas em {time.perf_counter() - t0:.1f} s (com o livro de saldos)")
+
+    with db_mod.SessionLocal() as s:
+        repo = TransactionRepository(s)
+        repo.list = repo.list_all
+        scan = FinanceService(repo)
+        ledger = FinanceService(repo, ledger=SQLBalanceLedger(s))
+        scan_q = max(queries // 20, 3)  # a varredura é lenta: menos repetições
+        cases = (
+            ("varredura, atual", lambda u, d: scan.balance(u), scan_q),
+            ("varredura, as_of", scan.balance, scan_q),
+            ("livro, atual", lambda u, d: ledger.balance(u), queries),
+            ("livro, as_of", ledger.balance, queries),
+        )
+        for name, fn, n in cases:
+            print(f"  {name:>17}: {_measure(fn, n):9.3f} ms/consulta ({n} consultas)")
+            s.expunge_all()
+
+
+if __name__ == "__main__":
+    main()
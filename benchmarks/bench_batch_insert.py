@@ -0,0 +1,70 @@
+"""
+Benchmark: criação de transações uma a uma vs. POST /transactions/batch.
+
+Uso:
+    python -m benchmarks.bench_batch_insert [N]
+
+Mede as duas rotas de serviço (TransactionService.create_transaction em laço e
+TransactionService.create_transactions_batch) sobre um SQLite temporário.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+
+def main(n: int = 2000) -> None:
+    tmp = Path(tempfile.mkdtemp())
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp / 'bench.db'}"
+    os.environ["MONTHLY_LIMIT"] = "1e12"
+    os.environ.setdefault("LOG_FILE", str(tmp / "bench.log"))
+
+    from src.repositories.db import SessionLocal, init_db
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.transaction_service import TransactionService
+    from src.models.user import User
+    from src.models.category import Category
+
+    init_db()
+    db = SessionLocal()
+    user = UserRepository(db).add(User(name="Bench", email="bench@example.com"))
+    cat = CategoryRepository(db).add(Category(name="Mercado", type="Despesa"))
+    svc = TransactionService(TransactionRepository(db), UserRepository(db), CategoryRepository(db))
+
+    items = [
+        {
+            "amount": 1.0 + i % 50,
+            "date": date(2025, 1 + i % 12, 1 + i % 28),
+            "description": f"item {i}",
+            "type": "Despesa",
+            "user_id": user.id,
+            "category_id": cat.id,
+        }
+        for i in range(n)
+    ]
+
+    t0 = time.perf_counter()
+    for it in items:
+        svc.create_transaction(
+            it["amount"], it["date"], it["description"], it["type"], it["user_id"], it["category_id"]
+        )
+    single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = svc.create_transactions_batch(items)
+    batch = time.perf_counter() - t0
+    assert all(r["status"] == "created" for r in results)
+
+    print(f"itens:        {n}")
+    print(f"um a um:      {single:8.3f}s  ({n / single:10.0f} tx/s)")
+    print(f"lote:         {batch:8.3f}s  ({n / batch:10.0f} tx/s)")
+    print(f"ganho:        {single / batch:8.1f}x")
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,97 @@
+"""
+Benchmark: relatório por categoria com JOIN/GROUP BY no banco vs. a junção
+feita pelo cliente (todas as transações do usuário + todas as categorias).
+
+Uso:
+    python -m benchmarks.bench_category_breakdown [TRANSACOES] [USUARIOS] [CONSULTAS]
+
+Insere TRANSACOES (padrão 1 milhão) transações de USUARIOS (padrão 100)
+usuários em 20 categorias ao longo de 3 anos (INSERT direto na tabela: o
+relatório não depende dos consolidados) e mede, para usuários aleatórios,
+o histórico completo e um mês.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_breakdown_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'bench.db'}"
+os.environ.setdefault("LOG_FILE", str(_tmp / "bench.log"))
+
+from sqlalchemy import insert  # noqa: E402
+
+from src.models.category import Category  # noqa: E402
+from src.models.transaction import Transaction  # noqa: E402
+from src.repositories import db as db_mod  # noqa: E402
+from src.repositories.category_repo import CategoryRepository  # noqa: E402
+from src.repositories.transaction_repo import TransactionRepository  # noqa: E402
+from src.services.transaction_service import TransactionService  # noqa: E402
+
+START = date(2023, 1, 1)
+CATEGORIES = 20
+
+
+def _fill(total: int, users: int) -> None:
+    rnd = random.Random(42)
+    with db_mod.engine.begin() as conn:
+        conn.execute(insert(Category.__table__), [
+            {"id": i, "name": f"Categoria {i}", "type": "Receita" if i <= 4 else "Despesa"}
+            for i in range(1, CATEGORIES + 1)
+        ])
+        for start in range(0, total, 100_000):
+            rows = []
+            for _ in range(start, min(start + 100_000, total)):
+                cat = rnd.randrange(1, CATEGORIES + 1)
+                rows.append({
+                    "amount": round(rnd.uniform(1, 500), 2),
+                    "date": START + timedelta(days=rnd.randrange(3 * 365)),
+                    "description": None, "type": "Receita" if cat <= 4 else "Despesa",
+                    "user_id": rnd.randrange(1, users + 1), "category_id": cat,
+                })
+            conn.execute(insert(Transaction.__table__), rows)
+
+
+def _client_side(s, user_id, start, end) -> list:
+    # o que o front faz hoje: lista as transações e as categorias e junta em memória
+    cats = {c.id: c for c in CategoryRepository(s).list_all()}
+    acc = defaultdict(lambda: [0.0, 0])
+    for t in TransactionRepository(s).list_by_user(user_id):
+        if (start is None or t.date >= start) and (end is None or t.date <= end):
+            acc[t.category_id][0] += t.amount
+            acc[t.category_id][1] += 1
+    s.expunge_all()
+    return sorted(((cats[c].name, *v) for c, v in acc.items()), key=lambda r: -r[1])
+
+
+def _avg_ms(fn, users: int, queries: int) -> float:
+    rnd = random.Random(7)
+    t0 = time.perf_counter()
+    for _ in range(queries):
+        fn(rnd.randrange(1, users + 1))
+    return (time.perf_counter() - t0) / queries * 1000
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    db_mod.init_db()
+    _fill(total, users)
+    print(f"{total} transações, {users} usuários (~{total // users} por usuário), {CATEGORIES} categorias")
+
+    month = (date(2024, 6, 1), date(2024, 6, 30))
+    with db_mod.SessionLocal() as s:
+        svc = TransactionService(TransactionRepository(s), None, None)
+        for label, (start, end) in (("histórico", (None, None)), ("um mês", month)):
+            client = _avg_ms(lambda u: _client_side(s, u, start, end), users, max(queries // 4, 2))
+            sql = _avg_ms(lambda u: svc.category_breakdown(u, start, end), users, queries)
+            print(f"  {label:>9}: cliente {client:8.1f} ms | GROUP BY {sql:7.2f} ms | {client / sql:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
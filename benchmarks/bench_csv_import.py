@@ -0,0 +1,59 @@
+"""
+Benchmark: importação de CSV em streaming (TransactionService.import_transactions_csv).
+
+Uso:
+    python -m benchmarks.bench_csv_import [N]
+
+Gera um extrato com N linhas (padrão 1.000.000) em disco, importa sobre um
+SQLite temporário e mostra o tempo total e o pico de memória do processo.
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def main(n: int = 1_000_000) -> None:
+    tmp = Path(tempfile.mkdtemp())
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp / 'bench.db'}"
+    os.environ["MONTHLY_LIMIT"] = "1e15"
+    os.environ.setdefault("LOG_FILE", str(tmp / "bench.log"))
+
+    from src.repositories.db import SessionLocal, init_db
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.transaction_service import TransactionService
+    from src.models.user import User
+    from src.models.category import Category
+
+    init_db()
+    db = SessionLocal()
+    user = UserRepository(db).add(User(name="Bench", email="bench@example.com"))
+    cat = CategoryRepository(db).add(Category(name="Mercado", type="Despesa"))
+
+    csv_path = tmp / "extrato.csv"
+    with csv_path.open("w", encoding="utf-8") as f:
+        f.write("id,date,amount,type,description,user_id,category_id\n")
+        for i in range(n):
+            f.write(f",2025-{1 + i % 12:02d}-{1 + i % 28:02d},{1 + i % 97}.50,Despesa,compra {i},{user.id},{cat.id}\n")
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    svc = TransactionService(TransactionRepository(db), UserRepository(db), CategoryRepository(db))
+    t0 = time.perf_counter()
+    with csv_path.open("r", encoding="utf-8", newline="") as f:
+        res = svc.import_transactions_csv(f)
+    elapsed = time.perf_counter() - t0
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"linhas:       {n}")
+    print(f"importadas:   {res['imported']}  rejeitadas: {res['rejected']}")
+    print(f"tempo:        {elapsed:8.2f}s  ({n / elapsed:10.0f} linhas/s)")
+    print(f"pico RSS:     {rss_after / 1024:8.1f} MB (antes da importação: {rss_before / 1024:.1f} MB)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,88 @@
+"""
+Benchmark: serialização de listas grandes, response_model (Pydantic) vs. linhas + orjson.
+
+Uso:
+    python -m benchmarks.bench_list_serialization [LINHAS] [SEGUNDOS]
+
+Monta um app FastAPI mínimo com duas rotas que devolvem as mesmas LINHAS
+(padrão 10 mil) transações de um usuário:
+- "pydantic": objetos ORM validados por list[TransactionOut] (from_attributes)
+  e codificados pelo encoder padrão (caminho anterior das rotas de lista);
+- "orjson": tuplas da consulta por colunas -> dicts -> FastJSONResponse.
+Cada rota é chamada em sequência por SEGUNDOS (padrão 5) e o resultado é
+mostrado em requisições por segundo.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_json_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'bench.db'}"
+os.environ.setdefault("LOG_FILE", str(_tmp / "bench.log"))
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from src.controllers.schemas import TransactionOut  # noqa: E402
+from src.models.transaction import Transaction  # noqa: E402
+from src.repositories import db as db_mod  # noqa: E402
+from src.repositories.transaction_repo import ROW_COLUMNS, TransactionRepository  # noqa: E402
+from src.utils.json_response import (  # noqa: E402
+    TRANSACTION_FIELDS, FastJSONResponse, orjson, rows_to_dicts,
+)
+
+
+def _build_app(rows: int) -> FastAPI:
+    app = FastAPI()
+
+    def get_db():
+        db = db_mod.SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/pydantic", response_model=list[TransactionOut])
+    def pydantic_list(db=Depends(get_db)):
+        return list(db.execute(select(Transaction).order_by(Transaction.id).limit(rows)).scalars())
+
+    @app.get("/orjson", response_model=list[TransactionOut])
+    def orjson_list(db=Depends(get_db)):
+        result = db.execute(select(*ROW_COLUMNS).order_by(Transaction.id).limit(rows))
+        return FastJSONResponse(rows_to_dicts(result, TRANSACTION_FIELDS))
+
+    return app
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+
+    db_mod.init_db()
+    with db_mod.SessionLocal() as s:
+        TransactionRepository(s).bulk_add([
+            {"amount_cents": (1 + i % 50) * 100, "date": date(2025, 1 + i % 12, 1 + i % 28),
+             "description": f"item {i}", "type": "Despesa", "user_id": 1, "category_id": 1}
+            for i in range(rows)
+        ])
+
+    client = TestClient(_build_app(rows))
+    assert client.get("/pydantic").json() == client.get("/orjson").json()
+
+    print(f"{rows} linhas por resposta (encoder: {'orjson' if orjson else 'json'})")
+    for path in ("/pydantic", "/orjson"):
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            client.get(path)
+            count += 1
+        elapsed = time.perf_counter() - start
+        print(f"{path:>10}: {count / elapsed:7.1f} req/s  ({elapsed / count * 1000:6.1f} ms/req)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: custo das chamadas de log com o nível desabilitado (LOG_LEVEL=WARNING)
+e custo de formatação text vs. JSON com o nível habilitado.
+
+Uso:
+    python -m benchmarks.bench_logging_overhead [ITERACOES]
+
+1. Com o logger em WARNING, compara por chamada de log.info:
+   f-string (formata sempre), estilo % (formata só se habilitado) e
+   _log_event do TransactionService (checagem de nível + campos estruturados).
+2. Formata um mesmo registro com campos estruturados nos dois formatters.
+"""
+import logging
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_logov_"))
+os.environ["LOG_FILE"] = str(_tmp / "bench.log")
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from src.services import transaction_service as ts_mod  # noqa: E402
+from src.utils.logger import JsonFormatter  # noqa: E402
+
+
+def _per_call_ns(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    log = ts_mod.log
+    assert not log.isEnabledFor(logging.INFO)
+    tx_id, tipo, amount, user_id = 123, "Despesa", 45.678, 9
+
+    cases = {
+        "f-string": lambda: log.info(f"Transação criada com sucesso (ID={tx_id}, tipo={tipo}, valor={amount:.2f})."),
+        "estilo %": lambda: log.info("Transação criada com sucesso (ID=%s, tipo=%s, valor=%.2f).", tx_id, tipo, amount),
+        "_log_event": lambda: ts_mod._log_event(
+            logging.INFO, "Transação criada com sucesso (ID=%s, tipo=%s, valor=%.2f).",
+            tx_id, tipo, amount, tx_id=tx_id, user_id=user_id, started=0.0,
+        ),
+        "(vazio)": lambda: None,
+    }
+    print(f"LOG_LEVEL=WARNING, log.info desabilitado ({number} chamadas):")
+    for name, fn in cases.items():
+        print(f"  {name:>11}: {_per_call_ns(fn, number):7.1f} ns/chamada")
+
+    record = logging.makeLogRecord({
+        "name": "fintrack.TransactionService", "levelno": logging.INFO, "levelname": "INFO",
+        "msg": "Transação criada com sucesso (ID=%s, tipo=%s, valor=%.2f).", "args": (tx_id, tipo, amount),
+        "entity": "transaction", "id": tx_id, "user_id": user_id, "duration_ms": 1.234,
+    })
+    text = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    as_json = JsonFormatter()
+    print("Formatação de um registro habilitado:")
+    for name, fmt in (("text", text), ("json", as_json)):
+        print(f"  {name:>11}: {_per_call_ns(lambda: fmt.format(record), number // 4):7.1f} ns/registro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: latência de POST /transactions com log síncrono vs. em fila.
+
+Uso:
+    python -m benchmarks.bench_logging_queue [REQUISICOES]
+
+Para LOG_MODE=sync (RotatingFileHandler na thread do request) e
+LOG_MODE=queue (QueueHandler + QueueListener em thread de fundo), sobe a
+API real com TestClient e mede REQUISICOES (padrão 3000) criações de
+transação em sequência, com LOG_LEVEL=INFO. Mostra p50, p99 e máximo.
+"""
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_logq_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'bench.db'}"
+os.environ["MONTHLY_LIMIT"] = "1e12"
+os.environ["LOG_LEVEL"] = "INFO"
+os.environ["LOG_FILE"] = str(_tmp / "logs" / "app.log")
+
+
+def _run(mode: str, requests: int) -> list[float]:
+    os.environ["LOG_MODE"] = mode
+    from config.settings import reload_settings
+    reload_settings()
+    import src.utils.logger as logger_mod
+    importlib.reload(logger_mod)
+
+    from fastapi.testclient import TestClient
+    from src.controllers.api import app
+
+    latencies = []
+    with TestClient(app) as client:
+        u = client.post("/users", json={"name": mode, "email": f"{mode}@example.com"}).json()
+        c = client.post("/categories", json={"name": mode, "type": "Despesa"}).json()
+        body = {"amount": 1.0, "date": "2025-06-01", "description": None,
+                "type": "Despesa", "user_id": u["id"], "category_id": c["id"]}
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            r = client.post("/transactions", json=body)
+            latencies.append(time.perf_counter() - t0)
+            assert r.status_code == 201, r.text
+    return sorted(latencies)
+
+
+def main() -> None:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    print(f"{requests} x POST /transactions (LOG_LEVEL=INFO)")
+    for mode in ("sync", "queue"):
+        lat = _run(mode, requests)
+        print(
+            f"{mode:>6}: p50={statistics.median(lat) * 1000:6.2f} ms  "
+            f"p99={lat[int(len(lat) * 0.99) - 1] * 1000:6.2f} ms  max={lat[-1] * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: custo por evento das métricas em processo (src.utils.metrics).
+
+Uso:
+    python -m benchmarks.bench_metrics_overhead [EVENTOS]
+
+Mede, por chamada, Counter.inc, Gauge.inc/dec, Histogram.observe sem e com
+labels (como no middleware HTTP), e o tempo de renderizar /metrics somando
+os snapshots de 8 workers simulados.
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_metrics_"))
+os.environ["LOG_FILE"] = str(_tmp / "bench.log")
+
+from src.utils.metrics import Registry  # noqa: E402
+
+
+def _per_call_ns(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    reg = Registry()
+    counter = reg.counter("c_total", "c")
+    gauge = reg.gauge("g", "g")
+    hist = reg.histogram("h_seconds", "h")
+    route_hist = reg.histogram("r_seconds", "r", ("method", "route", "status"))
+
+    cases = {
+        "Counter.inc": lambda: counter.inc(),
+        "Gauge.inc+dec": lambda: (gauge.inc(), gauge.dec()),
+        "Histogram.observe": lambda: hist.observe(0.0123),
+        "observe c/ labels": lambda: route_hist.observe(0.0123, "GET", "/users/{user_id}", "200"),
+        "(vazio)": lambda: None,
+    }
+    print(f"Custo por evento ({number} chamadas):")
+    for name, fn in cases.items():
+        print(f"  {name:>18}: {_per_call_ns(fn, number):6.1f} ns")
+
+    for i in range(50):
+        route_hist.observe(0.01, "GET", f"/rota{i}", "200")
+    workers = _tmp / "workers"
+    workers.mkdir()
+    for pid in range(8):
+        reg.write_snapshot(str(workers))
+        os.replace(workers / f"{os.getpid()}.json", workers / f"{pid}.json")
+    started = time.perf_counter()
+    text = reg.render(str(workers))
+    print(f"Render com 8 snapshots: {(time.perf_counter() - started) * 1000:.1f} ms, {len(text)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: SUM/GROUP BY sobre valores em reais (REAL) vs. centavos (INTEGER).
+
+Uso:
+    python -m benchmarks.bench_money_sum [LINHAS] [USUARIOS] [REPETICOES]
+
+Cria duas tabelas com as mesmas LINHAS (padrão 2 milhões) de USUARIOS
+(padrão 1000) usuários, uma com o valor em reais e outra em centavos, e mede
+a soma total, a soma por usuário e a comparação com um limite. Mostra também
+o erro acumulado da soma em ponto flutuante frente à soma exata.
+"""
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils.money import from_cents
+
+QUERIES = {
+    "SUM total": "SELECT SUM(amount) FROM {t}",
+    "SUM por usuário": "SELECT user_id, SUM(amount) FROM {t} GROUP BY user_id",
+    "usuários acima do limite": "SELECT COUNT(*) FROM (SELECT user_id FROM {t} "
+                                "GROUP BY user_id HAVING SUM(amount) > {limit})",
+}
+
+
+def _fill(conn: sqlite3.Connection, rows: int, users: int) -> None:
+    rnd = random.Random(42)
+    conn.execute("CREATE TABLE reais (user_id INTEGER NOT NULL, amount FLOAT NOT NULL)")
+    conn.execute("CREATE TABLE centavos (user_id INTEGER NOT NULL, amount INTEGER NOT NULL)")
+    for start in range(0, rows, 200_000):
+        batch = [
+            (rnd.randrange(1, users + 1), rnd.randrange(1, 50_000))
+            for _ in range(start, min(start + 200_000, rows))
+        ]
+        conn.executemany("INSERT INTO centavos VALUES (?, ?)", batch)
+        conn.executemany("INSERT INTO reais VALUES (?, ?)", [(u, from_cents(c)) for u, c in batch])
+    conn.commit()
+
+
+def _best_ms(conn: sqlite3.Connection, sql: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        conn.execute(sql).fetchall()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    users = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    path = Path(tempfile.mkdtemp(prefix="bench_money_")) / "bench.db"
+    conn = sqlite3.connect(path)
+    _fill(conn, rows, users)
+    print(f"{rows} linhas, {users} usuários")
+
+    # limite médio por usuário, para o HAVING separar os usuários ao meio
+    limit_cents = conn.execute("SELECT SUM(amount) FROM centavos").fetchone()[0] // users
+    for label, sql in QUERIES.items():
+        real = _best_ms(conn, sql.format(t="reais", limit=from_cents(limit_cents)), repeat)
+        cents = _best_ms(conn, sql.format(t="centavos", limit=limit_cents), repeat)
+        print(f"  {label:>25}: REAL {real:7.1f} ms | INTEGER {cents:7.1f} ms | {real / cents:4.2f}x")
+
+    exact = conn.execute("SELECT SUM(amount) FROM centavos").fetchone()[0]
+    approx = conn.execute("SELECT SUM(amount) FROM reais").fetchone()[0]
+    print(f"  soma exata R$ {from_cents(exact):.2f} | erro da soma em float: {approx - exact / 100:.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: perfil de PRAGMAs "tuned" vs. padrões do SQLite ("sqlite").
+
+Uso:
+    python -m benchmarks.bench_sqlite_pragmas [SEGUNDOS]
+
+Para cada perfil, sobre um banco novo com 20 mil transações:
+- escrita: um escritor criando transações com um commit cada;
+- leitura concorrente: 4 leitores consultando páginas de transações
+  enquanto o escritor trabalha.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+
+def _run_profile(profile: str, seconds: float, tmp: Path) -> tuple[int, int]:
+    os.environ["SQLITE_PROFILE"] = profile
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp / f'{profile}.db'}"
+
+    from config.settings import reload_settings
+    reload_settings()
+
+    from sqlalchemy.orm import sessionmaker
+    from src.models.base import Base
+    from src.models.transaction import Transaction
+    from src.repositories import db as db_mod
+    from src.repositories.transaction_repo import TransactionRepository
+
+    engine = db_mod.get_engine()
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    with Session() as s:
+        TransactionRepository(s).bulk_add([
+            {"amount_cents": (1 + i % 50) * 100, "date": date(2025, 1 + i % 12, 1 + i % 28),
+             "description": None, "type": "Despesa", "user_id": 1 + i % 20, "category_id": 1}
+            for i in range(20000)
+        ])
+
+    stop = time.perf_counter() + seconds
+    counts = {"writes": 0, "reads": 0}
+    lock = threading.Lock()
+
+    def writer():
+        with Session() as s:
+            repo = TransactionRepository(s)
+            while time.perf_counter() < stop:
+                repo.add(Transaction(amount=10.0, date=date(2025, 6, 1), type="Despesa",
+                                     user_id=1, category_id=1))
+                counts["writes"] += 1
+
+    def reader(uid: int):
+        with Session() as s:
+            repo = TransactionRepository(s)
+            while time.perf_counter() < stop:
+                repo.list_page(user_id=uid, limit=50)
+                s.rollback()  # encerra a transação de leitura, como ao fim de um request
+                with lock:
+                    counts["reads"] += 1
+
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(uid,)) for uid in range(1, 5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+    return counts["writes"], counts["reads"]
+
+
+def main(seconds: float = 5.0) -> None:
+    tmp = Path(tempfile.mkdtemp())
+    os.environ.setdefault("LOG_FILE", str(tmp / "bench.log"))
+    os.environ["LOG_LEVEL"] = "WARNING"
+
+    results = {p: _run_profile(p, seconds, tmp) for p in ("sqlite", "tuned")}
+    for profile, (writes, reads) in results.items():
+        print(f"{profile:7s} escritas: {writes / seconds:8.0f}/s   leituras: {reads / seconds:8.0f}/s")
+    (w0, r0), (w1, r1) = results["sqlite"], results["tuned"]
+    print(f"ganho   escritas: {w1 / max(w0, 1):8.1f}x   leituras: {r1 / max(r0, 1):8.1f}x")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 5.0)
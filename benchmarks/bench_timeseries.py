@@ -0,0 +1,87 @@
+"""
+Benchmark: série temporal de um usuário montada a partir da lista completa
+de transações (como os dashboards fazem hoje) vs. agregada no SQL.
+
+Uso:
+    python -m benchmarks.bench_timeseries [TRANSACOES_DO_USUARIO] [REPETICOES]
+
+Insere TRANSACOES_DO_USUARIO (padrão 100 mil) transações de um usuário em
+3 anos e mede, por bucket (day/week/month):
+- lista: carrega as transações como objetos ORM e agrupa em Python;
+- sql: TransactionService.timeseries (GROUP BY no banco, sem ORM).
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_timeseries_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'bench.db'}"
+os.environ.setdefault("LOG_FILE", str(_tmp / "bench.log"))
+
+from src.repositories import db as db_mod  # noqa: E402
+from src.repositories.transaction_repo import TransactionRepository  # noqa: E402
+from src.services.transaction_service import TransactionService  # noqa: E402
+
+START = date(2023, 1, 1)
+
+
+def _bucket_start(d: date, bucket: str) -> date:
+    if bucket == "day":
+        return d
+    if bucket == "week":
+        return d - timedelta(days=d.weekday())
+    return d.replace(day=1)
+
+
+def _from_list(repo: TransactionRepository, user_id: int, bucket: str) -> list:
+    series = defaultdict(lambda: [0.0, 0.0])
+    for t in repo.list_by_user(user_id):
+        series[_bucket_start(t.date, bucket)][0 if t.type == "Receita" else 1] += t.amount
+    return sorted(series.items())
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    db_mod.init_db()
+    rnd = random.Random(42)
+    with db_mod.SessionLocal() as s:
+        TransactionRepository(s).bulk_add([
+            {"amount_cents": rnd.randint(100, 50000),
+             "date": START + timedelta(days=rnd.randrange(3 * 365)),
+             "description": None, "type": rnd.choice(("Receita", "Despesa")),
+             "user_id": 1 if i % 4 else 2, "category_id": 1}
+            for i in range(total * 4 // 3)
+        ])
+
+    print(f"~{total} transações do usuário 1 (melhor de {repeat}):")
+    for bucket in ("day", "week", "month"):
+        with db_mod.SessionLocal() as s:
+            repo = TransactionRepository(s)
+            svc = TransactionService(repo, None, None)
+
+            def listed():
+                _from_list(repo, 1, bucket)
+                s.expunge_all()
+
+            lista = _best(listed, repeat)
+            sql = _best(lambda: svc.timeseries(1, bucket), repeat)
+        print(f"  {bucket:>5}: lista {lista:8.1f} ms | sql {sql:7.1f} ms | {lista / sql:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark: latência de UserService.create_user em função do total de usuários.
+
+Uso:
+    python -m benchmarks.bench_user_signup [TOTAL_USUARIOS] [CADASTROS]
+
+Popula a tabela `users` em etapas (1 mil, 100 mil, ... até TOTAL_USUARIOS,
+padrão 1 milhão) e, em cada etapa, mede CADASTROS (padrão 200) chamadas de
+create_user pelo caminho da API (UnitOfWork). A checagem de e-mail duplicado
+usa o índice único de users.email, então a latência não deve crescer com a tabela.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_tmp = Path(tempfile.mkdtemp(prefix="bench_signup_"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp / 'bench.db'}"
+os.environ.setdefault("LOG_FILE", str(_tmp / "bench.log"))
+
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from src.models.user import User  # noqa: E402
+from src.repositories import db as db_mod  # noqa: E402
+from src.repositories.unit_of_work import UnitOfWork  # noqa: E402
+from src.repositories.user_repo import UserRepository  # noqa: E402
+from src.services.user_service import UserService  # noqa: E402
+
+
+def _fill_to(total: int) -> None:
+    with db_mod.engine.begin() as conn:
+        current = conn.execute(select(func.count()).select_from(User)).scalar()
+        for start in range(current, total, 50000):
+            conn.execute(insert(User.__table__), [
+                {"name": f"seed {i}", "email": f"seed{i}@bench.local"}
+                for i in range(start, min(start + 50000, total))
+            ])
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    signups = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    db_mod.init_db()
+
+    steps = [n for n in (1_000, 100_000, 1_000_000, 10_000_000) if n < total] + [total]
+    for step in steps:
+        _fill_to(step)
+        latencies = []
+        with db_mod.SessionLocal() as s:
+            svc = UserService(UserRepository(s), uow=UnitOfWork(s))
+            for i in range(signups):
+                t0 = time.perf_counter()
+                svc.create_user("Novo", f"novo{step}-{i}@bench.local")
+                latencies.append(time.perf_counter() - t0)
+        latencies.sort()
+        print(
+            f"{step:>10} usuários: p50={statistics.median(latencies) * 1000:6.2f} ms  "
+            f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
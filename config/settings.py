@@ -1,5 +1,12 @@
+import logging
 import os
+from functools import cached_property
+from typing import Optional
+
 from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from src.utils.money import to_cents
 
 load_dotenv()
 
@@ -16,6 +23,130 @@ def get_setting(key: str, default: str | None = None) -> str | None:
     """
     return os.getenv(key.upper(), default)
 
+
+class Settings(BaseModel):
+    """
+    Configurações da aplicação, lidas das variáveis de ambiente (e do .env)
+    uma única vez e validadas. Cada campo corresponde à variável de mesmo
+    nome em maiúsculas (ex.: monthly_limit <- MONTHLY_LIMIT).
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    app_env: str = "dev"
+    database_url: str = "sqlite:///./fintrack.db"
+    async_database_url: Optional[str] = None
+    log_level: str = "INFO"
+    log_file: str = ".logs/app.log"
+    # "text": linhas legíveis; "json": um objeto JSON por linha, com campos estruturados
+    log_format: str = "text"
+    # "queue": arquivo escrito por uma thread de fundo; "sync": na própria chamada
+    log_mode: str = "queue"
+    log_queue_size: int = 10000
+    # fila cheia: "drop" descarta registros abaixo de WARNING; "block" espera vaga
+    log_queue_policy: str = "drop"
+    monthly_limit: float = 2000.0
+    # consultas SQL mais lentas que isto (ms) são logadas com SQL e parâmetros; 0 desliga
+    slow_query_ms: float = 200.0
+    # diretório dos snapshots de métricas por worker (vazio: só o próprio processo)
+    metrics_dir: Optional[str] = None
+    metrics_interval: float = 5.0
+
+    # PRAGMAs do SQLite: perfil e sobrescritas individuais (validadas em db.py)
+    sqlite_profile: str = "tuned"
+    sqlite_journal_mode: Optional[str] = None
+    sqlite_synchronous: Optional[str] = None
+    sqlite_cache_size: Optional[str] = None
+    sqlite_mmap_size: Optional[str] = None
+    sqlite_temp_store: Optional[str] = None
+    sqlite_busy_timeout: Optional[str] = None
+
+    @field_validator("log_level")
+    @classmethod
+    def _valid_log_level(cls, value: str) -> str:
+        value = value.upper()
+        if not isinstance(logging.getLevelName(value), int):
+            raise ValueError(f"LOG_LEVEL inválido: {value}")
+        return value
+
+    @field_validator("log_format", "log_mode", "log_queue_policy")
+    @classmethod
+    def _valid_choice(cls, value: str, info) -> str:
+        choices = {
+            "log_format": ("text", "json"),
+            "log_mode": ("queue", "sync"),
+            "log_queue_policy": ("drop", "block"),
+        }
+        value = value.lower()
+        if value not in choices[info.field_name]:
+            raise ValueError(f"{info.field_name.upper()} inválido: {value}")
+        return value
+
+    @field_validator("log_queue_size")
+    @classmethod
+    def _positive_queue(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("LOG_QUEUE_SIZE deve ser maior que zero.")
+        return value
+
+    @field_validator("slow_query_ms")
+    @classmethod
+    def _non_negative_threshold(cls, value: float) -> float:
+        if value < 0:
+            raise ValueError("SLOW_QUERY_MS não pode ser negativo.")
+        return value
+
+    @field_validator("metrics_interval")
+    @classmethod
+    def _positive_interval(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("METRICS_INTERVAL deve ser maior que zero.")
+        return value
+
+    @field_validator("monthly_limit")
+    @classmethod
+    def _positive_limit(cls, value: float) -> float:
+        if value <= 0:
+            raise ValueError("MONTHLY_LIMIT deve ser maior que zero.")
+        return value
+
+    @cached_property
+    def monthly_limit_cents(self) -> int:
+        """MONTHLY_LIMIT em centavos inteiros, convertido uma vez por carga das configurações."""
+        return to_cents(self.monthly_limit)
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Monta as configurações a partir das variáveis de ambiente definidas (não vazias)."""
+        values = {}
+        for name in cls.model_fields:
+            raw = os.environ.get(name.upper())
+            if raw:
+                values[name] = raw.strip()
+        return cls(**values)
+
+
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Configurações carregadas (na primeira chamada) e reaproveitadas nas seguintes."""
+    global _settings
+    if _settings is None:
+        _settings = Settings.from_env()
+    return _settings
+
+
+def reload_settings() -> Settings:
+    """
+    Relê as variáveis de ambiente e substitui as configurações em cache.
+    Objetos já criados com as configurações anteriores não são alterados.
+    """
+    global _settings
+    _settings = Settings.from_env()
+    return _settings
+
+
 if __name__ == "__main__":
     print("DATABASE_URL:", get_setting("DATABASE_URL"))
     print("LOG_LEVEL:", get_setting("LOG_LEVEL"))
@@ -1,34 +1,80 @@
-from fastapi import FastAPI, Depends, HTTPException
+import io
+from datetime import date
+
+from fastapi import FastAPI, Depends, HTTPException, Query, UploadFile
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from contextlib import asynccontextmanager
+from typing import Iterable, Iterator
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.repositories.db import SessionLocal, init_db
-from src.repositories.user_repo import UserRepository
-from src.repositories.category_repo import CategoryRepository
-from src.repositories.transaction_repo import TransactionRepository
-from src.services.user_service import UserService
-from src.services.category_service import CategoryService
-from src.services.transaction_service import TransactionService
+from src.repositories.db import SessionLocal, async_session, dispose_async_engine, init_db
+from src.repositories.user_repo import AsyncUserRepository, UserRepository
+from src.repositories.category_cache import CategoryCache
+from src.repositories.category_repo import AsyncCategoryRepository, CategoryRepository
+from src.repositories.transaction_repo import AsyncTransactionRepository, TransactionRepository
+from src.repositories.unit_of_work import UnitOfWork
+from src.repositories.balance_repo import SQLBalanceLedger
+from src.services.user_service import AsyncUserService, UserService
+from src.services.category_service import AsyncCategoryService, CategoryService
+from src.services.transaction_service import (
+    AsyncTransactionService, TransactionService, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+)
+from src.services.finance_service import FinanceService
 from src.services.exceptions import EntidadeNaoEncontradaError, ValidacaoError
+from src.controllers.timing import QueryTimingMiddleware
 from src.controllers.schemas import (
-    UserCreate, UserUpdate, UserOut,
+    UserCreate, UserUpdate, UserOut, BalanceOut,
     CategoryCreate, CategoryUpdate, CategoryOut,
-    TransactionCreate, TransactionUpdate, TransactionOut,
+    TransactionCreate, TransactionUpdate, TransactionOut, TransactionPage,
+    TransactionBatchCreate, TransactionBatchOut, TransactionImportOut,
+)
+from config.settings import get_settings
+from src.utils.logger import flush_logging, get_logger, start_logging
+from src.utils.metrics import (
+    TRANSACTIONS_CREATED, TRANSACTIONS_EXPORTED, TRANSACTIONS_IMPORTED,
+    SnapshotWriter, registry,
+)
+from src.utils.json_response import (
+    CATEGORY_FIELDS, TRANSACTION_FIELDS, USER_FIELDS, FastJSONResponse, rows_to_dicts,
+)
+from src.utils.file_export import (
+    ensure_utf8, export_filename, export_transactions_to_csv, iter_transactions_csv,
 )
-from src.utils.logger import get_logger
-from src.utils.file_export import export_transactions_to_csv
 
 @asynccontextmanager
 async def _lifespan(app: FastAPI):
     # inicializa o DB na inicialização da aplicação
+    start_logging()
     init_db()
+    category_cache.refresh()
+    if metrics_writer is not None:
+        metrics_writer.start()
     log.info("API inicializada e banco configurado.")
     yield
+    await dispose_async_engine()
+    if metrics_writer is not None:
+        metrics_writer.stop()
+    log.info("API encerrada.")
+    # grava os logs ainda na fila antes de o processo sair
+    flush_logging()
 
 
 app = FastAPI(title="FinTrack API", lifespan=_lifespan)
+# consultas e tempo de banco por requisição no cabeçalho Server-Timing e no log
+app.add_middleware(QueryTimingMiddleware)
 log = get_logger("API")
 
+# categorias em memória, carregadas no startup (ver CategoryCache)
+category_cache = CategoryCache(SessionLocal)
+
+# com METRICS_DIR, cada worker grava seu snapshot para o /metrics somar todos
+METRICS_DIR = get_settings().metrics_dir
+metrics_writer = (
+    SnapshotWriter(registry, METRICS_DIR, get_settings().metrics_interval)
+    if METRICS_DIR else None
+)
+
 
 def get_db() -> Session:
     db = SessionLocal()
@@ -38,19 +84,40 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncSession:
+    async with async_session() as db:
+        yield db
+
+
+def get_async_user_service(db: AsyncSession = Depends(get_async_db)) -> AsyncUserService:
+    return AsyncUserService(AsyncUserRepository(db))
+
+
+def get_async_category_service(db: AsyncSession = Depends(get_async_db)) -> AsyncCategoryService:
+    return AsyncCategoryService(AsyncCategoryRepository(db), cache=category_cache)
+
+
+def get_async_transaction_service(db: AsyncSession = Depends(get_async_db)) -> AsyncTransactionService:
+    return AsyncTransactionService(AsyncTransactionRepository(db))
+
+
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
-    return UserService(UserRepository(db))
+    return UserService(UserRepository(db), uow=UnitOfWork(db))
 
 
 def get_category_service(db: Session = Depends(get_db)) -> CategoryService:
-    return CategoryService(CategoryRepository(db))
+    return CategoryService(CategoryRepository(db), uow=UnitOfWork(db), cache=category_cache)
 
 
 def get_transaction_service(db: Session = Depends(get_db)) -> TransactionService:
     tx_repo = TransactionRepository(db)
     user_repo = UserRepository(db)
     cat_repo = CategoryRepository(db)
-    return TransactionService(tx_repo, user_repo, cat_repo)
+    return TransactionService(tx_repo, user_repo, cat_repo, uow=UnitOfWork(db))
+
+
+def get_finance_service(db: Session = Depends(get_db)) -> FinanceService:
+    return FinanceService(TransactionRepository(db), ledger=SQLBalanceLedger(db))
 
 
 # startup handled by lifespan manager above
@@ -61,6 +128,14 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Métricas no formato texto do Prometheus (somadas entre workers com METRICS_DIR)."""
+    return PlainTextResponse(
+        registry.render(METRICS_DIR), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ===== USERS =====
 
 @app.post("/users", response_model=UserOut, status_code=201)
@@ -72,8 +147,9 @@ def create_user(user_in: UserCreate, service: UserService = Depends(get_user_ser
 
 
 @app.get("/users", response_model=list[UserOut])
-def list_users(service: UserService = Depends(get_user_service)):
-    return service.list_users()
+async def list_users(service: AsyncUserService = Depends(get_async_user_service)):
+    rows = await service.list_user_rows()
+    return FastJSONResponse(rows_to_dicts(rows, USER_FIELDS))
 
 
 @app.get("/users/{user_id}", response_model=UserOut)
@@ -84,6 +160,21 @@ def get_user(user_id: int, service: UserService = Depends(get_user_service)):
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@app.get("/users/{user_id}/balance", response_model=BalanceOut)
+def user_balance(
+    user_id: int,
+    as_of: date | None = None,
+    users: UserService = Depends(get_user_service),
+    finance: FinanceService = Depends(get_finance_service),
+):
+    """Saldo do usuário (receitas - despesas), atual ou até a data `as_of` (inclusive)."""
+    try:
+        users.get_user(user_id)
+    except EntidadeNaoEncontradaError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"user_id": user_id, "balance": finance.balance(user_id, as_of), "as_of": as_of}
+
+
 @app.put("/users/{user_id}", response_model=UserOut)
 def update_user(user_id: int, user_in: UserUpdate, service: UserService = Depends(get_user_service)):
     try:
@@ -111,12 +202,15 @@ def create_category(cat_in: CategoryCreate, service: CategoryService = Depends(g
 
 
 @app.get("/categories", response_model=list[CategoryOut])
-def list_categories(
+async def list_categories(
     tipo: str | None = None,
     order: str = "asc",
-    service: CategoryService = Depends(get_category_service),
+    service: AsyncCategoryService = Depends(get_async_category_service),
 ):
-    return service.list_categories(tipo, order)
+    cats = await service.list_categories(tipo, order)
+    return FastJSONResponse(
+        rows_to_dicts(((c.name, c.type, c.id) for c in cats), CATEGORY_FIELDS)
+    )
 
 
 @app.get("/categories/{cat_id}", response_model=CategoryOut)
@@ -155,7 +249,7 @@ def create_transaction(
     service: TransactionService = Depends(get_transaction_service),
 ):
     try:
-        return service.create_transaction(
+        tx = service.create_transaction(
             amount=tx_in.amount,
             date=tx_in.date,
             description=tx_in.description,
@@ -165,45 +259,161 @@ def create_transaction(
         )
     except (ValidacaoError, EntidadeNaoEncontradaError) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    TRANSACTIONS_CREATED.inc()
+    return tx
+
+
+@app.post("/transactions/batch", response_model=TransactionBatchOut)
+def create_transactions_batch(
+    batch: TransactionBatchCreate,
+    service: TransactionService = Depends(get_transaction_service),
+):
+    """Cria várias transações em lote; a resposta traz o resultado de cada item."""
+    try:
+        results = service.create_transactions_batch([i.model_dump() for i in batch.items])
+    except ValidacaoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    created = sum(1 for r in results if r["status"] == "created")
+    TRANSACTIONS_CREATED.inc(amount=created)
+    return {"created": created, "rejected": len(results) - created, "results": results}
+
+
+@app.post("/transactions/import", response_model=TransactionImportOut)
+def import_transactions(
+    file: UploadFile,
+    service: TransactionService = Depends(get_transaction_service),
+):
+    """
+    Importa transações de um arquivo CSV enviado (multipart), no mesmo formato
+    da exportação. Retorna o resumo e os erros por linha. Um arquivo que não
+    seja UTF-8 é recusado inteiro, antes de gravar qualquer lote.
+    """
+    try:
+        ensure_utf8(file.file)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Arquivo deve estar codificado em UTF-8.")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        summary = service.import_transactions_csv(stream)
+        TRANSACTIONS_IMPORTED.inc(amount=summary["imported"])
+        return summary
+    except ValidacaoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        stream.detach()
 
 
-@app.get("/transactions", response_model=list[TransactionOut])
-def list_transactions(
+@app.get("/transactions", response_model=TransactionPage)
+async def list_transactions(
     user_id: int | None = None,
     tipo: str | None = None,
     order_by: str = "date",
     order: str = "asc",
-    service: TransactionService = Depends(get_transaction_service),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    service: AsyncTransactionService = Depends(get_async_transaction_service),
 ):
-    return service.list_transactions(user_id, tipo, order_by, order)
+    """Lista transações paginadas; passe `next_cursor` em `cursor` para a próxima página."""
+    try:
+        rows, next_cursor = await service.list_transactions_page_rows(
+            user_id, tipo, order_by, order, limit=limit, cursor=cursor
+        )
+    except ValidacaoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # linhas da consulta -> dicts -> orjson, sem validar TransactionOut linha a linha
+    return FastJSONResponse(
+        {"items": rows_to_dicts(rows, TRANSACTION_FIELDS), "next_cursor": next_cursor}
+    )
 
 
 @app.get("/transactions/summary")
-def transaction_summary(user_id: int, service: TransactionService = Depends(get_transaction_service)):
-    """Retorna o total de receitas e despesas do usuário."""
-    txs = service.list_transactions(user_id=user_id)
-    receitas = sum(t.amount for t in txs if t.type.lower() == "receita")
-    despesas = sum(t.amount for t in txs if t.type.lower() == "despesa")
-    saldo = receitas - despesas
-    return {
-        "user_id": user_id,
-        "receitas": receitas,
-        "despesas": despesas,
-        "saldo": saldo
-    }
+async def transaction_summary(
+    user_id: int,
+    start: date | None = None,
+    end: date | None = None,
+    service: AsyncTransactionService = Depends(get_async_transaction_service),
+):
+    """Retorna o total de receitas e despesas do usuário (opcionalmente entre `start` e `end`)."""
+    try:
+        return await service.summarize(user_id, start=start, end=end)
+    except ValidacaoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/transactions/timeseries")
+async def transaction_timeseries(
+    user_id: int,
+    bucket: str = "month",
+    start: date | None = None,
+    end: date | None = None,
+    service: AsyncTransactionService = Depends(get_async_transaction_service),
+):
+    """
+    Receitas, despesas e saldo do usuário por período (`bucket`: day, week ou
+    month), agregados no banco; cada ponto traz a data de início do período.
+    """
+    try:
+        return await service.timeseries(user_id, bucket, start=start, end=end)
+    except ValidacaoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/transactions/by-category")
+async def transaction_category_breakdown(
+    user_id: int,
+    start: date | None = None,
+    end: date | None = None,
+    tipo: str | None = None,
+    service: AsyncTransactionService = Depends(get_async_transaction_service),
+):
+    """
+    Relatório por categoria do usuário (opcionalmente entre `start` e `end` e
+    de um `tipo`): total, quantidade, participação no tipo e ticket médio.
+    """
+    try:
+        return await service.category_breakdown(user_id, start=start, end=end, tipo=tipo)
+    except ValidacaoError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _count_exported(rows: Iterable) -> Iterator:
+    # conta localmente e atualiza a métrica uma vez, ao fim (ou interrupção) do export
+    exported = 0
+    try:
+        for row in rows:
+            exported += 1
+            yield row
+    finally:
+        TRANSACTIONS_EXPORTED.inc(amount=exported)
 
 
 @app.get("/transactions/export")
-def export_transactions(user_id: int, service: TransactionService = Depends(get_transaction_service)):
+def export_transactions(
+    user_id: int,
+    mode: str = "stream",
+    service: TransactionService = Depends(get_transaction_service),
+):
     """
     Exporta todas as transações de um usuário específico para CSV.
+
+    - `mode=stream` (padrão): devolve o CSV como download, gerado em streaming.
+    - `mode=file`: grava o CSV em `exports/` no servidor e devolve o caminho.
     """
-    txs = service.list_transactions(user_id=user_id)
-    if not txs:
+    if mode not in ("stream", "file"):
+        raise HTTPException(status_code=400, detail="Modo deve ser 'stream' ou 'file'.")
+    if not service.has_transactions(user_id):
         raise HTTPException(status_code=404, detail="Nenhuma transação encontrada para este usuário.")
 
-    path = export_transactions_to_csv(txs, user_id)
-    return {"mensagem": "Exportação concluída com sucesso.", "arquivo": path}
+    rows = _count_exported(service.iter_user_transactions(user_id))
+    if mode == "file":
+        path = export_transactions_to_csv(rows, user_id)
+        return {"mensagem": "Exportação concluída com sucesso.", "arquivo": path}
+
+    return StreamingResponse(
+        iter_transactions_csv(rows),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(user_id)}"'},
+    )
 
 
 @app.get("/transactions/{tx_id}", response_model=TransactionOut)
@@ -1,8 +1,17 @@
 from datetime import date
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
 
 from typing import Optional
 
+from src.utils.money import MAX_AMOUNT, from_cents, to_cents
+
+
+def _round_cents(value: Optional[float]) -> Optional[float]:
+    # o banco guarda centavos inteiros: o valor aceito já sai arredondado (1.005 -> 1.01)
+    if value is None:
+        return None
+    return from_cents(to_cents(value))
+
 # =========================
 #        USERS
 # =========================
@@ -28,6 +37,13 @@ class UserOut(UserBase):
     # pydantic v2: use model_config / ConfigDict to enable from_attributes (orm_mode)
     model_config = ConfigDict(from_attributes=True)
 
+
+class BalanceOut(BaseModel):
+    """Saldo do usuário (receitas - despesas); `as_of` None = saldo atual."""
+    user_id: int
+    balance: float
+    as_of: date | None = None
+
 # ===== CATEGORIES =====
 
 class CategoryBase(BaseModel):
@@ -54,13 +70,15 @@ class CategoryOut(CategoryBase):
 # =========================
 
 class TransactionBase(BaseModel):
-    amount: float
+    amount: float = Field(le=MAX_AMOUNT)
     date: date
     description: str | None = None
     type: str        # "Receita" ou "Despesa"
     user_id: int
     category_id: int
 
+    _amount_cents = field_validator("amount")(_round_cents)
+
 class TransactionCreate(TransactionBase):
     """Dados obrigatórios para criar uma transação."""
     pass
@@ -71,11 +89,49 @@ class TransactionOut(TransactionBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TransactionPage(BaseModel):
+    """Página de transações; `next_cursor` é None na última página."""
+    items: list[TransactionOut]
+    next_cursor: str | None = None
+
+
+class TransactionBatchCreate(BaseModel):
+    """Lote de transações para POST /transactions/batch."""
+    items: list[TransactionCreate]
+
+
+class TransactionBatchItemResult(BaseModel):
+    index: int
+    status: str      # "created" ou "rejected"
+    id: int | None = None
+    detail: str | None = None
+
+
+class TransactionBatchOut(BaseModel):
+    created: int
+    rejected: int
+    results: list[TransactionBatchItemResult]
+
+
+class TransactionImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class TransactionImportOut(BaseModel):
+    total: int
+    imported: int
+    rejected: int
+    errors: list[TransactionImportError]
+
+
 class TransactionUpdate(BaseModel):
-    amount: Optional[float] = None
+    amount: Optional[float] = Field(None, le=MAX_AMOUNT)
     date: Optional[date] = None
     description: Optional[str] = None
     type: Optional[str] = None
     category_id: Optional[int] = None
 
+    _amount_cents = field_validator("amount")(_round_cents)
+
 
@@ -0,0 +1,66 @@
+import time
+
+from src.repositories.query_stats import start_query_stats
+from src.utils.logger import get_logger
+from src.utils.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS
+
+log = get_logger("http")
+
+
+class QueryTimingMiddleware:
+    """
+    Middleware ASGI que conta as consultas SQL de cada requisição (ver
+    query_stats) e as expõe no cabeçalho Server-Timing:
+
+        Server-Timing: db;dur=4.2;desc="3 queries", app;dur=10.1
+
+    Ao fim da requisição, loga método, caminho, status, número de consultas e
+    tempos, e registra a latência no histograma por rota (o padrão da rota,
+    ex.: /users/{user_id}, para não criar uma série por id; "unmatched" para
+    caminhos sem rota). Também mantém o gauge de requisições em andamento. Em respostas em streaming o cabeçalho reflete as consultas feitas
+    até o início do envio; o log inclui todas.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = start_query_stats()
+        started = time.perf_counter()
+        status = 500
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+                value = (
+                    f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", '
+                    f"app;dur={total_ms:.1f}"
+                )
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (b"server-timing", value.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                elapsed, scope["method"], getattr(route, "path", "unmatched"), str(status)
+            )
+            total_ms = elapsed * 1000
+            log.info(
+                "%s %s -> %s: %s consultas, %.1f ms no banco, %.1f ms no total",
+                scope["method"], scope["path"], status, stats.count, stats.total_ms, total_ms,
+                extra={"duration_ms": round(total_ms, 3)},
+            )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String
+from .base import Base
+from .types import Cents
+
+class UserBalance(Base):
+    """
+    Modelo ORM do saldo corrente de um usuário (receitas - despesas).
+    Atualizado na mesma transação de cada escrita em `transactions`.
+    """
+
+    __tablename__ = "user_balances"
+
+    user_id: int = Column(Integer, primary_key=True)
+    balance: float = Column(Cents, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        """Retorna representação textual do saldo."""
+        return f"<UserBalance(user_id={self.user_id}, balance={self.balance})>"
+
+
+class BalanceCheckpoint(Base):
+    """
+    Modelo ORM do saldo de um usuário ao fim de um mês (acumulado desde o
+    início), um registro por mês com movimentação. Base das consultas de
+    saldo em uma data passada.
+    """
+
+    __tablename__ = "balance_checkpoints"
+
+    user_id: int = Column(Integer, primary_key=True)
+    year_month: str = Column(String(7), primary_key=True)  # "AAAA-MM"
+    balance: float = Column(Cents, nullable=False, default=0.0)
+
+    def __repr__(self) -> str:
+        """Retorna representação textual do checkpoint de saldo."""
+        return f"<BalanceCheckpoint(user_id={self.user_id}, year_month={self.year_month}, balance={self.balance})>"
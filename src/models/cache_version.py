@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String
+from .base import Base
+
+class CacheVersion(Base):
+    """
+    Modelo ORM do contador de versão de um cache em memória (ex.: "categories").
+    Incrementado a cada escrita na tabela de origem, para que outros processos
+    percebam que a cópia local ficou desatualizada.
+    """
+
+    __tablename__ = "cache_versions"
+
+    name: str = Column(String(40), primary_key=True)
+    version: int = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """Retorna representação textual do contador."""
+        return f"<CacheVersion(name={self.name}, version={self.version})>"
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String
+from .base import Base
+from .types import Cents
+
+class MonthlyTotal(Base):
+    """
+    Modelo ORM do consolidado mensal de transações por usuário e tipo.
+    Mantido incrementalmente a cada escrita em `transactions`.
+    """
+
+    __tablename__ = "monthly_totals"
+
+    user_id: int = Column(Integer, primary_key=True)
+    year_month: str = Column(String(7), primary_key=True)  # "AAAA-MM"
+    type: str = Column(String(10), primary_key=True)  # "Receita" | "Despesa"
+    total: float = Column(Cents, nullable=False, default=0.0)
+    count: int = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """Retorna representação textual do consolidado mensal."""
+        return f"<MonthlyTotal(user_id={self.user_id}, year_month={self.year_month}, type={self.type}, total={self.total})>"
@@ -1,14 +1,21 @@
-from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from .base import Base
+from .types import Cents
 
 class Transaction(Base):
     """Modelo ORM que representa uma transação financeira."""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # consultas por usuário (listagem, exportação, resumo) ordenadas/filtradas por data
+        Index("ix_transactions_user_date", "user_id", "date"),
+        # consultas por usuário e tipo em um intervalo de datas (limite mensal, totais)
+        Index("ix_transactions_user_type_date", "user_id", "type", "date"),
+    )
 
     id: int = Column(Integer, primary_key=True, index=True)
-    amount: float = Column(Float, nullable=False)
+    amount: float = Column(Cents, nullable=False)
     date: str = Column(Date, nullable=False)
     description: str = Column(String(255))
     type: str = Column(String(10), nullable=False)  # "Receita" | "Despesa"
@@ -0,0 +1,31 @@
+from sqlalchemy import Integer, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+from src.utils.money import from_cents, to_cents
+
+
+class Cents(TypeDecorator):
+    """
+    Valor monetário gravado como centavos inteiros (INTEGER) e exposto em
+    reais (float) no Python. SUMs e comparações no banco são feitos sobre
+    inteiros, sem erro de arredondamento; a conversão acontece só na
+    entrada (bind) e na saída (resultado) de cada valor.
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else from_cents(int(value))
+
+
+def raw_cents(expr):
+    """
+    `expr` (coluna Cents ou valor em centavos) como INTEGER cru: lê e grava os
+    centavos sem passar pela conversão para reais do Cents. Para quem já
+    trabalha em centavos (consolidado mensal, livro de saldos).
+    """
+    return type_coerce(expr, Integer)
@@ -1,19 +1,36 @@
-class DBProxy:
-    """Minimal DBProxy shim for tests: forwards attribute access to the wrapped object.
+import types
+from typing import Any
 
-    The real project had a more complex unwrapping to handle instrumentation wrappers.
-    For unit tests we provide a simple transparent proxy.
-    """
-    def __init__(self, obj):
-        self._obj = obj
+from sqlalchemy.orm import Session
 
-    def __getattr__(self, item):
-        return getattr(self._obj, item)
 
-    def __repr__(self):
-        return f"DBProxy({self._obj!r})"
-import types
-from typing import Any
+def _unwrap(db_obj: Any) -> Any:
+    # If the original object is a generator-like object, try to extract a
+    # real SQLAlchemy Session from nested generators. Mutmut instrumentation
+    # can wrap values multiple times, so we attempt several unwrap steps.
+    max_unwrap = 6
+    unwrap_count = 0
+    try:
+        cur = db_obj
+        while unwrap_count < max_unwrap and (
+            isinstance(cur, types.GeneratorType) or hasattr(cur, "__next__")
+        ):
+            try:
+                cur = next(cur)
+            except StopIteration:
+                break
+            except Exception:
+                # if next() fails for some reason, stop unwrapping
+                break
+            unwrap_count += 1
+
+        # If the candidate looks like a DB session (has query/execute), use it
+        if hasattr(cur, "query") or hasattr(cur, "execute"):
+            return cur
+    except Exception:
+        # be conservative: keep original if anything goes wrong
+        pass
+    return db_obj
 
 
 class DBProxy:
@@ -22,38 +39,37 @@ class DBProxy:
     This helps when instrumentation (mutmut) wraps dependencies and yields a generator
     object instead of the Session itself. The proxy will attempt to extract the session
     via next() and then forward attribute access to the real session object.
+
+    Resolution runs only until it succeeds; afterwards each attribute access is a
+    plain getattr on the resolved session.
     """
 
     def __init__(self, db_obj: Any) -> None:
         self._orig = db_obj
+        self._resolved = False
 
     def _ensure(self) -> None:
-        # If the original object is a generator-like object, try to extract a
-        # real SQLAlchemy Session from nested generators. Mutmut instrumentation
-        # can wrap values multiple times, so we attempt several unwrap steps.
-        max_unwrap = 6
-        unwrap_count = 0
-        try:
-            cur = self._orig
-            while unwrap_count < max_unwrap and (
-                isinstance(cur, types.GeneratorType) or hasattr(cur, "__next__")
-            ):
-                try:
-                    cur = next(cur)
-                except StopIteration:
-                    break
-                except Exception:
-                    # if next() fails for some reason, stop unwrapping
-                    break
-                unwrap_count += 1
-
-            # If the candidate looks like a DB session (has query/execute), use it
-            if hasattr(cur, "query") or hasattr(cur, "execute"):
-                self._orig = cur
-        except Exception:
-            # be conservative: keep original if anything goes wrong
-            pass
+        if self._resolved:
+            return
+        self._orig = _unwrap(self._orig)
+        self._resolved = hasattr(self._orig, "query") or hasattr(self._orig, "execute")
 
     def __getattr__(self, name: str):
         self._ensure()
         return getattr(self._orig, name)
+
+
+def resolve_session(db_obj: Any) -> Any:
+    """
+    Resolve o objeto de banco recebido pelos repositórios uma única vez.
+
+    Sessions reais são devolvidas como estão (sem proxy, custo zero por chamada);
+    objetos geradores (instrumentação do mutmut) são desembrulhados aqui e, se
+    ainda não for possível obter a sessão, ficam em um DBProxy.
+    """
+    if isinstance(db_obj, Session):
+        return db_obj
+    resolved = _unwrap(db_obj)
+    if isinstance(resolved, Session) or hasattr(resolved, "query") or hasattr(resolved, "execute"):
+        return resolved
+    return DBProxy(db_obj)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import date
 from typing import TypeVar, Generic, List, Optional
 
 T = TypeVar("T")
@@ -25,3 +26,18 @@ class Repository(ABC, Generic[T]):
     @abstractmethod
     def delete(self, obj_id: int) -> None:
         pass
+
+
+class BalanceLedger(ABC):
+    """
+    Interface do livro de saldos por usuário: saldo corrente mantido a cada
+    escrita e checkpoints mensais para consultas em datas passadas.
+    """
+
+    @abstractmethod
+    def current(self, user_id: int) -> float:
+        """Saldo atual do usuário (receitas - despesas)."""
+
+    @abstractmethod
+    def as_of(self, user_id: int, dt: date) -> float:
+        """Saldo do usuário considerando as transações até `dt` (inclusive)."""
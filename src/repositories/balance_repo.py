@@ -0,0 +1,170 @@
+from datetime import date
+from typing import Dict, Tuple, Union
+
+from sqlalchemy import Integer, bindparam, case, delete, func, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from src.models.balance import BalanceCheckpoint, UserBalance
+from src.models.transaction import Transaction
+from src.models.types import raw_cents
+from src.repositories.abstract import BalanceLedger
+from src.utils.logger import get_logger
+from src.utils.money import from_cents
+
+logger = get_logger(__name__)
+
+# (user_id, "AAAA-MM") -> variação do saldo no mês, em centavos
+BalanceDeltas = Dict[Tuple[int, str], int]
+
+_balances = UserBalance.__table__
+_checkpoints = BalanceCheckpoint.__table__
+
+
+def signed_amount_column():
+    """Valor da transação com sinal: receitas somam, despesas subtraem."""
+    return case((Transaction.type == "Receita", Transaction.amount), else_=-Transaction.amount)
+
+
+def apply_balance_deltas(conn: Union[Connection, Session], deltas: BalanceDeltas) -> None:
+    """
+    Soma as variações ao saldo corrente e aos checkpoints mensais. Cada
+    checkpoint guarda o saldo acumulado até o fim do mês, então uma variação
+    em um mês também vale para os checkpoints dos meses seguintes (escritas
+    retroativas). Por usuário: lê os checkpoints afetados de uma vez, recalcula
+    em memória e grava com um executemany de UPDATE e outro de INSERT, tudo em
+    centavos inteiros (sem passar por reais). Deve ser chamada na mesma
+    transação da escrita que originou as variações.
+    """
+    by_user: Dict[int, Dict[str, int]] = {}
+    for (user_id, ym), cents in deltas.items():
+        if cents:
+            months = by_user.setdefault(user_id, {})
+            months[ym] = months.get(ym, 0) + cents
+
+    for user_id, months in by_user.items():
+        first = min(months)
+        existing = dict(
+            conn.execute(
+                select(_checkpoints.c.year_month, raw_cents(_checkpoints.c.balance)).where(
+                    _checkpoints.c.user_id == user_id, _checkpoints.c.year_month >= first
+                )
+            ).all()
+        )
+        # saldo antes do primeiro mês afetado (base para meses ainda sem checkpoint)
+        closing = conn.execute(
+            select(raw_cents(_checkpoints.c.balance))
+            .where(_checkpoints.c.user_id == user_id, _checkpoints.c.year_month < first)
+            .order_by(_checkpoints.c.year_month.desc())
+            .limit(1)
+        ).scalar() or 0
+
+        updates, inserts = [], []
+        shift = 0
+        for ym in sorted(existing.keys() | months.keys()):
+            shift += months.get(ym, 0)
+            if ym in existing:
+                closing = existing[ym]
+                updates.append({"u": user_id, "ym": ym, "new_balance": closing + shift})
+            else:
+                inserts.append({"u": user_id, "ym": ym, "new_balance": closing + shift})
+        if updates:
+            conn.execute(
+                update(_checkpoints)
+                .where(
+                    _checkpoints.c.user_id == bindparam("u"),
+                    _checkpoints.c.year_month == bindparam("ym"),
+                )
+                .values(balance=bindparam("new_balance", type_=Integer)),
+                updates,
+            )
+        if inserts:
+            conn.execute(
+                insert(_checkpoints).values(
+                    user_id=bindparam("u"),
+                    year_month=bindparam("ym"),
+                    balance=bindparam("new_balance", type_=Integer),
+                ),
+                inserts,
+            )
+
+        total = sum(months.values())
+        result = conn.execute(
+            update(_balances)
+            .where(_balances.c.user_id == user_id)
+            .values(balance=raw_cents(_balances.c.balance) + total)
+        )
+        if result.rowcount == 0:
+            conn.execute(insert(_balances).values(user_id=user_id, balance=raw_cents(total)))
+
+
+def rebuild_balances(conn: Union[Connection, Session]) -> None:
+    """Recalcula saldos e checkpoints a partir da tabela `transactions`."""
+    conn.execute(delete(_balances))
+    conn.execute(delete(_checkpoints))
+    signed = signed_amount_column()
+    conn.execute(
+        insert(_balances).from_select(
+            ["user_id", "balance"],
+            select(Transaction.user_id, func.sum(signed)).group_by(Transaction.user_id),
+        )
+    )
+    ym = func.strftime("%Y-%m", Transaction.date)
+    monthly = (
+        select(Transaction.user_id, ym.label("ym"), func.sum(signed).label("net"))
+        .group_by(Transaction.user_id, ym)
+        .subquery()
+    )
+    # saldo ao fim de cada mês = soma acumulada dos meses até ele
+    running = func.sum(monthly.c.net).over(
+        partition_by=monthly.c.user_id, order_by=monthly.c.ym
+    )
+    conn.execute(
+        insert(_checkpoints).from_select(
+            ["user_id", "year_month", "balance"],
+            select(monthly.c.user_id, monthly.c.ym, running),
+        )
+    )
+
+
+class SQLBalanceLedger(BalanceLedger):
+    """
+    Livro de saldos no banco (`user_balances` e `balance_checkpoints`),
+    mantido junto com o consolidado mensal a cada escrita de transação.
+
+    - current: uma busca pela chave primária.
+    - as_of: checkpoint do último mês com movimento antes do mês de `dt`
+      (busca no índice da chave primária) + soma das transações do próprio mês
+      até `dt` (faixa do índice ix_transactions_user_date).
+    """
+
+    def __init__(self, db: Session) -> None:
+        from src.repositories._db_utils import resolve_session
+
+        self.db = resolve_session(db)
+
+    def current(self, user_id: int) -> float:
+        balance = self.db.execute(
+            select(_balances.c.balance).where(_balances.c.user_id == user_id)
+        ).scalar()
+        return float(balance or 0.0)
+
+    def as_of(self, user_id: int, dt: date) -> float:
+        month_start = dt.replace(day=1)
+        checkpoint = self.db.execute(
+            select(raw_cents(_checkpoints.c.balance))
+            .where(
+                _checkpoints.c.user_id == user_id,
+                _checkpoints.c.year_month < month_start.strftime("%Y-%m"),
+            )
+            .order_by(_checkpoints.c.year_month.desc())
+            .limit(1)
+        ).scalar()
+        in_month = self.db.execute(
+            select(raw_cents(func.sum(signed_amount_column()))).where(
+                Transaction.user_id == user_id,
+                Transaction.date >= month_start,
+                Transaction.date <= dt,
+            )
+        ).scalar()
+        return from_cents((checkpoint or 0) + (in_month or 0))
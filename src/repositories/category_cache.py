@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from src.models.cache_version import CacheVersion
+from src.models.category import Category
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CATEGORIES_CACHE = "categories"
+
+_versions = CacheVersion.__table__
+
+
+def bump_cache_version(conn: Union[Connection, Session], name: str = CATEGORIES_CACHE) -> None:
+    """
+    Incrementa o contador de versão do cache `name`. Deve rodar na mesma
+    transação da escrita que alterou os dados de origem.
+    """
+    result = conn.execute(
+        update(_versions)
+        .where(_versions.c.name == name)
+        .values(version=_versions.c.version + 1)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(_versions).values(name=name, version=1))
+
+
+def read_cache_version(conn: Union[Connection, Session], name: str = CATEGORIES_CACHE) -> int:
+    """Versão atual do cache `name` no banco (0 se nunca houve escrita)."""
+    version = conn.execute(
+        select(_versions.c.version).where(_versions.c.name == name)
+    ).scalar()
+    return version or 0
+
+
+def _name_key(cat: Category) -> str:
+    return cat.name.lower()
+
+
+class CategoryCache:
+    """
+    Cópia em memória da tabela `categories` (pequena e quase estática).
+
+    Oferece busca por id em O(1) e listas já ordenadas por nome, por tipo e
+    para os dois sentidos. O CategoryService invalida a cópia local a cada
+    escrita; outros processos (workers) percebem a mudança pelo contador em
+    `cache_versions`, consultado no máximo a cada `check_interval` segundos.
+
+    As categorias guardadas são instâncias destacadas (detached) da sessão:
+    servem apenas para leitura.
+    """
+
+    def __init__(self, session_factory, check_interval: float = 1.0) -> None:
+        self.session_factory = session_factory
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._by_id: Dict[int, Category] = {}
+        self._sorted: Dict[Tuple[Optional[str], str], List[Category]] = {}
+
+    def is_fresh(self) -> bool:
+        """Indica se a cópia está carregada e a versão foi conferida há pouco."""
+        return (
+            self._version is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    def invalidate(self) -> None:
+        """Descarta a cópia local; a próxima leitura recarrega do banco."""
+        self._version = None
+
+    def refresh(self) -> None:
+        """Confere a versão no banco e recarrega as categorias se ela mudou."""
+        with self._lock:
+            if self.is_fresh():
+                return
+            with self.session_factory() as db:
+                version = read_cache_version(db)
+                if version != self._version:
+                    self._load(db, version)
+            self._checked_at = time.monotonic()
+
+    def _load(self, db: Session, version: int) -> None:
+        cats = list(db.execute(select(Category)).scalars())
+        db.expunge_all()
+
+        by_id = {c.id: c for c in cats}
+        sorted_lists: Dict[Tuple[Optional[str], str], List[Category]] = {}
+        for tipo in {None, *(c.type for c in cats)}:
+            group = [c for c in cats if tipo is None or c.type == tipo]
+            sorted_lists[(tipo, "asc")] = sorted(group, key=_name_key)
+            sorted_lists[(tipo, "desc")] = sorted(group, key=_name_key, reverse=True)
+
+        # troca as estruturas de uma vez: leitores concorrentes veem a cópia
+        # antiga ou a nova, nunca uma mistura
+        self._by_id, self._sorted = by_id, sorted_lists
+        self._version = version
+        logger.info("Cache de categorias carregado: %s itens (versão %s)", len(cats), version)
+
+    def _ensure(self) -> None:
+        if not self.is_fresh():
+            self.refresh()
+
+    def get(self, cat_id: int) -> Optional[Category]:
+        self._ensure()
+        return self._by_id.get(cat_id)
+
+    def list_sorted(self, tipo: Optional[str] = None, order: str = "asc") -> List[Category]:
+        """Categorias (opcionalmente de um tipo) ordenadas por nome, sem consultar o banco."""
+        self._ensure()
+        key = (tipo, "desc" if order == "desc" else "asc")
+        return list(self._sorted.get(key, ()))
+
+    def types_by_id(self, cat_ids: Iterable[int]) -> Dict[int, str]:
+        """Mesmo contrato de CategoryRepository.types_by_id, servido da memória."""
+        self._ensure()
+        by_id = self._by_id
+        return {i: by_id[i].type for i in set(cat_ids) if i in by_id}
@@ -1,10 +1,14 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 import types
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.models.category import Category
+from src.repositories.category_cache import bump_cache_version
+from src.repositories.unit_of_work import commit_or_flush
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,15 +20,16 @@ class CategoryRepository:
     def __init__(self, db: Session) -> None:
         # Mutmut instrumentation may yield a generator-like object instead
         # of a Session; defensively extract the session if possible.
-        from src.repositories._db_utils import DBProxy
+        from src.repositories._db_utils import resolve_session
 
-        self.db = DBProxy(db)
+        self.db = resolve_session(db)
 
+    # Toda escrita incrementa a versão do cache de categorias na mesma transação
     def add(self, cat: Category) -> Category:
         self.db.add(cat)
         try:
-            self.db.commit()
-            self.db.refresh(cat)
+            bump_cache_version(self.db)
+            commit_or_flush(self.db, cat)
             logger.info("Categoria criada id=%s", cat.id)
             return cat
         except SQLAlchemyError as e:
@@ -44,8 +49,8 @@ class CategoryRepository:
 
     def update(self, cat: Category) -> Category:
         try:
-            self.db.commit()
-            self.db.refresh(cat)
+            bump_cache_version(self.db)
+            commit_or_flush(self.db, cat)
             logger.info("Categoria atualizada id=%s", cat.id)
             return cat
         except SQLAlchemyError as e:
@@ -56,7 +61,8 @@ class CategoryRepository:
     def delete(self, cat: Category) -> None:
         self.db.delete(cat)
         try:
-            self.db.commit()
+            bump_cache_version(self.db)
+            commit_or_flush(self.db)
             logger.info("Categoria removida id=%s", cat.id)
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -69,3 +75,29 @@ class CategoryRepository:
             .filter(Category.type == tipo)
             .all()
         )
+
+    def types_by_id(self, cat_ids: Iterable[int]) -> Dict[int, str]:
+        """Retorna {id: tipo} das categorias existentes entre os IDs, em uma consulta (IN)."""
+        ids = set(cat_ids)
+        if not ids:
+            return {}
+        rows = self.db.query(Category.id, Category.type).filter(Category.id.in_(ids)).all()
+        return {cat_id: tipo for cat_id, tipo in rows}
+
+
+class AsyncCategoryRepository:
+    """Variante assíncrona (AsyncSession) das leituras do CategoryRepository."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get(self, cat_id: int) -> Optional[Category]:
+        return await self.db.get(Category, cat_id)
+
+    async def list_all(self) -> List[Category]:
+        result = await self.db.execute(select(Category))
+        return list(result.scalars())
+
+    async def list_by_type(self, tipo: str) -> List[Category]:
+        result = await self.db.execute(select(Category).where(Category.type == tipo))
+        return list(result.scalars())
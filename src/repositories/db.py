@@ -1,45 +1,208 @@
-import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from config.settings import Settings, get_settings
 from src.models.base import Base
+from src.repositories.migrations import run_migrations
+from src.repositories.monthly_totals_repo import track_monthly_totals
+from src.repositories.query_stats import install_query_stats
+from src.utils.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUTS, DB_POOL_OVERFLOW, registry
 
 
 from src.models.user import User
 from src.models.category import Category  
 from src.models.transaction import Transaction
+from src.models.monthly_total import MonthlyTotal
+from src.models.cache_version import CacheVersion
+from src.models.balance import BalanceCheckpoint, UserBalance
 
 
-def _get_setting(name: str, default=None):
-    try:
-        from config.settings import get_setting as _gs
+# Perfis de PRAGMAs aplicados a cada conexão SQLite nova.
+# "tuned": WAL (leitores não bloqueiam atrás do escritor), synchronous=NORMAL
+# (seguro com WAL, sem fsync por commit), cache de 64 MB, mmap de 256 MB,
+# temporários em memória e espera de 5 s por locks em vez de erro imediato.
+# "sqlite": não altera nada (padrões do próprio SQLite).
+SQLITE_PROFILES = {
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": "-65536",
+        "mmap_size": "268435456",
+        "temp_store": "MEMORY",
+        "busy_timeout": "5000",
+    },
+    "sqlite": {},
+}
 
-        return _gs(name, default)
-    except Exception:
-        return os.environ.get(name, default)
+# Valores aceitos por PRAGMA (PRAGMA não aceita parâmetros ligados)
+_PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+_PRAGMA_INTEGERS = {"cache_size", "mmap_size", "busy_timeout"}
+
+
+def sqlite_pragmas(settings: Settings | None = None) -> dict[str, str]:
+    """
+    Monta os PRAGMAs a partir do perfil SQLITE_PROFILE (padrão "tuned"),
+    sobrescritos individualmente por SQLITE_<PRAGMA> (ex.: SQLITE_SYNCHRONOUS=FULL).
+
+    Raises:
+        ValueError: para perfil ou valor de PRAGMA inválido.
+    """
+    settings = settings or get_settings()
+    profile_name = settings.sqlite_profile.lower()
+    if profile_name not in SQLITE_PROFILES:
+        raise ValueError(f"SQLITE_PROFILE inválido: {profile_name}")
+    pragmas = dict(SQLITE_PROFILES[profile_name])
+
+    for name in (*_PRAGMA_CHOICES, *_PRAGMA_INTEGERS):
+        override = getattr(settings, f"sqlite_{name}")
+        if override:
+            pragmas[name] = override.strip()
+
+    for name, value in pragmas.items():
+        if name in _PRAGMA_INTEGERS:
+            pragmas[name] = str(int(value))
+        elif value.upper() not in _PRAGMA_CHOICES[name]:
+            raise ValueError(f"Valor inválido para PRAGMA {name}: {value}")
+        else:
+            pragmas[name] = value.upper()
+    return pragmas
+
+
+def _install_sqlite_pragmas(engine: Engine, pragmas: dict[str, str]) -> None:
+    """Aplica os PRAGMAs em cada conexão DBAPI aberta pela engine."""
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _install_pool_metrics(engine: Engine, label: str) -> None:
+    """Conta retiradas/devoluções do pool da engine e expõe o overflow nas métricas."""
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc(label)
+        DB_POOL_CHECKED_OUT.inc(label)
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_conn, connection_record):
+        DB_POOL_CHECKED_OUT.dec(label)
+
+    def _overflow() -> None:
+        # só QueuePool tem overflow; os pools do SQLite em memória não têm
+        overflow = getattr(engine.pool, "overflow", None)
+        DB_POOL_OVERFLOW.set(max(overflow(), 0) if overflow else 0, label)
+
+    registry.add_collector(f"pool_overflow_{label}", _overflow)
 
 
 def get_engine() -> Engine:
     """
     Cria e retorna a engine de conexão com o banco de dados.
+    Para SQLite, aplica o perfil de PRAGMAs configurado (ver sqlite_pragmas).
+    Cada consulta é medida para os contadores por requisição e o log de
+    consultas lentas (ver install_query_stats).
 
     Returns:
         sqlalchemy.engine.Engine: Objeto Engine configurado.
     """
-    database_url: str = _get_setting("DATABASE_URL", "sqlite:///./fintrack.db")
-    return create_engine(database_url, echo=False, future=True)
+    settings = get_settings()
+    eng = create_engine(settings.database_url, echo=False, future=True)
+    if eng.dialect.name == "sqlite":
+        _install_sqlite_pragmas(eng, sqlite_pragmas())
+    install_query_stats(eng, settings.slow_query_ms)
+    _install_pool_metrics(eng, "sync")
+    return eng
 
 
 engine = get_engine()
 SessionLocal: sessionmaker[Session] = sessionmaker(
     bind=engine, autoflush=False, autocommit=False
 )
+# consolidado mensal atualizado no mesmo flush/transação de cada escrita,
+# em qualquer sessão (não só nas de SessionLocal)
+track_monthly_totals()
+
+
+def async_database_url() -> str:
+    """
+    URL da engine assíncrona: ASYNC_DATABASE_URL, se definida; senão a própria
+    DATABASE_URL com o driver aiosqlite (sqlite:///x.db -> sqlite+aiosqlite:///x.db).
+
+    Raises:
+        ValueError: se o banco não for SQLite e ASYNC_DATABASE_URL não estiver definida.
+    """
+    settings = get_settings()
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url)
+    if url.get_backend_name() != "sqlite":
+        raise ValueError("Defina ASYNC_DATABASE_URL para bancos que não sejam SQLite.")
+    return url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Cria a engine assíncrona usada pelas rotas async (leituras) da API,
+    com o mesmo perfil de PRAGMAs e a mesma instrumentação da engine síncrona.
+    """
+    eng = create_async_engine(async_database_url(), echo=False)
+    if eng.dialect.name == "sqlite":
+        _install_sqlite_pragmas(eng.sync_engine, sqlite_pragmas())
+    install_query_stats(eng.sync_engine, get_settings().slow_query_ms)
+    _install_pool_metrics(eng.sync_engine, "async")
+    return eng
+
+
+# criados no primeiro uso (ver get_async_sessionmaker): importar este módulo não
+# exige driver assíncrono nem ASYNC_DATABASE_URL em bancos que não sejam SQLite
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Fábrica das sessões assíncronas, criada junto com a engine assíncrona na
+    primeira chamada e reaproveitada nas seguintes.
+
+    Raises:
+        ValueError: como async_database_url, se não houver URL assíncrona.
+    """
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        _async_engine = get_async_engine()
+        _async_sessionmaker = async_sessionmaker(
+            bind=_async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+def async_session() -> AsyncSession:
+    """Nova AsyncSession (use com `async with`)."""
+    return get_async_sessionmaker()()
+
+
+async def dispose_async_engine() -> None:
+    """Fecha as conexões da engine assíncrona, se ela chegou a ser criada."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
 
 
 def init_db() -> None:
     """
-    Inicializa o banco de dados criando todas as tabelas definidas nos modelos ORM.
-    Caso as tabelas já existam, nenhuma alteração é feita.
+    Inicializa o banco de dados criando todas as tabelas definidas nos modelos ORM
+    e aplicando as migrações pendentes (ex.: índices novos em tabelas existentes).
     """
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
     print("✅ Banco de dados inicializado com sucesso!")
@@ -1,5 +1,8 @@
-from typing import Dict, Generic, TypeVar, List, Optional
-from src.repositories.abstract import Repository
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Any, Dict, Generic, TypeVar, List, Optional, Tuple
+from src.repositories.abstract import BalanceLedger, Repository
+from src.utils.money import from_cents, to_cents
 
 T = TypeVar("T")
 
@@ -62,3 +65,76 @@ class MemoryRepository(Generic[T], Repository[T]):
     def delete(self, obj_id: int) -> None:
         """Remove um objeto da memória pelo ID."""
         self._data.pop(obj_id, None)
+
+
+class MemoryBalanceLedger(BalanceLedger):
+    """
+    Livro de saldos em memória, com o mesmo contrato do SQLBalanceLedger:
+    saldo corrente por usuário e saldo acumulado ao fim de cada mês com
+    movimento (checkpoints), atualizados a cada transação registrada.
+    Os valores são guardados em centavos inteiros.
+    """
+
+    def __init__(self) -> None:
+        self._balances: Dict[int, int] = {}
+        self._months: Dict[int, List[str]] = {}  # "AAAA-MM" com movimento, em ordem
+        self._closing: Dict[Tuple[int, str], int] = {}  # saldo ao fim do mês
+        self._entries: Dict[Tuple[int, str], List[Tuple[date, int]]] = {}
+
+    def record(self, tx: Any, sign: int = 1) -> None:
+        """Aplica uma transação ao livro (sign=-1 desfaz uma transação registrada antes)."""
+        amount = to_cents(tx.amount) * sign
+        if tx.type != "Receita":
+            amount = -amount
+        user_id, dt = tx.user_id, tx.date
+        ym = f"{dt.year:04d}-{dt.month:02d}"
+        self._balances[user_id] = self._balances.get(user_id, 0) + amount
+        self._entries.setdefault((user_id, ym), []).append((dt, amount))
+
+        months = self._months.setdefault(user_id, [])
+        pos = bisect_left(months, ym)
+        if pos == len(months) or months[pos] != ym:
+            previous = self._closing[(user_id, months[pos - 1])] if pos else 0
+            insort(months, ym)
+            self._closing[(user_id, ym)] = previous
+        for later in months[pos:]:
+            self._closing[(user_id, later)] += amount
+
+    def current(self, user_id: int) -> float:
+        return from_cents(self._balances.get(user_id, 0))
+
+    def as_of(self, user_id: int, dt: date) -> float:
+        ym = f"{dt.year:04d}-{dt.month:02d}"
+        months = self._months.get(user_id, [])
+        pos = bisect_left(months, ym)
+        checkpoint = self._closing[(user_id, months[pos - 1])] if pos else 0
+        in_month = sum(a for d, a in self._entries.get((user_id, ym), ()) if d <= dt)
+        return from_cents(checkpoint + in_month)
+
+
+class MemoryTransactionRepository(MemoryRepository[T]):
+    """MemoryRepository de transações que mantém um MemoryBalanceLedger a cada escrita."""
+
+    def __init__(self, ledger: Optional[MemoryBalanceLedger] = None) -> None:
+        super().__init__()
+        self.ledger = ledger or MemoryBalanceLedger()
+
+    def add(self, obj: T) -> T:
+        obj = super().add(obj)
+        self.ledger.record(obj)
+        return obj
+
+    def update(self, obj_id: int, **fields) -> Optional[T]:
+        obj = self._data.get(obj_id)
+        if obj is not None:
+            self.ledger.record(obj, sign=-1)
+        obj = super().update(obj_id, **fields)
+        if obj is not None:
+            self.ledger.record(obj)
+        return obj
+
+    def delete(self, obj_id: int) -> None:
+        obj = self._data.get(obj_id)
+        if obj is not None:
+            self.ledger.record(obj, sign=-1)
+        super().delete(obj_id)
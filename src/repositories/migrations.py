@@ -0,0 +1,158 @@
+from typing import Callable, List
+
+from sqlalchemy import Integer, Table, cast, column, func, inspect, insert, select
+from sqlalchemy import table as table_clause
+from sqlalchemy.engine import Connection, Engine
+
+from src.models.balance import BalanceCheckpoint, UserBalance
+from src.models.base import Base
+from src.models.monthly_total import MonthlyTotal
+from src.models.transaction import Transaction
+from src.repositories.balance_repo import rebuild_balances
+from src.repositories.monthly_totals_repo import rebuild_monthly_totals
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+# colunas de dinheiro guardadas em centavos inteiros (tipo Cents)
+MONEY_COLUMNS = [
+    (Transaction.__table__, "amount"),
+    (MonthlyTotal.__table__, "total"),
+    (UserBalance.__table__, "balance"),
+    (BalanceCheckpoint.__table__, "balance"),
+]
+
+
+def _copy_as_cents(conn: Connection, table: Table, money_column: str) -> None:
+    """
+    Recria `table` com a coluna `money_column` inteira e copia as linhas,
+    convertendo reais (REAL) em centavos. ROUND(x, 2) arredonda pela
+    representação decimal, como to_cents (1.005 -> 101).
+    """
+    old_name = f"{table.name}_old"
+    # nomes de índice são globais no SQLite: os da tabela antiga saem antes de recriar
+    for index in inspect(conn).get_indexes(table.name):
+        conn.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+    conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{old_name}"')
+    table.create(bind=conn)
+
+    names = [c.name for c in table.columns]
+    old = table_clause(old_name, *(column(n) for n in names))
+    conn.execute(
+        insert(table).from_select(
+            names,
+            select(*(
+                cast(func.round(func.round(old.c[n], 2) * 100), Integer).label(n)
+                if n == money_column else old.c[n]
+                for n in names
+            )),
+        )
+    )
+    conn.exec_driver_sql(f'DROP TABLE "{old_name}"')
+
+
+def _recover_interrupted_copy(conn: Connection, table: Table) -> None:
+    """
+    Trata a sobra de uma conversão interrompida (de antes de ela rodar em uma
+    transação só): `<tabela>_old` ao lado da tabela nova.
+
+    - Tabela nova vazia: a cópia não chegou a rodar. A nova sai e a antiga
+      volta ao nome original, para ser convertida de novo.
+    - Tabela nova com todas as linhas da antiga: só faltou remover a antiga.
+    - Caso contrário (houve escrita na tabela nova), não há como juntar as duas
+      com segurança: a migração para e pede revisão manual.
+
+    Raises:
+        RuntimeError: quando as duas tabelas têm linhas diferentes.
+    """
+    old_name = f"{table.name}_old"
+    if old_name not in inspect(conn).get_table_names():
+        return
+    old = table_clause(old_name, column("id"))
+    new_rows = conn.execute(select(func.count()).select_from(table)).scalar()
+    if not new_rows:
+        for index in inspect(conn).get_indexes(table.name):
+            conn.exec_driver_sql(f'DROP INDEX "{index["name"]}"')
+        conn.exec_driver_sql(f'DROP TABLE "{table.name}"')
+        conn.exec_driver_sql(f'ALTER TABLE "{old_name}" RENAME TO "{table.name}"')
+        logger.warning("Conversão interrompida de %s desfeita; será refeita.", table.name)
+        return
+    if "id" in table.c:
+        missing = conn.execute(
+            select(func.count()).select_from(old).where(old.c.id.not_in(select(table.c.id)))
+        ).scalar()
+    else:
+        missing = conn.execute(select(func.count()).select_from(old)).scalar() - new_rows
+    if missing:
+        raise RuntimeError(
+            f"Tabelas {table.name} e {old_name} divergem após uma conversão interrompida: "
+            "revise os dados manualmente antes de iniciar a aplicação."
+        )
+    conn.exec_driver_sql(f'DROP TABLE "{old_name}"')
+    logger.warning("Sobra da conversão de %s removida (%s).", table.name, old_name)
+
+
+def _money_to_cents(conn: Connection) -> None:
+    """Converte para centavos inteiros as colunas de dinheiro ainda em ponto flutuante."""
+    for table, _ in MONEY_COLUMNS:
+        _recover_interrupted_copy(conn, table)
+    inspector = inspect(conn)
+    for table, money_column in MONEY_COLUMNS:
+        column_type = next(
+            c["type"] for c in inspector.get_columns(table.name) if c["name"] == money_column
+        )
+        if not isinstance(column_type, Integer):
+            _copy_as_cents(conn, table, money_column)
+            logger.info("Coluna %s.%s convertida para centavos.", table.name, money_column)
+
+
+def _create_missing_indexes(conn: Connection) -> None:
+    """
+    Cria os índices declarados nos modelos que ainda não existem no banco.
+    `create_all` ignora tabelas já existentes (e os índices delas), então
+    bancos criados antes de um índice novo precisam deste passo.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=conn, checkfirst=True)
+
+
+def _backfill_monthly_totals(conn: Connection) -> None:
+    """Preenche o consolidado mensal em bancos que já tinham transações antes dele."""
+    has_rollup = conn.execute(select(MonthlyTotal.user_id).limit(1)).first()
+    has_transactions = conn.execute(select(Transaction.id).limit(1)).first()
+    if has_transactions and not has_rollup:
+        rebuild_monthly_totals(conn)
+
+
+def _backfill_balances(conn: Connection) -> None:
+    """Preenche saldos e checkpoints em bancos que já tinham transações antes deles."""
+    has_balances = conn.execute(select(UserBalance.user_id).limit(1)).first()
+    has_transactions = conn.execute(select(Transaction.id).limit(1)).first()
+    if has_transactions and not has_balances:
+        rebuild_balances(conn)
+
+
+# Passos executados em ordem a cada inicialização; todos devem ser idempotentes.
+MIGRATIONS: List[Callable[[Connection], None]] = [
+    _money_to_cents,
+    _create_missing_indexes,
+    _backfill_monthly_totals,
+    _backfill_balances,
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Aplica os passos de migração em uma única transação, DDL inclusive: se um
+    passo falhar, o banco fica como estava antes de run_migrations.
+    """
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            # o pysqlite só abre transação antes de INSERT/UPDATE/DELETE; sem
+            # este BEGIN, cada DROP/ALTER/CREATE seria confirmado na hora
+            conn.exec_driver_sql("BEGIN")
+        for step in MIGRATIONS:
+            step(conn)
+            logger.info("Migração aplicada: %s", step.__name__)
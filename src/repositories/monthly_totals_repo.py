@@ -0,0 +1,216 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Tuple, Union
+
+from sqlalchemy import delete, event, func, insert, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.models.monthly_total import MonthlyTotal
+from src.models.transaction import Transaction
+from src.models.types import raw_cents
+from src.repositories.balance_repo import BalanceDeltas, apply_balance_deltas, rebuild_balances
+from src.repositories.unit_of_work import commit_or_flush
+from src.utils.logger import get_logger
+from src.utils.money import to_cents
+
+logger = get_logger(__name__)
+
+# (user_id, "AAAA-MM", tipo) -> [delta do total em centavos, delta da contagem]
+RollupKey = Tuple[int, str, str]
+RollupDeltas = Dict[RollupKey, List[int]]
+
+_table = MonthlyTotal.__table__
+
+
+def year_month(d: date) -> str:
+    """Chave mensal usada no consolidado ("AAAA-MM")."""
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def apply_rollup_deltas(conn: Union[Connection, Session], deltas: RollupDeltas) -> None:
+    """
+    Soma os deltas ao consolidado mensal (UPDATE e, se a linha não existir,
+    INSERT) e, convertidos em variação de saldo, ao livro de saldos (ver
+    balance_repo). Os centavos vão inteiros para a coluna, sem passar por
+    reais. Deve ser chamada na mesma transação da escrita que originou os deltas.
+    """
+    balance_deltas: BalanceDeltas = {}
+    for (user_id, ym, tipo), (cents, count) in deltas.items():
+        if not cents and not count:
+            continue
+        signed = cents if tipo == "Receita" else -cents
+        balance_deltas[(user_id, ym)] = balance_deltas.get((user_id, ym), 0) + signed
+        result = conn.execute(
+            update(_table)
+            .where(
+                _table.c.user_id == user_id,
+                _table.c.year_month == ym,
+                _table.c.type == tipo,
+            )
+            .values(total=raw_cents(_table.c.total) + cents, count=_table.c.count + count)
+        )
+        if result.rowcount == 0:
+            conn.execute(
+                insert(_table).values(
+                    user_id=user_id, year_month=ym, type=tipo, total=raw_cents(cents), count=count
+                )
+            )
+    apply_balance_deltas(conn, balance_deltas)
+
+
+def rebuild_monthly_totals(conn: Union[Connection, Session]) -> None:
+    """Recalcula todo o consolidado mensal a partir da tabela `transactions`."""
+    conn.execute(delete(_table))
+    ym = func.strftime("%Y-%m", Transaction.date)
+    conn.execute(
+        insert(_table).from_select(
+            ["user_id", "year_month", "type", "total", "count"],
+            select(
+                Transaction.user_id,
+                ym,
+                Transaction.type,
+                func.sum(Transaction.amount),
+                func.count(),
+            ).group_by(Transaction.user_id, ym, Transaction.type),
+        )
+    )
+
+
+def rollup_totals_statement(user_id: int):
+    """SELECT type, SUM(total) do consolidado do usuário, por tipo."""
+    return (
+        select(_table.c.type, func.sum(_table.c.total))
+        .where(_table.c.user_id == user_id)
+        .group_by(_table.c.type)
+    )
+
+
+def _add_delta(deltas: RollupDeltas, user_id, dt, tipo, amount, sign: int) -> None:
+    if user_id is None or dt is None or tipo is None or amount is None:
+        return
+    entry = deltas[(user_id, year_month(dt), tipo)]
+    entry[0] += sign * to_cents(amount)
+    entry[1] += sign
+
+
+_ROLLUP_FIELDS = ("user_id", "date", "type", "amount")
+
+
+def _committed_values(session: Session, tx: Transaction) -> list:
+    """
+    Valores de (user_id, date, type, amount) ainda gravados no banco para `tx`.
+    Se a instância estava expirada (ex.: após um commit) quando o campo foi
+    alterado, o histórico não tem o valor antigo: relê a linha antes do flush.
+    """
+    values = []
+    state = inspect(tx)
+    for name in _ROLLUP_FIELDS:
+        hist = state.attrs[name].history
+        if hist.deleted:
+            values.append(hist.deleted[0])
+        elif hist.unchanged:
+            values.append(hist.unchanged[0])
+        elif not hist.added:
+            values.append(getattr(tx, name))
+        else:
+            row = session.connection().execute(
+                select(*(Transaction.__table__.c[n] for n in _ROLLUP_FIELDS))
+                .where(Transaction.__table__.c.id == state.identity[0])
+            ).first()
+            return list(row) if row is not None else [None] * len(_ROLLUP_FIELDS)
+    return values
+
+
+def _rollup_before_flush(session: Session, flush_context, instances) -> None:
+    """
+    Listener `before_flush`: converte as transações novas, alteradas e removidas
+    do flush em deltas do consolidado, gravados na mesma transação do banco.
+    """
+    deltas: RollupDeltas = defaultdict(lambda: [0, 0])
+
+    for obj in session.new:
+        if isinstance(obj, Transaction):
+            _add_delta(deltas, obj.user_id, obj.date, obj.type, obj.amount, +1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Transaction):
+            _add_delta(deltas, *_committed_values(session, obj), -1)
+
+    for obj in session.dirty:
+        if isinstance(obj, Transaction) and session.is_modified(obj):
+            _add_delta(deltas, *_committed_values(session, obj), -1)
+            _add_delta(deltas, obj.user_id, obj.date, obj.type, obj.amount, +1)
+
+    if deltas:
+        apply_rollup_deltas(session.connection(), deltas)
+
+
+def track_monthly_totals() -> None:
+    """
+    Registra a manutenção do consolidado mensal (e do livro de saldos) na classe
+    Session: vale para toda sessão, de qualquer fábrica ou criada direto, e para
+    a sessão interna das AsyncSession. Só escritas Core (insert/update na
+    tabela) ficam de fora e precisam aplicar os próprios deltas (ver bulk_add).
+    """
+    if not event.contains(Session, "before_flush", _rollup_before_flush):
+        event.listen(Session, "before_flush", _rollup_before_flush)
+
+
+class MonthlyTotalRepository:
+    """Consultas ao consolidado mensal de transações."""
+
+    def __init__(self, db: Session) -> None:
+        from src.repositories._db_utils import resolve_session
+
+        self.db = resolve_session(db)
+
+    def get_total(self, user_id: int, ym: str, tipo: str) -> float:
+        """Total do usuário no mês/tipo (busca pela chave primária)."""
+        total = self.db.execute(
+            select(_table.c.total).where(
+                _table.c.user_id == user_id,
+                _table.c.year_month == ym,
+                _table.c.type == tipo,
+            )
+        ).scalar()
+        return float(total or 0.0)
+
+    def get_totals(self, keys: Iterable[Tuple[int, str]], tipo: str) -> Dict[Tuple[int, str], float]:
+        """Totais de vários pares (user_id, "AAAA-MM") do tipo, em uma única consulta."""
+        keys = set(keys)
+        if not keys:
+            return {}
+        rows = self.db.execute(
+            select(_table.c.user_id, _table.c.year_month, _table.c.total).where(
+                _table.c.type == tipo,
+                _table.c.user_id.in_({k[0] for k in keys}),
+                _table.c.year_month.in_({k[1] for k in keys}),
+            )
+        )
+        return {
+            (user_id, ym): float(total)
+            for user_id, ym, total in rows
+            if (user_id, ym) in keys
+        }
+
+    def totals_by_type(self, user_id: int) -> Dict[str, float]:
+        """Totais do usuário por tipo, somando os meses consolidados."""
+        rows = self.db.execute(rollup_totals_statement(user_id))
+        return {tipo: float(total or 0) for tipo, total in rows}
+
+    def rebuild(self) -> None:
+        """
+        Recalcula o consolidado e o livro de saldos (bancos existentes ou após
+        correções manuais).
+        """
+        try:
+            rebuild_monthly_totals(self.db)
+            rebuild_balances(self.db)
+            commit_or_flush(self.db)
+            logger.info("Consolidado mensal recalculado.")
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error("Erro ao recalcular consolidado mensal: %s", e)
+            raise
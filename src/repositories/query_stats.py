@@ -0,0 +1,90 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.utils.logger import get_logger
+from src.utils.metrics import DB_QUERY_SECONDS
+
+logger = get_logger("sql")
+
+# tamanho máximo do SQL/parâmetros copiados para o log de consultas lentas
+_MAX_LOGGED_CHARS = 2000
+
+
+class QueryStats:
+    """Contadores de SQL de uma requisição: número de consultas e tempo total no banco."""
+
+    __slots__ = ("count", "total_ms")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+
+
+# Contadores da requisição corrente. O objeto é mutável de propósito: as rotas
+# síncronas rodam no threadpool com uma cópia do contexto, e continuam somando
+# no mesmo QueryStats criado pelo middleware.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Começa a contar as consultas do contexto atual (ex.: uma requisição HTTP)."""
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Contadores do contexto atual, ou None fora de uma requisição instrumentada."""
+    return _current.get()
+
+
+def _truncate(value: Any) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) > _MAX_LOGGED_CHARS:
+        return text[:_MAX_LOGGED_CHARS] + "..."
+    return text
+
+
+def install_query_stats(engine: Engine, slow_query_ms: float = 0.0) -> None:
+    """
+    Mede cada execução de SQL da engine (before/after_cursor_execute): soma nos
+    contadores da requisição corrente e no histograma de duração de SQL
+    (fintrack_db_query_duration_seconds) e loga como WARNING, com SQL e parâmetros,
+    as que passarem de `slow_query_ms` (0 desliga o log de consultas lentas).
+    Para engines assíncronas, instale na `sync_engine`.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.observe(elapsed)
+        elapsed_ms = elapsed * 1000
+        stats = _current.get()
+        if stats is not None:
+            stats.add(elapsed_ms)
+        if slow_query_ms and elapsed_ms >= slow_query_ms:
+            logger.warning(
+                "Consulta lenta (%.1f ms): %s | parâmetros: %s",
+                elapsed_ms, _truncate(statement), _truncate(parameters),
+                extra={"duration_ms": round(elapsed_ms, 3)},
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _discard(exception_context):
+        # a execução falhou e after_cursor_execute não roda: descarta o início
+        conn = exception_context.connection
+        started = conn.info.get("query_started") if conn is not None else None
+        if started:
+            started.pop()
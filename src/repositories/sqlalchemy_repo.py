@@ -2,6 +2,7 @@ from typing import Type, TypeVar, Generic, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError, OperationalError
 from .abstract import Repository
+from .unit_of_work import commit_or_flush
 from src.utils.logger import get_logger
 
 T = TypeVar("T")
@@ -24,15 +25,14 @@ class SQLAlchemyRepository(Generic[T], Repository[T]):
         """Adiciona um novo objeto no banco de dados."""
         try:
             self.session.add(obj)
-            self.session.commit()
-            self.session.refresh(obj)
-            log.info(f"{self.model.__name__} adicionado: {obj}")
+            commit_or_flush(self.session, obj)
+            log.info("%s adicionado: %s", self.model.__name__, obj)
             return obj
         except IntegrityError as e:
             self.session.rollback()
-            log.error(f"Erro de integridade ao adicionar {self.model.__name__}: {e.orig}")
+            log.error("Erro de integridade ao adicionar %s: %s", self.model.__name__, e.orig)
             raise ValueError(f"Erro de integridade: {e.orig}")
         except OperationalError as e:
             self.session.rollback()
-            log.error(f"Erro operacional no BD: {e.orig}")
+            log.error("Erro operacional no BD: %s", e.orig)
             raise ConnectionError(f"Erro de conexão: {e.orig}")
@@ -1,14 +1,187 @@
-from typing import List, Optional
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import types
 
+from sqlalchemy import Integer, Select, String, and_, bindparam, case, func, insert, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from src.models.category import Category
 from src.models.transaction import Transaction
+from src.models.user import User
+from src.repositories.monthly_totals_repo import (
+    MonthlyTotalRepository,
+    apply_rollup_deltas,
+    rollup_totals_statement,
+    year_month,
+)
+from src.repositories.unit_of_work import commit_or_flush
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Colunas aceitas em order_by (whitelist: nunca interpolar nomes vindos da API)
+SORTABLE_COLUMNS = {
+    "id": Transaction.id,
+    "date": Transaction.date,
+    "amount": Transaction.amount,
+    "type": Transaction.type,
+    "user_id": Transaction.user_id,
+    "category_id": Transaction.category_id,
+}
+
+
+def _sort_column(order_by: str):
+    column = SORTABLE_COLUMNS.get(order_by)
+    if column is None:
+        raise ValueError(f"Coluna de ordenação inválida: {order_by}")
+    return column
+
+
+def _filtered(stmt: Select, user_id: Optional[int], tipo: Optional[str]) -> Select:
+    if user_id is not None:
+        stmt = stmt.where(Transaction.user_id == user_id)
+    if tipo is not None:
+        # tipos são gravados como "Receita"/"Despesa"; normalizar o filtro
+        # mantém a comparação direta na coluna (e utilizável por índice)
+        stmt = stmt.where(Transaction.type == tipo.capitalize())
+    return stmt
+
+
+def _ordered(stmt: Select, column, desc: bool) -> Select:
+    if desc:
+        return stmt.order_by(column.desc(), Transaction.id.desc())
+    return stmt.order_by(column.asc(), Transaction.id.asc())
+
+
+def filtered_statement(
+    user_id: Optional[int], tipo: Optional[str], order_by: str, order: str
+) -> Select:
+    """SELECT de transações com WHERE/ORDER BY montados a partir dos filtros."""
+    column = _sort_column(order_by)
+    stmt = _filtered(select(Transaction), user_id, tipo)
+    return _ordered(stmt, column, order.lower() == "desc")
+
+
+def page_statement(
+    user_id: Optional[int],
+    tipo: Optional[str],
+    order_by: str,
+    order: str,
+    limit: int,
+    after: Optional[Tuple[Any, int]],
+    columns: Optional[Tuple] = None,
+) -> Select:
+    """
+    SELECT de uma página por keyset: (order_by, id) depois da chave `after`,
+    com `limit + 1` linhas para indicar se existe próxima página.
+    Com `columns`, seleciona só essas colunas (tuplas) em vez de entidades ORM.
+    """
+    column = _sort_column(order_by)
+    desc = order.lower() == "desc"
+    stmt = _filtered(select(*columns) if columns else select(Transaction), user_id, tipo)
+
+    if after is not None:
+        value, last_id = after
+        if desc:
+            stmt = stmt.where(
+                or_(column < value, and_(column == value, Transaction.id < last_id))
+            )
+        else:
+            stmt = stmt.where(
+                or_(column > value, and_(column == value, Transaction.id > last_id))
+            )
+    return _ordered(stmt, column, desc).limit(limit + 1)
+
+
+# Colunas das listagens sem ORM, na ordem dos campos de TransactionOut
+ROW_COLUMNS = (
+    Transaction.amount,
+    Transaction.date,
+    Transaction.description,
+    Transaction.type,
+    Transaction.user_id,
+    Transaction.category_id,
+    Transaction.id,
+)
+
+
+def totals_statement(user_id: int, start: Optional[date], end: Optional[date]) -> Select:
+    """SELECT type, SUM(amount) ... GROUP BY type do usuário no intervalo."""
+    stmt = select(Transaction.type, func.sum(Transaction.amount)).where(
+        Transaction.user_id == user_id
+    )
+    if start is not None:
+        stmt = stmt.where(Transaction.date >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.date <= end)
+    return stmt.group_by(Transaction.type)
+
+
+# Início do período de cada transação, calculado no SQLite ("AAAA-MM-DD"):
+# semanas começam na segunda-feira (próximo domingo - 6 dias).
+BUCKET_STARTS = {
+    "day": func.date(Transaction.date),
+    "week": func.date(Transaction.date, "weekday 0", "-6 days"),
+    "month": func.strftime("%Y-%m-01", Transaction.date),
+}
+
+
+def timeseries_statement(
+    user_id: int, bucket: str, start: Optional[date], end: Optional[date]
+) -> Select:
+    """
+    SELECT início do período, SUM(receitas), SUM(despesas) do usuário no
+    intervalo, agrupado por período (dia, semana ou mês) e ordenado por data.
+    Lê só date/amount/type pelo índice (user_id, date), sem montar objetos ORM.
+    """
+    bucket_start = BUCKET_STARTS[bucket].label("bucket_start")
+    income = func.sum(case((Transaction.type == "Receita", Transaction.amount), else_=0))
+    expense = func.sum(case((Transaction.type == "Despesa", Transaction.amount), else_=0))
+    stmt = select(bucket_start, income, expense).where(Transaction.user_id == user_id)
+    if start is not None:
+        stmt = stmt.where(Transaction.date >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.date <= end)
+    return stmt.group_by(bucket_start).order_by(bucket_start)
+
+
+def category_breakdown_statement(
+    user_id: int, start: Optional[date], end: Optional[date], tipo: Optional[str] = None
+) -> Select:
+    """
+    SELECT categoria, SUM(amount), COUNT(*) das transações do usuário no
+    intervalo: um JOIN com `categories` e GROUP BY por categoria. O filtro por
+    usuário e data usa o índice ix_transactions_user_date.
+    """
+    total = func.sum(Transaction.amount)
+    stmt = (
+        select(Category.id, Category.name, Category.type, total, func.count())
+        .join(Category, Category.id == Transaction.category_id)
+        .where(Transaction.user_id == user_id)
+    )
+    if start is not None:
+        stmt = stmt.where(Transaction.date >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.date <= end)
+    if tipo is not None:
+        stmt = stmt.where(Transaction.type == tipo)
+    return stmt.group_by(Category.id).order_by(total.desc(), Category.id)
+
+
+def refs_statement(user_ids: Set[int], category_ids: Set[int]):
+    """
+    Uma única consulta (UNION ALL) que devolve quais usuários existem e o tipo
+    de cada categoria existente: linhas ("user", id, NULL) e ("category", id, tipo).
+    """
+    users = select(literal("user"), User.id, literal(None, String)).where(User.id.in_(user_ids))
+    cats = select(literal("category"), Category.id, Category.type).where(
+        Category.id.in_(category_ids)
+    )
+    return union_all(users, cats)
+
 
 class TransactionRepository:
     """
@@ -18,16 +191,15 @@ class TransactionRepository:
 
     def __init__(self, db: Session) -> None:
         # Support generator-like db objects that may appear under mutmut
-        from src.repositories._db_utils import DBProxy
+        from src.repositories._db_utils import resolve_session
 
-        self.db = DBProxy(db)
+        self.db = resolve_session(db)
 
     # CREATE
     def add(self, tx: Transaction) -> Transaction:
         self.db.add(tx)
         try:
-            self.db.commit()
-            self.db.refresh(tx)
+            commit_or_flush(self.db, tx)
             logger.info("Transação criada id=%s", tx.id)
             return tx
         except SQLAlchemyError as e:
@@ -35,6 +207,51 @@ class TransactionRepository:
             logger.error("Erro ao salvar transação: %s", e)
             raise
 
+    # CREATE (em lote)
+    def bulk_add(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insere várias transações com um único executemany e um único commit
+        (ou só flush, dentro de uma UnitOfWork), atualizando o consolidado
+        mensal na mesma transação.
+
+        Args:
+            rows: dicionários com amount_cents (valor em centavos inteiros), date,
+                description, type, user_id, category_id.
+
+        Returns:
+            List[int]: IDs gerados, na mesma ordem de `rows`.
+        """
+        if not rows:
+            return []
+        deltas = defaultdict(lambda: [0, 0])
+        for r in rows:
+            entry = deltas[(r["user_id"], year_month(r["date"]), r["type"])]
+            entry[0] += r["amount_cents"]
+            entry[1] += 1
+        try:
+            # INSERT core em executemany (multi-VALUES), sem a camada ORM por
+            # linha; os centavos vão inteiros para a coluna, sem conversão
+            self.db.execute(
+                insert(Transaction.__table__).values(
+                    amount=bindparam("amount_cents", type_=Integer)
+                ),
+                rows,
+            )
+            # No SQLite o rowid é alocado como max(id) + 1 e a transação mantém o
+            # lock de escrita durante todo o lote: os IDs gerados são os últimos
+            # len(rows) valores, na ordem de inserção (RETURNING com ordem
+            # garantida forçaria uma instrução por linha).
+            last_id = self.db.execute(select(func.max(Transaction.id))).scalar()
+            ids = list(range(last_id - len(rows) + 1, last_id + 1))
+            apply_rollup_deltas(self.db, deltas)
+            commit_or_flush(self.db)
+            logger.info("Lote de transações criado: %s itens", len(ids))
+            return ids
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error("Erro ao salvar lote de transações: %s", e)
+            raise
+
     # READ (único)
     def get(self, tx_id: int) -> Optional[Transaction]:
         return (
@@ -47,11 +264,103 @@ class TransactionRepository:
     def list_all(self) -> List[Transaction]:
         return self.db.query(Transaction).all()
 
+    # READ (lista filtrada e ordenada no banco)
+    def list_filtered(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        order_by: str = "date",
+        order: str = "asc",
+    ) -> List[Transaction]:
+        """
+        Monta WHERE/ORDER BY a partir dos filtros, para que o custo da consulta
+        acompanhe o tamanho do resultado e não o da tabela.
+
+        Raises:
+            ValueError: se `order_by` não estiver em SORTABLE_COLUMNS.
+        """
+        stmt = filtered_statement(user_id, tipo, order_by, order)
+        return list(self.db.execute(stmt).scalars())
+
+    def list_page(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        order_by: str = "date",
+        order: str = "asc",
+        limit: int = 50,
+        after: Optional[Tuple[Any, int]] = None,
+    ) -> Tuple[List[Transaction], bool]:
+        """
+        Página de transações por keyset: ordena por (order_by, id) e continua
+        a partir da chave `after` da última linha da página anterior, sem OFFSET.
+
+        Returns:
+            (itens, has_more): no máximo `limit` itens e se há próxima página.
+
+        Raises:
+            ValueError: se `order_by` não estiver em SORTABLE_COLUMNS.
+        """
+        stmt = page_statement(user_id, tipo, order_by, order, limit, after)
+        rows = list(self.db.execute(stmt).scalars())
+        return rows[:limit], len(rows) > limit
+
+    def lookup_refs(
+        self, user_ids: Iterable[int], category_ids: Iterable[int]
+    ) -> Tuple[Set[int], Dict[int, str]]:
+        """
+        Valida as referências de uma ou várias transações em uma ida ao banco.
+
+        Returns:
+            (ids de usuários existentes, {id da categoria: tipo}) entre os informados.
+        """
+        user_ids, category_ids = set(user_ids), set(category_ids)
+        if not user_ids and not category_ids:
+            return set(), {}
+        users: Set[int] = set()
+        cats: Dict[int, str] = {}
+        for kind, ref_id, tipo in self.db.execute(refs_statement(user_ids, category_ids)):
+            if kind == "user":
+                users.add(ref_id)
+            else:
+                cats[ref_id] = tipo
+        return users, cats
+
+    def exists_for_user(self, user_id: int) -> bool:
+        """Indica se o usuário tem ao menos uma transação (sem carregar linhas)."""
+        return (
+            self.db.query(Transaction.id)
+            .filter(Transaction.user_id == user_id)
+            .limit(1)
+            .first()
+        ) is not None
+
+    def iter_rows_by_user(self, user_id: int, chunk_size: int = 1000) -> Iterator[Any]:
+        """
+        Percorre as transações do usuário em lotes de `chunk_size` linhas
+        (yield_per), como tuplas de colunas e sem montar objetos ORM; a memória
+        usada não depende do total de linhas.
+        """
+        stmt = (
+            select(
+                Transaction.id,
+                Transaction.date,
+                Transaction.amount,
+                Transaction.type,
+                Transaction.description,
+                Transaction.user_id,
+                Transaction.category_id,
+            )
+            .where(Transaction.user_id == user_id)
+            .order_by(Transaction.date, Transaction.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        yield from self.db.execute(stmt)
+
     # UPDATE
     def update(self, tx: Transaction) -> Transaction:
         try:
-            self.db.commit()
-            self.db.refresh(tx)
+            commit_or_flush(self.db, tx)
             logger.info("Transação atualizada id=%s", tx.id)
             return tx
         except SQLAlchemyError as e:
@@ -63,7 +372,7 @@ class TransactionRepository:
     def delete(self, tx: Transaction) -> None:
         self.db.delete(tx)
         try:
-            self.db.commit()
+            commit_or_flush(self.db)
             logger.info("Transação removida id=%s", tx.id)
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -77,3 +386,148 @@ class TransactionRepository:
             .filter(Transaction.user_id == user_id)
             .all()
         )
+
+    # AGREGAÇÕES
+    def totals_by_type(
+        self,
+        user_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, float]:
+        """
+        Soma os valores do usuário por tipo com um único SUM ... GROUP BY type,
+        opcionalmente restrito ao intervalo [start, end].
+
+        Returns:
+            Dict[str, float]: ex. {"Receita": 100.0, "Despesa": 30.0}; tipos sem
+            transações não aparecem.
+        """
+        if start is None and end is None:
+            # histórico completo: soma as linhas do consolidado mensal
+            return MonthlyTotalRepository(self.db).totals_by_type(user_id)
+
+        rows = self.db.execute(totals_statement(user_id, start, end))
+        return {tipo: float(total or 0) for tipo, total in rows}
+
+    def timeseries(
+        self,
+        user_id: int,
+        bucket: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Receitas e despesas do usuário por período, agregadas no banco.
+
+        Returns:
+            List[Tuple[str, float, float]]: (início do período "AAAA-MM-DD",
+            receitas, despesas), em ordem de data; períodos sem transações não aparecem.
+        """
+        rows = self.db.execute(timeseries_statement(user_id, bucket, start, end))
+        return [(b, float(i or 0), float(e or 0)) for b, i, e in rows]
+
+    def category_breakdown(
+        self,
+        user_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        tipo: Optional[str] = None,
+    ) -> List[Tuple[int, str, str, float, int]]:
+        """
+        Total e quantidade de transações do usuário por categoria, agregados
+        no banco, do maior total para o menor.
+
+        Returns:
+            List[Tuple[int, str, str, float, int]]: (category_id, nome, tipo, total, quantidade).
+        """
+        rows = self.db.execute(category_breakdown_statement(user_id, start, end, tipo))
+        return [(cid, name, ctype, float(total or 0), count) for cid, name, ctype, total, count in rows]
+
+    def monthly_total(self, user_id: int, dt: date, tipo: str) -> float:
+        """Total do usuário no mês de `dt` para o tipo, lido do consolidado mensal."""
+        return MonthlyTotalRepository(self.db).get_total(user_id, year_month(dt), tipo)
+
+    def monthly_totals(self, keys, tipo: str) -> Dict[Tuple[int, str], float]:
+        """Totais do consolidado para vários pares (user_id, "AAAA-MM") em uma consulta."""
+        return MonthlyTotalRepository(self.db).get_totals(keys, tipo)
+
+
+class AsyncTransactionRepository:
+    """
+    Variante assíncrona (AsyncSession) das consultas de leitura de transações,
+    usada pelas rotas async da API. As instruções SQL são as mesmas do
+    TransactionRepository.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get(self, tx_id: int) -> Optional[Transaction]:
+        return await self.db.get(Transaction, tx_id)
+
+    async def list_page(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        order_by: str = "date",
+        order: str = "asc",
+        limit: int = 50,
+        after: Optional[Tuple[Any, int]] = None,
+    ) -> Tuple[List[Transaction], bool]:
+        """Mesma semântica de TransactionRepository.list_page."""
+        stmt = page_statement(user_id, tipo, order_by, order, limit, after)
+        rows = list((await self.db.execute(stmt)).scalars())
+        return rows[:limit], len(rows) > limit
+
+    async def list_page_rows(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        order_by: str = "date",
+        order: str = "asc",
+        limit: int = 50,
+        after: Optional[Tuple[Any, int]] = None,
+    ) -> Tuple[List[Any], bool]:
+        """
+        Como list_page, mas devolve tuplas com as colunas de ROW_COLUMNS
+        (sem montar objetos ORM), para respostas serializadas direto.
+        """
+        stmt = page_statement(user_id, tipo, order_by, order, limit, after, columns=ROW_COLUMNS)
+        rows = list(await self.db.execute(stmt))
+        return rows[:limit], len(rows) > limit
+
+    async def totals_by_type(
+        self,
+        user_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, float]:
+        """Mesma semântica de TransactionRepository.totals_by_type."""
+        if start is None and end is None:
+            stmt = rollup_totals_statement(user_id)
+        else:
+            stmt = totals_statement(user_id, start, end)
+        rows = await self.db.execute(stmt)
+        return {tipo: float(total or 0) for tipo, total in rows}
+
+    async def timeseries(
+        self,
+        user_id: int,
+        bucket: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Tuple[str, float, float]]:
+        """Mesma semântica de TransactionRepository.timeseries."""
+        rows = await self.db.execute(timeseries_statement(user_id, bucket, start, end))
+        return [(b, float(i or 0), float(e or 0)) for b, i, e in rows]
+
+    async def category_breakdown(
+        self,
+        user_id: int,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        tipo: Optional[str] = None,
+    ) -> List[Tuple[int, str, str, float, int]]:
+        """Mesma semântica de TransactionRepository.category_breakdown."""
+        rows = await self.db.execute(category_breakdown_statement(user_id, start, end, tipo))
+        return [(cid, name, ctype, float(total or 0), count) for cid, name, ctype, total, count in rows]
@@ -0,0 +1,81 @@
+from contextlib import nullcontext
+from typing import Any, ContextManager, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from src.repositories._db_utils import resolve_session
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Profundidade de unidades de trabalho abertas, guardada em Session.info
+UOW_DEPTH_KEY = "unit_of_work_depth"
+
+
+def in_unit_of_work(db: Any) -> bool:
+    """Indica se há uma UnitOfWork aberta na sessão."""
+    info = getattr(db, "info", None)
+    return isinstance(info, dict) and info.get(UOW_DEPTH_KEY, 0) > 0
+
+
+def commit_or_flush(db: Any, *objs: Any) -> None:
+    """
+    Persiste as alterações pendentes da sessão a partir de um repositório.
+
+    Dentro de uma UnitOfWork apenas envia o SQL (flush: IDs e constraints já
+    ficam disponíveis) e o commit fica para o fim da unidade; fora dela mantém
+    o comportamento original de commit seguido de refresh dos objetos.
+    """
+    if in_unit_of_work(db):
+        db.flush()
+        return
+    db.commit()
+    for obj in objs:
+        db.refresh(obj)
+
+
+class UnitOfWork:
+    """
+    Escopo transacional compartilhado pelos repositórios de uma mesma sessão.
+
+    Enquanto a unidade está aberta, add/update/delete dos repositórios só fazem
+    flush; um único commit acontece na saída do bloco mais externo. Qualquer
+    exceção dentro da unidade (inclusive em blocos aninhados) desfaz tudo.
+
+    Exemplo:
+        with UnitOfWork(db):
+            user_repo.add(user)
+            tx_repo.add(tx)      # um commit só, atômico
+    """
+
+    def __init__(self, db: Session) -> None:
+        self.db = resolve_session(db)
+
+    def __enter__(self) -> "UnitOfWork":
+        self.db.info[UOW_DEPTH_KEY] = self.db.info.get(UOW_DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        depth = self.db.info.get(UOW_DEPTH_KEY, 1) - 1
+        if depth:
+            self.db.info[UOW_DEPTH_KEY] = depth
+        else:
+            self.db.info.pop(UOW_DEPTH_KEY, None)
+
+        if exc_type is not None:
+            self.db.rollback()
+            return
+        if depth:
+            return
+        try:
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.error("Erro ao confirmar unidade de trabalho: %s", e)
+            raise
+
+
+def unit_scope(uow: Optional[UnitOfWork]) -> ContextManager:
+    """Contexto da unidade de trabalho do serviço (ou nulo, sem unidade configurada)."""
+    return uow if uow is not None else nullcontext()
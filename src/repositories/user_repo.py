@@ -1,11 +1,14 @@
-from typing import List, Optional
+from typing import Any, Iterable, List, Optional, Set
 import types
-from src.repositories._db_utils import DBProxy
+from src.repositories._db_utils import resolve_session
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.models.user import User
+from src.repositories.unit_of_work import commit_or_flush
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,14 +22,13 @@ class UserRepository:
         # produce a generator-like object instead of the SQLAlchemy Session
         # instance. Be defensive: if db is a generator, extract the actual
         # session via next().
-        # Wrap the db in a proxy that resolves generator-like objects on demand.
-        self.db = DBProxy(db)
+        # Resolve the session once here; only unresolved objects get a DBProxy.
+        self.db = resolve_session(db)
 
     def add(self, user: User) -> User:
         self.db.add(user)
         try:
-            self.db.commit()
-            self.db.refresh(user)
+            commit_or_flush(self.db, user)
             logger.info("Usuário criado id=%s", user.id)
             return user
         except SQLAlchemyError as e:
@@ -46,8 +48,7 @@ class UserRepository:
 
     def update(self, user: User) -> User:
         try:
-            self.db.commit()
-            self.db.refresh(user)
+            commit_or_flush(self.db, user)
             logger.info("Usuário atualizado id=%s", user.id)
             return user
         except SQLAlchemyError as e:
@@ -58,7 +59,7 @@ class UserRepository:
     def delete(self, user: User) -> None:
         self.db.delete(user)
         try:
-            self.db.commit()
+            commit_or_flush(self.db)
             logger.info("Usuário removido id=%s", user.id)
         except SQLAlchemyError as e:
             self.db.rollback()
@@ -71,3 +72,30 @@ class UserRepository:
             .filter(User.email == email)
             .first()
         )
+
+    def existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+        """Retorna, em uma única consulta (IN), quais dos IDs informados existem."""
+        ids = set(user_ids)
+        if not ids:
+            return set()
+        rows = self.db.query(User.id).filter(User.id.in_(ids)).all()
+        return {row[0] for row in rows}
+
+
+class AsyncUserRepository:
+    """Variante assíncrona (AsyncSession) das leituras do UserRepository."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get(self, user_id: int) -> Optional[User]:
+        return await self.db.get(User, user_id)
+
+    async def list_all(self) -> List[User]:
+        result = await self.db.execute(select(User))
+        return list(result.scalars())
+
+    async def list_rows(self) -> List[Any]:
+        """Usuários como tuplas (name, email, id), sem montar objetos ORM."""
+        result = await self.db.execute(select(User.name, User.email, User.id))
+        return list(result)
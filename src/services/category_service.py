@@ -1,13 +1,32 @@
+import asyncio
 from typing import List, Optional
 
 from src.models.category import Category
-from src.repositories.category_repo import CategoryRepository
+from src.repositories.category_cache import CategoryCache
+from src.repositories.category_repo import AsyncCategoryRepository, CategoryRepository
+from src.repositories.unit_of_work import UnitOfWork, unit_scope
 from src.services.exceptions import EntidadeNaoEncontradaError, ValidacaoError
 
 
+def _sort_by_name(cats: List[Category], order: str) -> List[Category]:
+    return sorted(cats, key=lambda c: c.name.lower(), reverse=order == "desc")
+
+
 class CategoryService:
-    def __init__(self, repo: CategoryRepository) -> None:
+    def __init__(
+        self,
+        repo: CategoryRepository,
+        uow: Optional[UnitOfWork] = None,
+        cache: Optional[CategoryCache] = None,
+    ) -> None:
         self.repo = repo
+        self.uow = uow
+        # leituras de lista servidas da memória; escritas invalidam a cópia
+        self.cache = cache
+
+    def _invalidate_cache(self) -> None:
+        if self.cache is not None:
+            self.cache.invalidate()
 
     def create_category(self, name: str, type_: str) -> Category:
         if type_ not in ("Receita", "Despesa"):
@@ -16,12 +35,16 @@ class CategoryService:
             raise ValidacaoError("Nome de categoria é obrigatório.")
 
         cat = Category(name=name.strip(), type=type_)
-        return self.repo.add(cat)
+        with unit_scope(self.uow):
+            created = self.repo.add(cat)
+        self._invalidate_cache()
+        return created
 
     def list_categories(self, tipo: Optional[str] = None, order: str = "asc") -> List[Category]:
+        if self.cache is not None:
+            return self.cache.list_sorted(tipo, order)
         cats = self.repo.list_all() if tipo is None else self.repo.list_by_type(tipo)
-        reverse = order == "desc"
-        return sorted(cats, key=lambda c: c.name.lower(), reverse=reverse)
+        return _sort_by_name(cats, order)
 
     def get_category(self, cat_id: int) -> Category:
         cat = self.repo.get(cat_id)
@@ -30,6 +53,12 @@ class CategoryService:
         return cat
 
     def update_category(self, cat_id: int, name: Optional[str], type_: Optional[str]) -> Category:
+        with unit_scope(self.uow):
+            updated = self._update_category(cat_id, name, type_)
+        self._invalidate_cache()
+        return updated
+
+    def _update_category(self, cat_id: int, name: Optional[str], type_: Optional[str]) -> Category:
         cat = self.get_category(cat_id)
 
         if name is not None:
@@ -45,5 +74,24 @@ class CategoryService:
         return self.repo.update(cat)
 
     def delete_category(self, cat_id: int) -> None:
-        cat = self.get_category(cat_id)
-        self.repo.delete(cat)
+        with unit_scope(self.uow):
+            cat = self.get_category(cat_id)
+            self.repo.delete(cat)
+        self._invalidate_cache()
+
+
+class AsyncCategoryService:
+    """Leituras de categorias sobre AsyncSession, para as rotas async da API."""
+
+    def __init__(self, repo: AsyncCategoryRepository, cache: Optional[CategoryCache] = None) -> None:
+        self.repo = repo
+        self.cache = cache
+
+    async def list_categories(self, tipo: Optional[str] = None, order: str = "asc") -> List[Category]:
+        if self.cache is not None:
+            if not self.cache.is_fresh():
+                # conferência de versão/recarga é síncrona: fora do event loop
+                await asyncio.to_thread(self.cache.refresh)
+            return self.cache.list_sorted(tipo, order)
+        cats = await (self.repo.list_all() if tipo is None else self.repo.list_by_type(tipo))
+        return _sort_by_name(cats, order)
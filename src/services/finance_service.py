@@ -1,10 +1,17 @@
+from datetime import date
+from typing import Optional
+
 from src.services.abstract_service import Service
-from src.repositories.abstract import Repository
+from src.repositories.abstract import BalanceLedger, Repository
 from src.models.transaction import Transaction
+from src.utils.money import from_cents, to_cents
 
 class FinanceService(Service):
-    def __init__(self, tx_repo: Repository[Transaction]):
+    def __init__(self, tx_repo: Repository[Transaction], ledger: Optional[BalanceLedger] = None):
         self.tx_repo = tx_repo
+        # livro de saldos (SQLBalanceLedger/MemoryBalanceLedger); sem ele, balance
+        # percorre todas as transações do repositório
+        self.ledger = ledger
 
     def create(self, data: Transaction):
         return self.tx_repo.add(data)
@@ -22,9 +29,20 @@ class FinanceService(Service):
         return self.tx_repo.delete(obj_id)
 
     # Regras de negócio extras:
-    def balance(self, user_id: int) -> float:
-        total = 0.0
+    def balance(self, user_id: int, as_of: Optional[date] = None) -> float:
+        """
+        Saldo do usuário (receitas - despesas), opcionalmente até a data `as_of`
+        (inclusive). Com livro de saldos, é uma consulta direta; sem ele, soma as
+        transações do repositório.
+        """
+        if self.ledger is not None:
+            if as_of is None:
+                return self.ledger.current(user_id)
+            return self.ledger.as_of(user_id, as_of)
+
+        cents = 0  # soma exata em centavos
         for t in self.tx_repo.list():
-            if t.user_id == user_id:
-                total += t.amount if t.type.lower() == "receita" else -t.amount
-        return total
+            if t.user_id == user_id and (as_of is None or t.date <= as_of):
+                amount = to_cents(t.amount)
+                cents += amount if t.type.lower() == "receita" else -amount
+        return from_cents(cents)
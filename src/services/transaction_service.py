@@ -1,29 +1,233 @@
+import base64
+import binascii
+import json
+import logging
+import time
 from datetime import date as date_type
-from typing import List, Optional
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
+from config.settings import Settings, get_settings
 from src.models.transaction import Transaction
-from src.repositories.transaction_repo import TransactionRepository
+from src.repositories.transaction_repo import (
+    BUCKET_STARTS,
+    AsyncTransactionRepository,
+    SORTABLE_COLUMNS,
+    TransactionRepository,
+)
+from src.repositories.monthly_totals_repo import year_month
+from src.repositories.unit_of_work import UnitOfWork, unit_scope
 from src.repositories.user_repo import UserRepository
 from src.repositories.category_repo import CategoryRepository
 from src.services.exceptions import EntidadeNaoEncontradaError, ValidacaoError
+from src.utils.file_export import iter_csv_rows, parse_transaction_row
 from src.utils.logger import get_logger
+from src.utils.money import MAX_AMOUNT, MAX_AMOUNT_CENTS, from_cents, to_cents
 
 log = get_logger("TransactionService")
 
+# Paginação de GET /transactions
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
 
-def _get_setting(name: str, default=None):
-    """Tenta importar get_setting do pacote config em tempo de execução.
-    Em ambientes mutados (mutmut) o pacote `config` pode não existir, então
-    adotamos fallback para variáveis de ambiente.
+# Tamanho máximo de um lote em POST /transactions/batch
+MAX_BATCH_SIZE = 10000
+
+# Importação de CSV: linhas por lote (um commit cada) e erros listados no relatório
+IMPORT_CHUNK_SIZE = 5000
+MAX_IMPORT_ERRORS = 1000
+
+# Períodos aceitos em GET /transactions/timeseries
+TIMESERIES_BUCKETS = tuple(BUCKET_STARTS)
+
+
+def _log_event(
+    level: int,
+    msg: str,
+    *args: Any,
+    tx_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    started: Optional[float] = None,
+) -> None:
     """
+    Registra um evento de transação com campos estruturados (entity, id,
+    user_id, duration_ms) para o formatter JSON. A mensagem é formatada só se
+    o nível estiver habilitado; abaixo dele o custo é uma checagem de nível.
+    """
+    if not log.isEnabledFor(level):
+        return
+    fields: Dict[str, Any] = {"entity": "transaction", "id": tx_id, "user_id": user_id}
+    if started is not None:
+        fields["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    log.log(level, msg, *args, extra=fields, stacklevel=2)
+
+
+def _encode_cursor(order_by: str, order: str, tx: Transaction) -> str:
+    """Gera o cursor opaco (base64 de JSON) com a chave (order_by, id) da última linha."""
+    value = getattr(tx, order_by)
+    if isinstance(value, date_type):
+        value = value.isoformat()
+    payload = json.dumps([order_by, order, value, tx.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _cursor_value(order_by: str, value: Any) -> Any:
+    """
+    Converte o valor da coluna de ordenação lido do cursor, conferindo o tipo
+    contra a coluna: cursores editados à mão não devem chegar ao SQL.
+
+    Raises:
+        ValueError: se o valor não tiver o tipo da coluna.
+    """
+    if order_by == "date":
+        if not isinstance(value, str):
+            raise ValueError(order_by)
+        return date_type.fromisoformat(value)
+    if order_by == "amount":
+        if not (_is_int(value) or isinstance(value, float)):
+            raise ValueError(order_by)
+        to_cents(value)  # NaN, infinito ou fora do INTEGER de 64 bits
+        return value
+    if order_by == "type":
+        if not isinstance(value, str):
+            raise ValueError(order_by)
+        return value
+    if not _is_int(value):  # id, user_id, category_id
+        raise ValueError(order_by)
+    return value
+
+
+def _decode_cursor(cursor: str, order_by: str, order: str) -> Tuple[Any, int]:
+    """Valida o cursor recebido e devolve a chave (valor, id) para o repositório."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        c_order_by, c_order, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        raise ValidacaoError("Cursor inválido.")
+    if (c_order_by, c_order) != (order_by, order):
+        raise ValidacaoError("Cursor não corresponde à ordenação solicitada.")
     try:
-        from config.settings import get_setting as _gs
+        value = _cursor_value(order_by, value)
+    except ValueError:
+        raise ValidacaoError("Cursor inválido.")
+    if not _is_int(last_id):
+        raise ValidacaoError("Cursor inválido.")
+    return value, last_id
 
-        return _gs(name, default)
-    except Exception:
-        import os
 
-        return os.environ.get(name, default)
+def _validate_page_args(order_by: str, order: str, limit: int) -> str:
+    """Valida os parâmetros de paginação e devolve a ordem normalizada."""
+    if order_by not in SORTABLE_COLUMNS:
+        raise ValidacaoError(f"Campo '{order_by}' inválido para ordenação.")
+    order = order.lower()
+    if order not in ("asc", "desc"):
+        raise ValidacaoError("Ordem deve ser 'asc' ou 'desc'.")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValidacaoError(f"Limite deve estar entre 1 e {MAX_PAGE_SIZE}.")
+    return order
+
+
+def _validate_period(start: Optional[date_type], end: Optional[date_type]) -> None:
+    if start is not None and end is not None and start > end:
+        raise ValidacaoError("Data inicial deve ser anterior ou igual à data final.")
+
+
+def _cents_error(cents: int) -> Optional[str]:
+    if cents <= 0:
+        return "Valor da transação deve ser maior que zero."
+    if cents > MAX_AMOUNT_CENTS:
+        return f"Valor da transação deve ser no máximo R$ {MAX_AMOUNT:.2f}."
+    return None
+
+
+def _amount_error(amount: float) -> Optional[str]:
+    # valores que arredondam para 0 centavo (ex.: 0.004), NaN e infinito não são aceitos
+    try:
+        cents = to_cents(amount)
+    except ValueError:
+        return "Valor da transação inválido."
+    return _cents_error(cents)
+
+
+def _item_cents(item: Dict[str, Any]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Valor de um item de lote em centavos (`amount_cents`, ou `amount` em reais
+    convertido aqui) e o erro de validação, se houver. É a única conversão do
+    item: limite mensal, consolidado e INSERT usam esses centavos.
+    """
+    cents = item.get("amount_cents")
+    if cents is None:
+        try:
+            cents = to_cents(item["amount"])
+        except ValueError:
+            return None, "Valor da transação inválido."
+    return cents, _cents_error(cents)
+
+
+def _saldo(receitas: float, despesas: float) -> float:
+    # diferença em centavos: 0.3 - 0.1 dá 0.2, não 0.19999999999999998
+    return from_cents(to_cents(receitas) - to_cents(despesas))
+
+
+def _summary(user_id: int, totals: Dict[str, float]) -> dict:
+    receitas = totals.get("Receita", 0.0)
+    despesas = totals.get("Despesa", 0.0)
+    return {
+        "user_id": user_id,
+        "receitas": receitas,
+        "despesas": despesas,
+        "saldo": _saldo(receitas, despesas),
+    }
+
+
+def _timeseries(user_id: int, bucket: str, rows: List[Tuple[str, float, float]]) -> dict:
+    return {
+        "user_id": user_id,
+        "bucket": bucket,
+        "series": [
+            {"inicio": inicio, "receitas": receitas, "despesas": despesas, "saldo": _saldo(receitas, despesas)}
+            for inicio, receitas, despesas in rows
+        ],
+    }
+
+
+def _category_breakdown(user_id: int, rows: List[Tuple[int, str, str, float, int]]) -> dict:
+    # participação calculada dentro do tipo: despesas sobre o total de despesas, etc.
+    totals_by_type: Dict[str, float] = {}
+    for _, _, ctype, total, _ in rows:
+        totals_by_type[ctype] = from_cents(to_cents(totals_by_type.get(ctype, 0.0)) + to_cents(total))
+    items = []
+    for cid, name, ctype, total, count in rows:
+        type_total = totals_by_type[ctype]
+        items.append({
+            "category_id": cid,
+            "name": name,
+            "type": ctype,
+            "total": total,
+            "count": count,
+            "share": total / type_total if type_total else 0.0,
+            "average": from_cents(to_cents(total / count)) if count else 0.0,
+        })
+    return {"user_id": user_id, "items": items}
+
+
+def _validate_tipo(tipo: Optional[str]) -> Optional[str]:
+    """Filtro de tipo em qualquer caixa ("despesa"), normalizado como gravado ("Despesa")."""
+    if tipo is None:
+        return None
+    tipo = tipo.capitalize()
+    if tipo not in ("Receita", "Despesa"):
+        raise ValidacaoError("Tipo deve ser 'Receita' ou 'Despesa'.")
+    return tipo
+
+
+def _validate_bucket(bucket: str) -> None:
+    if bucket not in TIMESERIES_BUCKETS:
+        raise ValidacaoError("Período deve ser 'day', 'week' ou 'month'.")
 
 
 class TransactionService:
@@ -37,47 +241,56 @@ class TransactionService:
         tx_repo: TransactionRepository,
         user_repo: UserRepository,
         category_repo: CategoryRepository,
+        uow: Optional[UnitOfWork] = None,
+        settings: Optional[Settings] = None,
     ) -> None:
         self.tx_repo = tx_repo
         self.user_repo = user_repo
         self.category_repo = category_repo
+        # com uma UnitOfWork, cada operação de escrita vira um único commit
+        self.uow = uow
 
-        # Define o limite mensal de despesas a partir do .env (com fallback)
-        limit_str = _get_setting("MONTHLY_LIMIT", "2000.0")
-        self.monthly_limit = float(limit_str)
+        # Limite mensal de despesas (MONTHLY_LIMIT), já validado nas configurações;
+        # comparado em centavos inteiros, sem erro de arredondamento na fronteira
+        settings = settings or get_settings()
+        self.monthly_limit = settings.monthly_limit
+        self.monthly_limit_cents = settings.monthly_limit_cents
 
     # ==============================
     #     REGRAS AUXILIARES
     # ==============================
 
+    def _lookup_refs(self, user_ids: Set[int], category_ids: Set[int]) -> Tuple[Set[int], Dict[int, str]]:
+        """
+        Usuários existentes e tipos das categorias existentes entre os IDs
+        informados, lidos do banco. Escritas não usam o CategoryCache: outro
+        worker pode tê-lo deixado desatualizado por até `check_interval`
+        (categoria recém-criada recusada, recém-removida aceita).
+        """
+        return self.tx_repo.lookup_refs(user_ids, category_ids)
+
     def _validar_user_category(self, user_id: int, category_id: int, tipo_tx: str) -> None:
         """
         Valida se o usuário e a categoria existem e se o tipo da transação é compatível com a categoria.
+        Usuário e categoria são conferidos juntos, em uma única consulta.
         """
-        user = self.user_repo.get(user_id)
-        if not user:
+        user_ids, cat_types = self._lookup_refs({user_id}, {category_id})
+        if user_id not in user_ids:
             raise EntidadeNaoEncontradaError("Usuário não encontrado.")
 
-        category = self.category_repo.get(category_id)
-        if not category:
+        if category_id not in cat_types:
             raise EntidadeNaoEncontradaError("Categoria não encontrada.")
 
         # Interação entre entidades: tipo da transação deve coincidir com o tipo da categoria
-        if category.type.lower() != tipo_tx.lower():
+        if cat_types[category_id].lower() != tipo_tx.lower():
             raise ValidacaoError("Tipo da transação deve ser igual ao tipo da categoria.")
 
     def _despesas_do_mes(self, user_id: int, dt: date_type) -> float:
         """
-        Calcula o total de despesas do usuário no mês e ano informados.
+        Retorna o total de despesas do usuário no mês e ano informados
+        (lido do consolidado mensal, sem percorrer o histórico).
         """
-        txs = self.tx_repo.list_by_user(user_id)
-        return sum(
-            t.amount
-            for t in txs
-            if t.type.lower() == "despesa"
-            and t.date.year == dt.year
-            and t.date.month == dt.month
-        )
+        return self.tx_repo.monthly_total(user_id, dt, "Despesa")
 
     # ==============================
     #            CRUD
@@ -95,10 +308,12 @@ class TransactionService:
         """
         Cria uma nova transação, validando condições de negócio e limites mensais.
         """
+        started = time.perf_counter()
 
         # Validações básicas
-        if amount <= 0:
-            raise ValidacaoError("Valor da transação deve ser maior que zero.")
+        detail = _amount_error(amount)
+        if detail:
+            raise ValidacaoError(detail)
         if type_ not in ("Receita", "Despesa"):
             raise ValidacaoError("Tipo deve ser 'Receita' ou 'Despesa'.")
 
@@ -108,7 +323,7 @@ class TransactionService:
         # Regra de limite mensal (somente para despesas)
         if type_ == "Despesa":
             total_mes = self._despesas_do_mes(user_id, date)
-            if total_mes + amount > self.monthly_limit:
+            if to_cents(total_mes) + to_cents(amount) > self.monthly_limit_cents:
                 raise ValidacaoError(
                     f"Limite mensal de R$ {self.monthly_limit:.2f} excedido. "
                     f"Total atual: R$ {total_mes:.2f}, tentativa: R$ {amount:.2f}."
@@ -123,10 +338,157 @@ class TransactionService:
             user_id=user_id,
             category_id=category_id,
         )
-        created = self.tx_repo.add(tx)
-        log.info(f"Transação criada com sucesso (ID={created.id}, tipo={type_}, valor={amount:.2f}).")
+        with unit_scope(self.uow):
+            created = self.tx_repo.add(tx)
+        _log_event(
+            logging.INFO,
+            "Transação criada com sucesso (ID=%s, tipo=%s, valor=%.2f).",
+            created.id, type_, amount,
+            tx_id=created.id, user_id=user_id, started=started,
+        )
         return created
 
+    def create_transactions_batch(self, items: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Cria várias transações de uma vez, aplicando as mesmas regras de
+        create_transaction item a item. Usuários e categorias do lote inteiro
+        são validados em uma única consulta e os totais mensais em outra; o
+        limite mensal é acumulado ao longo do lote e os itens aceitos são
+        inseridos com um único executemany/commit.
+
+        Args:
+            items: dicionários com amount (ou amount_cents, já em centavos),
+                date, description, type, user_id, category_id.
+
+        Returns:
+            List[dict]: um resultado por item, na ordem recebida:
+            {"index", "status" ("created" | "rejected"), "id", "detail"}.
+        """
+        if len(items) > MAX_BATCH_SIZE:
+            raise ValidacaoError(f"Lote deve ter no máximo {MAX_BATCH_SIZE} itens.")
+        started = time.perf_counter()
+
+        user_ids, cat_types = self._lookup_refs(
+            {i["user_id"] for i in items}, {i["category_id"] for i in items}
+        )
+        expense_keys = [
+            (i["user_id"], year_month(i["date"])) if i["type"] == "Despesa" else None
+            for i in items
+        ]
+        running = {
+            key: to_cents(total)
+            for key, total in self.tx_repo.monthly_totals(set(expense_keys) - {None}, "Despesa").items()
+        }
+
+        results: List[Dict[str, Any]] = []
+        accepted: List[Dict[str, Any]] = []
+        for index, item in enumerate(items):
+            type_ = item["type"]
+            cents, amount_error = _item_cents(item)
+            detail = None
+            if amount_error:
+                detail = amount_error
+            elif type_ not in ("Receita", "Despesa"):
+                detail = "Tipo deve ser 'Receita' ou 'Despesa'."
+            elif item["user_id"] not in user_ids:
+                detail = "Usuário não encontrado."
+            elif item["category_id"] not in cat_types:
+                detail = "Categoria não encontrada."
+            elif cat_types[item["category_id"]].lower() != type_.lower():
+                detail = "Tipo da transação deve ser igual ao tipo da categoria."
+            elif type_ == "Despesa":
+                key = expense_keys[index]
+                total_mes = running.get(key, 0)
+                if total_mes + cents > self.monthly_limit_cents:
+                    detail = (
+                        f"Limite mensal de R$ {self.monthly_limit:.2f} excedido. "
+                        f"Total atual: R$ {from_cents(total_mes):.2f}, "
+                        f"tentativa: R$ {from_cents(cents):.2f}."
+                    )
+                else:
+                    running[key] = total_mes + cents
+
+            if detail is not None:
+                results.append({"index": index, "status": "rejected", "id": None, "detail": detail})
+                continue
+            results.append({"index": index, "status": "created", "id": None, "detail": None})
+            accepted.append({
+                "amount_cents": cents,
+                "date": item["date"],
+                "description": item.get("description"),
+                "type": type_,
+                "user_id": item["user_id"],
+                "category_id": item["category_id"],
+            })
+
+        with unit_scope(self.uow):
+            ids = iter(self.tx_repo.bulk_add(accepted))
+        for result in results:
+            if result["status"] == "created":
+                result["id"] = next(ids)
+
+        _log_event(
+            logging.INFO,
+            "Lote processado: %s criadas, %s rejeitadas.",
+            len(accepted), len(results) - len(accepted),
+            started=started,
+        )
+        return results
+
+    def import_transactions_csv(
+        self, stream: IO[str], chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Importa transações de um CSV (mesmas colunas da exportação) em streaming.
+        As linhas são lidas, convertidas e validadas em lotes de `chunk_size`;
+        cada lote é inserido por create_transactions_batch com o próprio commit,
+        então a memória depende do tamanho do lote e não do arquivo.
+
+        Returns:
+            dict: {"total", "imported", "rejected", "errors"}, onde `errors` lista
+            até MAX_IMPORT_ERRORS itens {"line", "detail"} (linha no arquivo).
+        """
+        if not 1 <= chunk_size <= MAX_BATCH_SIZE:
+            raise ValidacaoError(f"Lote deve ter entre 1 e {MAX_BATCH_SIZE} linhas.")
+
+        summary: Dict[str, Any] = {"total": 0, "imported": 0, "rejected": 0, "errors": []}
+        started = time.perf_counter()
+
+        def reject(line: int, detail: str) -> None:
+            summary["rejected"] += 1
+            if len(summary["errors"]) < MAX_IMPORT_ERRORS:
+                summary["errors"].append({"line": line, "detail": detail})
+
+        rows = iter_csv_rows(stream)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            summary["total"] += len(chunk)
+
+            lines: List[int] = []
+            items: List[Dict[str, Any]] = []
+            for line, raw in chunk:
+                try:
+                    items.append(parse_transaction_row(raw))
+                    lines.append(line)
+                except ValueError as e:
+                    reject(line, str(e))
+
+            for line, result in zip(lines, self.create_transactions_batch(items)):
+                if result["status"] == "created":
+                    summary["imported"] += 1
+                else:
+                    reject(line, result["detail"])
+
+        _log_event(
+            logging.INFO,
+            "Importação concluída: %s importadas, %s rejeitadas de %s linhas.",
+            summary["imported"], summary["rejected"], summary["total"],
+            started=started,
+        )
+        return summary
+
     def list_transactions(
         self,
         user_id: Optional[int] = None,
@@ -136,22 +498,98 @@ class TransactionService:
     ) -> List[Transaction]:
         """
         Lista as transações com suporte a filtros (usuário, tipo) e ordenação.
+        Filtros e ordenação são resolvidos pelo repositório, direto no SQL.
         """
-        txs = self.tx_repo.list_all()
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValidacaoError(f"Campo '{order_by}' inválido para ordenação.")
 
-        if user_id is not None:
-            txs = [t for t in txs if t.user_id == user_id]
-        if tipo is not None:
-            txs = [t for t in txs if t.type.lower() == tipo.lower()]
+        return self.tx_repo.list_filtered(
+            user_id=user_id, tipo=tipo, order_by=order_by, order=order
+        )
 
-        # Ordenação
-        reverse = order.lower() == "desc"
-        try:
-            txs = sorted(txs, key=lambda t: getattr(t, order_by), reverse=reverse)
-        except AttributeError:
-            raise ValidacaoError(f"Campo '{order_by}' inválido para ordenação.")
+    def list_transactions_page(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        order_by: str = "date",
+        order: str = "asc",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Lista uma página de transações com paginação por cursor (keyset).
+        Retorna os itens e o `next_cursor` (None quando não há mais páginas).
+        """
+        order = _validate_page_args(order_by, order, limit)
+        after = _decode_cursor(cursor, order_by, order) if cursor else None
+        items, has_more = self.tx_repo.list_page(
+            user_id=user_id,
+            tipo=tipo,
+            order_by=order_by,
+            order=order,
+            limit=limit,
+            after=after,
+        )
+        next_cursor = _encode_cursor(order_by, order, items[-1]) if has_more else None
+        return items, next_cursor
+
+    def summarize(
+        self,
+        user_id: int,
+        start: Optional[date_type] = None,
+        end: Optional[date_type] = None,
+    ) -> dict:
+        """
+        Retorna o total de receitas, despesas e o saldo do usuário no período,
+        calculados no banco por agregação.
+        """
+        _validate_period(start, end)
+        totals = self.tx_repo.totals_by_type(user_id, start=start, end=end)
+        return _summary(user_id, totals)
+
+    def timeseries(
+        self,
+        user_id: int,
+        bucket: str = "month",
+        start: Optional[date_type] = None,
+        end: Optional[date_type] = None,
+    ) -> dict:
+        """
+        Receitas, despesas e saldo do usuário por dia, semana (começando na
+        segunda-feira) ou mês, agregados no banco. Períodos sem transações
+        não aparecem na série.
+        """
+        _validate_bucket(bucket)
+        _validate_period(start, end)
+        return _timeseries(user_id, bucket, self.tx_repo.timeseries(user_id, bucket, start, end))
 
-        return txs
+    def category_breakdown(
+        self,
+        user_id: int,
+        start: Optional[date_type] = None,
+        end: Optional[date_type] = None,
+        tipo: Optional[str] = None,
+    ) -> dict:
+        """
+        Relatório por categoria do usuário no período: total, quantidade,
+        participação no total do mesmo tipo (0 a 1) e ticket médio, a partir
+        de uma única consulta agregada.
+        """
+        _validate_period(start, end)
+        tipo = _validate_tipo(tipo)
+        rows = self.tx_repo.category_breakdown(user_id, start, end, tipo)
+        return _category_breakdown(user_id, rows)
+
+    def has_transactions(self, user_id: int) -> bool:
+        """Indica se o usuário possui transações."""
+        return self.tx_repo.exists_for_user(user_id)
+
+    def iter_user_transactions(self, user_id: int, chunk_size: int = 1000) -> Iterator[Any]:
+        """
+        Itera as transações do usuário (ordenadas por data) lendo o banco em lotes,
+        para exportações sem carregar tudo em memória.
+        """
+        return self.tx_repo.iter_rows_by_user(user_id, chunk_size=chunk_size)
 
     def get_transaction(self, tx_id: int) -> Transaction:
         """
@@ -174,11 +612,24 @@ class TransactionService:
         """
         Atualiza uma transação existente, validando valores e integridade das entidades.
         """
+        with unit_scope(self.uow):
+            return self._update_transaction(tx_id, amount, date, description, type_, category_id)
+
+    def _update_transaction(
+        self,
+        tx_id: int,
+        amount: Optional[float],
+        date: Optional[date_type],
+        description: Optional[str],
+        type_: Optional[str],
+        category_id: Optional[int],
+    ) -> Transaction:
         tx = self.get_transaction(tx_id)
 
         if amount is not None:
-            if amount <= 0:
-                raise ValidacaoError("Valor da transação deve ser maior que zero.")
+            detail = _amount_error(amount)
+            if detail:
+                raise ValidacaoError(detail)
             tx.amount = amount
 
         if date is not None:
@@ -197,13 +648,109 @@ class TransactionService:
             tx.category_id = category_id
 
         updated = self.tx_repo.update(tx)
-        log.info(f"Transação atualizada com sucesso (ID={tx.id}).")
+        _log_event(
+            logging.INFO, "Transação atualizada com sucesso (ID=%s).", tx_id,
+            tx_id=tx_id, user_id=tx.user_id,
+        )
         return updated
 
     def delete_transaction(self, tx_id: int) -> None:
         """
         Exclui uma transação, lançando exceção caso o ID não exista.
         """
-        tx = self.get_transaction(tx_id)
-        self.tx_repo.delete(tx)
-        log.warning(f"Transação deletada (ID={tx.id}).")
+        with unit_scope(self.uow):
+            tx = self.get_transaction(tx_id)
+            self.tx_repo.delete(tx)
+        _log_event(logging.WARNING, "Transação deletada (ID=%s).", tx_id, tx_id=tx_id)
+
+
+class AsyncTransactionService:
+    """
+    Leituras de transações sobre AsyncSession, para as rotas async da API.
+    Aplica as mesmas validações do TransactionService.
+    """
+
+    def __init__(self, tx_repo: AsyncTransactionRepository) -> None:
+        self.tx_repo = tx_repo
+
+    async def list_transactions_page(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        order_by: str = "date",
+        order: str = "asc",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """Mesma semântica de TransactionService.list_transactions_page."""
+        return await self._page(
+            self.tx_repo.list_page, user_id, tipo, order_by, order, limit, cursor
+        )
+
+    async def list_transactions_page_rows(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        order_by: str = "date",
+        order: str = "asc",
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        Como list_transactions_page, mas com as linhas como tuplas de colunas
+        (ver AsyncTransactionRepository.list_page_rows).
+        """
+        return await self._page(
+            self.tx_repo.list_page_rows, user_id, tipo, order_by, order, limit, cursor
+        )
+
+    async def _page(self, fetch, user_id, tipo, order_by, order, limit, cursor):
+        order = _validate_page_args(order_by, order, limit)
+        after = _decode_cursor(cursor, order_by, order) if cursor else None
+        items, has_more = await fetch(
+            user_id=user_id,
+            tipo=tipo,
+            order_by=order_by,
+            order=order,
+            limit=limit,
+            after=after,
+        )
+        next_cursor = _encode_cursor(order_by, order, items[-1]) if has_more else None
+        return items, next_cursor
+
+    async def summarize(
+        self,
+        user_id: int,
+        start: Optional[date_type] = None,
+        end: Optional[date_type] = None,
+    ) -> dict:
+        """Mesma semântica de TransactionService.summarize."""
+        _validate_period(start, end)
+        totals = await self.tx_repo.totals_by_type(user_id, start=start, end=end)
+        return _summary(user_id, totals)
+
+    async def timeseries(
+        self,
+        user_id: int,
+        bucket: str = "month",
+        start: Optional[date_type] = None,
+        end: Optional[date_type] = None,
+    ) -> dict:
+        """Mesma semântica de TransactionService.timeseries."""
+        _validate_bucket(bucket)
+        _validate_period(start, end)
+        rows = await self.tx_repo.timeseries(user_id, bucket, start, end)
+        return _timeseries(user_id, bucket, rows)
+
+    async def category_breakdown(
+        self,
+        user_id: int,
+        start: Optional[date_type] = None,
+        end: Optional[date_type] = None,
+        tipo: Optional[str] = None,
+    ) -> dict:
+        """Mesma semântica de TransactionService.category_breakdown."""
+        _validate_period(start, end)
+        tipo = _validate_tipo(tipo)
+        rows = await self.tx_repo.category_breakdown(user_id, start, end, tipo)
+        return _category_breakdown(user_id, rows)
@@ -1,12 +1,17 @@
-from typing import List, Optional
+from typing import Any, List, Optional
+
+from sqlalchemy.exc import IntegrityError
 
 from src.models.user import User
-from src.repositories.user_repo import UserRepository
+from src.repositories.unit_of_work import UnitOfWork, unit_scope
+from src.repositories.user_repo import AsyncUserRepository, UserRepository
 from src.services.exceptions import EntidadeNaoEncontradaError, ValidacaoError
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+EMAIL_DUPLICADO = "Já existe um usuário com este e-mail."
+
 
 class UserService:
     """
@@ -14,8 +19,10 @@ class UserService:
     Aqui entram as regras de validação e uso do UserRepository.
     """
 
-    def __init__(self, repo: UserRepository) -> None:
+    def __init__(self, repo: UserRepository, uow: Optional[UnitOfWork] = None) -> None:
         self.repo = repo
+        # com uma UnitOfWork, cada operação de escrita vira um único commit
+        self.uow = uow
 
     # CREATE
     def create_user(self, name: str, email: str) -> User:
@@ -25,13 +32,19 @@ class UserService:
         if not email or "@" not in email:
             raise ValidacaoError("E-mail inválido.")
 
-        # validação de duplicidade (uma das regras pedidas)
-        existing_users: List[User] = self.repo.list_all()
-        if any(u.email == email for u in existing_users):
-            raise ValidacaoError("Já existe um usuário com este e-mail.")
-
-        user = User(name=name.strip(), email=email.strip())
-        created = self.repo.add(user)
+        # validação de duplicidade (uma das regras pedidas): busca pelo índice
+        # único de users.email; cadastros concorrentes que passem juntos pela
+        # checagem esbarram na constraint no INSERT
+        email = email.strip()
+        if self.repo.get_by_email(email) is not None:
+            raise ValidacaoError(EMAIL_DUPLICADO)
+
+        user = User(name=name.strip(), email=email)
+        try:
+            with unit_scope(self.uow):
+                created = self.repo.add(user)
+        except IntegrityError:
+            raise ValidacaoError(EMAIL_DUPLICADO)
         logger.info("Usuário criado com id=%s", created.id)
         return created
 
@@ -49,6 +62,14 @@ class UserService:
     # UPDATE
     def update_user(self, user_id: int, name: Optional[str] = None,
                     email: Optional[str] = None) -> User:
+        try:
+            with unit_scope(self.uow):
+                return self._update_user(user_id, name, email)
+        except IntegrityError:
+            raise ValidacaoError(EMAIL_DUPLICADO)
+
+    def _update_user(self, user_id: int, name: Optional[str],
+                     email: Optional[str]) -> User:
         user = self.get_user(user_id)
 
         if name is not None:
@@ -60,10 +81,11 @@ class UserService:
             if "@" not in email:
                 raise ValidacaoError("E-mail inválido.")
             # checa duplicidade se e-mail mudou
-            existing_users: List[User] = self.repo.list_all()
-            if any(u.email == email and u.id != user_id for u in existing_users):
-                raise ValidacaoError("Já existe um usuário com este e-mail.")
-            user.email = email.strip()
+            email = email.strip()
+            owner = self.repo.get_by_email(email)
+            if owner is not None and owner.id != user_id:
+                raise ValidacaoError(EMAIL_DUPLICADO)
+            user.email = email
 
         updated = self.repo.update(user)
         logger.info("Usuário atualizado id=%s", updated.id)
@@ -71,6 +93,21 @@ class UserService:
 
     # DELETE
     def delete_user(self, user_id: int) -> None:
-        user = self.get_user(user_id)
-        self.repo.delete(user)
+        with unit_scope(self.uow):
+            user = self.get_user(user_id)
+            self.repo.delete(user)
         logger.info("Usuário removido id=%s", user_id)
+
+
+class AsyncUserService:
+    """Leituras de usuários sobre AsyncSession, para as rotas async da API."""
+
+    def __init__(self, repo: AsyncUserRepository) -> None:
+        self.repo = repo
+
+    async def list_users(self) -> List[User]:
+        return await self.repo.list_all()
+
+    async def list_user_rows(self) -> List[Any]:
+        """Usuários como tuplas (name, email, id), para respostas serializadas direto."""
+        return await self.repo.list_rows()
@@ -1,17 +1,69 @@
+import codecs
 import csv
+import io
+import re
 from pathlib import Path
-from datetime import datetime
-from typing import Iterable, List
+from datetime import date, datetime
+from typing import IO, Iterable, Iterator, List, Tuple
 
 from src.models.transaction import Transaction
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+CSV_HEADER = ["id", "date", "amount", "type", "description", "user_id", "category_id"]
+
+
+def _csv_row(t) -> list:
+    """Converte uma transação (objeto ORM ou linha de colunas) em linha do CSV."""
+    return [
+        t.id,
+        t.date.isoformat() if hasattr(t.date, "isoformat") else t.date,
+        f"{t.amount:.2f}",
+        t.type,
+        t.description or "",
+        t.user_id,
+        t.category_id,
+    ]
+
+
+def export_filename(user_id: int | None = None) -> str:
+    """Nome do arquivo de exportação: transactions_<user>_<data>.csv"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"transactions_{user_id or 'all'}_{timestamp}.csv"
+
+
+def iter_transactions_csv(transactions: Iterable, rows_per_chunk: int = 500) -> Iterator[str]:
+    """
+    Gera o CSV de transações em pedaços de texto (cabeçalho + até
+    `rows_per_chunk` linhas por pedaço), para respostas em streaming.
+
+    Args:
+        transactions (Iterable): Transações ou linhas com os atributos do CSV.
+        rows_per_chunk (int): Quantidade de linhas acumuladas antes de cada yield.
+
+    Yields:
+        str: Trecho do conteúdo CSV.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    pending = 0
+    for t in transactions:
+        writer.writerow(_csv_row(t))
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
 
 def export_transactions_to_csv(transactions: Iterable[Transaction], user_id: int | None = None) -> str:
     """
     Exporta uma lista de transações para um arquivo CSV dentro da pasta 'exports/'.
+    As linhas são gravadas conforme o iterável é consumido.
 
     Args:
         transactions (Iterable[Transaction]): Lista ou iterável de transações.
@@ -23,25 +75,14 @@ def export_transactions_to_csv(transactions: Iterable[Transaction], user_id: int
     export_dir = Path("exports")
     export_dir.mkdir(parents=True, exist_ok=True)
 
-    # Nome do arquivo: transactions_<user>_<data>.csv
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"transactions_{user_id or 'all'}_{timestamp}.csv"
-    path = export_dir / filename
+    path = export_dir / export_filename(user_id)
 
     with path.open("w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
-        writer.writerow(["id", "date", "amount", "type", "description", "user_id", "category_id"])
+        writer.writerow(CSV_HEADER)
 
         for t in transactions:
-            writer.writerow([
-                t.id,
-                t.date.isoformat() if hasattr(t.date, "isoformat") else t.date,
-                f"{t.amount:.2f}",
-                t.type,
-                t.description or "",
-                t.user_id,
-                t.category_id
-            ])
+            writer.writerow(_csv_row(t))
 
     logger.info("✅ Arquivo CSV exportado com sucesso: %s", path)
     return str(path)
@@ -67,3 +108,93 @@ def import_transactions_from_csv(filepath: str) -> List[dict]:
 
     logger.info("📥 %d transações importadas de %s", len(data), path)
     return data
+
+
+# formatos aceitos: brasileiro ("1.234,56", "1234,5") e ponto decimal sem
+# separador de milhar ("1234.56"); qualquer mistura ("1,234.56") é rejeitada
+_AMOUNT_BR = re.compile(r"\d{1,3}(\.\d{3})*,\d{1,2}|\d+,\d{1,2}")
+_AMOUNT_PLAIN = re.compile(r"\d+(\.\d{1,2})?")
+
+
+def _parse_amount_cents(raw: str) -> int:
+    value = raw.strip()
+    if _AMOUNT_BR.fullmatch(value):
+        units, _, frac = value.replace(".", "").partition(",")
+    elif _AMOUNT_PLAIN.fullmatch(value):
+        units, _, frac = value.partition(".")
+    else:
+        raise ValueError(value)
+    # direto do texto para centavos, sem passar por float
+    return int(units) * 100 + int(frac.ljust(2, "0"))
+
+
+def _parse_date(raw: str) -> date:
+    value = raw.strip()
+    if "/" in value:
+        return datetime.strptime(value, "%d/%m/%Y").date()
+    return date.fromisoformat(value)
+
+
+def parse_transaction_row(row: dict) -> dict:
+    """
+    Converte uma linha crua do CSV (strings) nos tipos da transação, com o
+    valor já em centavos inteiros (`amount_cents`).
+
+    Aceita valores com ponto ou vírgula decimal ("12.50", "1.234,56"; sem
+    misturar os dois como em "1,234.56"), datas ISO ou dd/mm/aaaa e o tipo
+    em qualquer caixa ("despesa" -> "Despesa").
+
+    Raises:
+        ValueError: com a descrição do campo inválido.
+    """
+    try:
+        amount_cents = _parse_amount_cents(row.get("amount") or "")
+    except ValueError:
+        raise ValueError(f"Valor inválido: {row.get('amount')!r}.")
+    try:
+        dt = _parse_date(row.get("date") or "")
+    except ValueError:
+        raise ValueError(f"Data inválida: {row.get('date')!r}.")
+    try:
+        user_id = int(row.get("user_id") or "")
+        category_id = int(row.get("category_id") or "")
+    except ValueError:
+        raise ValueError("user_id e category_id devem ser inteiros.")
+    return {
+        "amount_cents": amount_cents,
+        "date": dt,
+        "description": (row.get("description") or "").strip() or None,
+        "type": (row.get("type") or "").strip().capitalize(),
+        "user_id": user_id,
+        "category_id": category_id,
+    }
+
+
+def ensure_utf8(raw: IO[bytes], block_size: int = 1 << 16) -> None:
+    """
+    Confere, em blocos, que o arquivo inteiro é UTF-8 válido e volta ao início.
+    A importação grava um lote por commit: um erro de codificação no meio do
+    arquivo deixaria os lotes anteriores gravados, então a conferência vem antes.
+
+    Raises:
+        UnicodeDecodeError: no primeiro trecho que não for UTF-8.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    raw.seek(0)
+    while True:
+        block = raw.read(block_size)
+        if not block:
+            break
+        decoder.decode(block)
+    decoder.decode(b"", final=True)
+    raw.seek(0)
+
+
+def iter_csv_rows(stream: IO[str]) -> Iterator[Tuple[int, dict]]:
+    """
+    Lê o CSV linha a linha (sem carregar o arquivo), devolvendo
+    (número da linha no arquivo, linha crua como dicionário).
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
@@ -0,0 +1,51 @@
+import json
+from datetime import date
+from typing import Any, Iterable, List
+
+from fastapi.responses import Response
+
+try:  # dependência opcional: sem orjson, cai para o json da biblioteca padrão
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Campos de TransactionOut/UserOut/CategoryOut, na mesma ordem do schema
+TRANSACTION_FIELDS = ("amount", "date", "description", "type", "user_id", "category_id", "id")
+USER_FIELDS = ("name", "email", "id")
+CATEGORY_FIELDS = ("name", "type", "id")
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, date):
+        return obj.isoformat()
+    raise TypeError(f"Tipo não serializável em JSON: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serializa em JSON (orjson, se instalado); datas viram "AAAA-MM-DD"."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def rows_to_dicts(rows: Iterable[Any], fields: tuple) -> List[dict]:
+    """
+    Monta dicts (campo -> valor) direto das tuplas de uma consulta por colunas,
+    sem validação Pydantic. As colunas devem vir na ordem de `fields`.
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+class FastJSONResponse(Response):
+    """
+    Resposta JSON para listas grandes: o conteúdo já vem em tipos básicos
+    (dicts montados das linhas da consulta) e é codificado direto por `dumps`,
+    sem passar pelo response_model nem pelo jsonable_encoder.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,23 +1,18 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
 
+from config.settings import get_settings
 
-# Defer import of config.settings and provide environment fallback so that
-# mutated workspaces that don't have the top-level `config` package won't
-# fail at import time.
-def _get_setting(name: str, default=None):
-    try:
-        from config.settings import get_setting as _gs
 
-        return _gs(name, default)
-    except Exception:
-        return os.environ.get(name, default)
-
-
-# === Configurações vindas do .env (com fallback) ===
-LOG_FILE = _get_setting("LOG_FILE", ".logs/app.log")
-LOG_LEVEL = _get_setting("LOG_LEVEL", "INFO").upper()
+# === Configurações vindas do .env ===
+LOG_FILE = get_settings().log_file
+LOG_LEVEL = get_settings().log_level
+LOG_MODE = get_settings().log_mode
+LOG_FORMAT = get_settings().log_format
 
 # Garante que a pasta .logs exista
 os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
@@ -30,19 +25,147 @@ rotating_handler = RotatingFileHandler(
     encoding="utf-8",
 )
 
+# Campos estruturados aceitos em `extra=` (ex.: extra={"entity": "transaction", "id": 1})
+STRUCTURED_FIELDS = ("entity", "id", "user_id", "duration_ms")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formata cada registro como um objeto JSON em uma linha: ts, level, logger,
+    message e os campos estruturados presentes no registro (STRUCTURED_FIELDS),
+    para que o pipeline de logs não precise reinterpretar o texto da mensagem.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = record.__dict__.get(field)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
 # === Formato dos logs ===
-formatter = logging.Formatter(
-    "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+if LOG_FORMAT == "json":
+    formatter = JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%S")
+else:
+    formatter = logging.Formatter(
+        "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
 rotating_handler.setFormatter(formatter)
 
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler sobre uma fila limitada. Com a fila cheia, a política "drop"
+    descarta registros abaixo de WARNING (contados em `dropped`) e faz avisos e
+    erros esperarem por vaga; a política "block" faz todos esperarem. A espera
+    dura no máximo `block_timeout` segundos: depois disso o registro também é
+    descartado e contado.
+
+    Com a thread de escrita parada (depois de flush_logging), não há quem
+    esvazie a fila: os registros vão direto para os handlers do listener.
+    """
+
+    block_timeout = 5.0
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "drop") -> None:
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+        self.listener: QueueListener | None = None
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        listener = self.listener
+        if listener is not None and listener._thread is None:
+            listener.handle(record)
+            return
+        try:
+            if self.policy == "block" or record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _remove_previous_handlers(target: logging.Logger) -> None:
+    # Em um reload deste módulo, encerra a thread e os handlers da carga anterior
+    # (descarregando a fila) em vez de acumular handlers no logger "fintrack".
+    for handler in list(target.handlers):
+        if not getattr(handler, "_fintrack", False):
+            continue
+        listener = getattr(handler, "listener", None)
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+        target.removeHandler(handler)
+        for inner in getattr(listener, "handlers", ()) or (handler,):
+            inner.close()
+
+
 # === Logger global ===
 logger = logging.getLogger("fintrack")
 logger.setLevel(LOG_LEVEL)
-logger.addHandler(rotating_handler)
+_remove_previous_handlers(logger)
+
+if LOG_MODE == "queue":
+    # arquivo escrito por uma thread de fundo; a chamada de log só enfileira
+    queue_handler = BoundedQueueHandler(
+        queue.Queue(maxsize=get_settings().log_queue_size),
+        policy=get_settings().log_queue_policy,
+    )
+    queue_handler.listener = QueueListener(
+        queue_handler.queue, rotating_handler, respect_handler_level=True
+    )
+    queue_handler.listener.start()
+    queue_handler._fintrack = True
+    logger.addHandler(queue_handler)
+else:
+    queue_handler = None
+    rotating_handler._fintrack = True
+    logger.addHandler(rotating_handler)
 
 
 def get_logger(name: str) -> logging.Logger:
     """Retorna um logger configurado para o módulo especificado."""
     return logger.getChild(name)
+
+
+def flush_logging() -> None:
+    """
+    Descarrega a fila de logs (modo "queue"): para a thread de fundo depois que
+    ela grava todos os registros pendentes. Registros emitidos depois disso
+    são gravados direto no arquivo, na própria chamada, até um novo start.
+    Chamado no shutdown da API e na saída do processo.
+    """
+    if queue_handler is None or queue_handler.listener._thread is None:
+        rotating_handler.flush()
+        return
+    queue_handler.listener.stop()
+    if queue_handler.dropped:
+        rotating_handler.handle(logging.makeLogRecord({
+            "name": logger.name,
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "msg": "%s registros de log descartados com a fila cheia.",
+            "args": (queue_handler.dropped,),
+        }))
+        queue_handler.dropped = 0
+    rotating_handler.flush()
+
+
+def start_logging() -> None:
+    """(Re)inicia a thread de escrita dos logs, se parada (modo "queue")."""
+    if queue_handler is not None and queue_handler.listener._thread is None:
+        queue_handler.listener.start()
+
+
+atexit.register(flush_logging)
@@ -0,0 +1,330 @@
+"""
+Métricas da aplicação no formato texto do Prometheus, sem coletor externo.
+
+Cada processo acumula os valores em memória (Counter, Gauge, Histogram). Com
+vários workers (uvicorn --workers N), defina METRICS_DIR: cada worker grava
+periodicamente um snapshot `<pid>.json` nesse diretório e o /metrics de
+qualquer worker soma os snapshots de todos. O diretório deve ser esvaziado
+antes de subir o servidor (como o PROMETHEUS_MULTIPROC_DIR do prometheus_client).
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# limites (em segundos) dos histogramas de latência
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    """
+    Base das métricas: nome, descrição, nomes dos labels e os valores por label.
+
+    Para o registro de um evento ficar abaixo de 1 µs, não há lock no caminho
+    quente: cada thread soma no seu próprio dict (shard) e só a coleta
+    (dump) junta os shards de todas as threads.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._lock = threading.Lock()  # protege apenas a lista de shards
+        self._shards: List[dict] = []
+
+    def _shard(self) -> dict:
+        # primeira métrica registrada pela thread: cria o shard dela
+        values: dict = {}
+        with self._lock:
+            self._shards.append(values)
+        self._local.values = values
+        return values
+
+    def _shard_items(self) -> List[list]:
+        with self._lock:
+            shards = list(self._shards)
+        # list(d.items()) roda inteiro em C: não pega o dict no meio de uma inserção
+        return [item for values in shards for item in list(values.items())]
+
+    def dump(self) -> List[list]:
+        """Valores atuais em tipos JSON: [[labels, valor], ...]."""
+        merged: Dict[LabelValues, float] = {}
+        for key, value in self._shard_items():
+            merged[key] = merged.get(key, 0) + value
+        return [[list(k), v] for k, v in merged.items()]
+
+    def merge(self, dumps: Iterable[List[list]]) -> Dict[LabelValues, object]:
+        """Soma os valores de vários snapshots (um por processo), por label."""
+        merged: Dict[LabelValues, float] = {}
+        for dump in dumps:
+            for labels, value in dump:
+                key = tuple(labels)
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def render(self, values: Dict[LabelValues, object]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Contador monotônico (ex.: transações criadas)."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        try:
+            values = self._local.values
+        except AttributeError:
+            values = self._shard()
+        values[labels] = values.get(labels, 0) + amount
+
+
+class Gauge(Counter):
+    """
+    Valor que sobe e desce (ex.: requisições em andamento). Entre processos, é
+    somado. `set` fixa o valor de uma série atualizada só por coletores (ex.:
+    overflow do pool); não misture com inc/dec na mesma série.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._fixed: Dict[LabelValues, float] = {}
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        try:
+            values = self._local.values
+        except AttributeError:
+            values = self._shard()
+        values[labels] = values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        self._fixed[labels] = value
+
+    def _shard_items(self) -> List[list]:
+        return list(self._fixed.items()) + super()._shard_items()
+
+
+class Histogram(_Metric):
+    """
+    Histograma com limites fixos. Guarda a contagem por faixa (não cumulativa),
+    a soma e o total de observações; as faixas cumulativas (`le`) só são
+    calculadas na renderização.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        try:
+            values = self._local.values
+        except AttributeError:
+            values = self._shard()
+        state = values.get(labels)
+        if state is None:
+            # [contagem por faixa (a última é +Inf), soma, total]
+            state = values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def dump(self) -> List[list]:
+        return [
+            [list(labels), state]
+            for labels, state in self.merge(
+                [[[k, [list(v[0]), v[1], v[2]]] for k, v in self._shard_items()]]
+            ).items()
+        ]
+
+    def merge(self, dumps: Iterable[List[list]]) -> Dict[LabelValues, object]:
+        merged: Dict[LabelValues, list] = {}
+        for dump in dumps:
+            for labels, (counts, total, count) in dump:
+                state = merged.setdefault(tuple(labels), [[0] * len(counts), 0.0, 0])
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+                state[2] += count
+        return merged
+
+    def render(self, values: Dict[LabelValues, object]) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        names = (*self.labelnames, "le")
+        for labels, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = _format_labels(names, (*labels, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            plain = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+class Registry:
+    """Conjunto de métricas do processo, com snapshot em arquivo para agregar workers."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], None]] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica já registrada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, name: str, collect: Callable[[], None]) -> None:
+        """
+        Registra (ou substitui, pelo nome) uma função que atualiza gauges logo
+        antes de cada snapshot/renderização.
+        """
+        self._collectors[name] = collect
+
+    def snapshot(self) -> Dict[str, List[list]]:
+        for collect in self._collectors.values():
+            collect()
+        return {name: metric.dump() for name, metric in self._metrics.items()}
+
+    def write_snapshot(self, directory: str) -> None:
+        """Grava o snapshot deste processo em `<directory>/<pid>.json` (troca atômica)."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{os.getpid()}.json")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+
+    def _read_snapshots(self, directory: str) -> List[Dict[str, List[list]]]:
+        own = f"{os.getpid()}.json"
+        snapshots = []
+        for entry in os.listdir(directory):
+            if not entry.endswith(".json") or entry == own:
+                continue
+            try:
+                with open(os.path.join(directory, entry), encoding="utf-8") as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # arquivo removido ou incompleto: fica para a próxima coleta
+        return snapshots
+
+    def render(self, directory: Optional[str] = None) -> str:
+        """
+        Métricas no formato texto do Prometheus. Com `directory`, soma os
+        valores deste processo aos snapshots dos demais workers.
+        """
+        snapshots = [self.snapshot()]
+        if directory and os.path.isdir(directory):
+            snapshots.extend(self._read_snapshots(directory))
+        lines: List[str] = []
+        for name, metric in self._metrics.items():
+            values = metric.merge(s[name] for s in snapshots if name in s)
+            lines.extend(metric.render(values))
+        return "\n".join(lines) + "\n"
+
+
+class SnapshotWriter:
+    """Thread que grava o snapshot do processo a cada `interval` segundos."""
+
+    def __init__(self, registry: Registry, directory: str, interval: float) -> None:
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.registry.write_snapshot(self.directory)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Para a thread e grava um último snapshot."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.registry.write_snapshot(self.directory)
+
+
+# === Métricas da aplicação ===
+registry = Registry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "fintrack_http_request_duration_seconds",
+    "Latência das requisições HTTP por rota.",
+    ("method", "route", "status"),
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "fintrack_http_requests_in_flight", "Requisições HTTP em andamento."
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "fintrack_db_query_duration_seconds", "Duração de cada execução de SQL."
+)
+DB_POOL_CHECKOUTS = registry.counter(
+    "fintrack_db_pool_checkouts_total", "Conexões retiradas do pool.", ("engine",)
+)
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "fintrack_db_pool_checked_out", "Conexões do pool em uso.", ("engine",)
+)
+DB_POOL_OVERFLOW = registry.gauge(
+    "fintrack_db_pool_overflow", "Conexões abertas além do tamanho do pool.", ("engine",)
+)
+TRANSACTIONS_CREATED = registry.counter(
+    "fintrack_transactions_created_total", "Transações criadas (individualmente ou em lote)."
+)
+TRANSACTIONS_IMPORTED = registry.counter(
+    "fintrack_transactions_imported_total", "Transações importadas de CSV."
+)
+TRANSACTIONS_EXPORTED = registry.counter(
+    "fintrack_transactions_exported_total", "Transações exportadas para CSV."
+)
@@ -0,0 +1,48 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Iterable, Union
+
+Money = Union[int, float, Decimal]
+
+_ONE = Decimal(1)
+_INT64_MAX = 2**63 - 1
+
+# maior valor aceito em uma transação (R$ 1 trilhão): deixa folga para as somas
+# em centavos continuarem cabendo no INTEGER de 64 bits do banco
+MAX_AMOUNT = 10**12
+MAX_AMOUNT_CENTS = MAX_AMOUNT * 100
+
+
+def to_cents(value: Money) -> int:
+    """
+    Converte um valor em reais para centavos inteiros, arredondando meio
+    centavo para cima (1.005 -> 101). Floats são lidos pela sua representação
+    decimal (repr), não pelo binário aproximado.
+
+    Raises:
+        ValueError: para NaN, infinito ou valores fora do INTEGER de 64 bits.
+    """
+    if isinstance(value, int):
+        cents = value * 100
+    else:
+        if not isinstance(value, Decimal):
+            value = Decimal(repr(value))
+        if not value.is_finite():
+            raise ValueError(f"Valor monetário inválido: {value}")
+        scaled = value * 100
+        # confere antes do quantize, que falha (InvalidOperation) acima de 28 dígitos
+        if abs(scaled) > _INT64_MAX:
+            raise ValueError(f"Valor monetário fora do intervalo suportado: {value}")
+        cents = int(scaled.quantize(_ONE, rounding=ROUND_HALF_UP))
+    if abs(cents) > _INT64_MAX:
+        raise ValueError(f"Valor monetário fora do intervalo suportado: {value}")
+    return cents
+
+
+def from_cents(cents: int) -> float:
+    """Converte centavos inteiros para reais (o float mais próximo do valor exato)."""
+    return cents / 100
+
+
+def sum_money(values: Iterable[Money]) -> float:
+    """Soma valores em reais sem acumular erro de ponto flutuante (soma em centavos)."""
+    return from_cents(sum(to_cents(v) for v in values))
@@ -1,8 +1,11 @@
 import importlib
 
+from config.settings import reload_settings
+
 
 def _init_db_with_env(monkeypatch, db_url):
     monkeypatch.setenv("DATABASE_URL", db_url)
+    reload_settings()
     import src.repositories.db as db_mod
     importlib.reload(db_mod)
     db_mod.init_db()
@@ -12,6 +15,14 @@ def _init_db_with_env(monkeypatch, db_url):
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    """Relê as configurações ao fim de cada teste, depois que o monkeypatch
+    restaurou as variáveis de ambiente alteradas."""
+    yield
+    reload_settings()
+
+
 @pytest.fixture
 def client(monkeypatch, tmp_path):
     db_file = tmp_path / "test.db"
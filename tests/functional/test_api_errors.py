@@ -34,3 +34,7 @@ def test_transaction_not_found_update_delete(client):
     payload = {"amount": 10.0}
     assert client.put("/transactions/999", json=payload).status_code == 400
     assert client.delete("/transactions/999").status_code == 404
+
+
+def test_list_transactions_order_by_invalido_retorna_400(client):
+    assert client.get("/transactions", params={"order_by": "description"}).status_code == 400
@@ -1,10 +1,13 @@
 import importlib
 
+from config.settings import reload_settings
+
 
 def _make_client(monkeypatch, tmp_path):
     db_file = tmp_path / "test.db"
     monkeypatch.setenv("DATABASE_URL", f"sqlite+pysqlite:///{db_file}")
     monkeypatch.chdir(tmp_path)
+    reload_settings()
 
     import src.repositories.db as db_mod
     importlib.reload(db_mod)
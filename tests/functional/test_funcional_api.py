@@ -1,6 +1,8 @@
 import importlib
 import pytest
 
+from config.settings import reload_settings
+
 
 def test_health_ok(client):
     r = client.get("/health")
@@ -62,6 +64,7 @@ def test_criar_transacao_valor_negativo_rejeita(client):
 def test_limite_mensal_de_despesas_e_rejeicao(client, monkeypatch):
     
     monkeypatch.setenv("MONTHLY_LIMIT", "50.0")
+    reload_settings()
     u = client.post("/users", json={"name": "U2", "email": "u2@example.com"}).json()
     c = client.post("/categories", json={"name": "Desp", "type": "Despesa"}).json()
 
@@ -118,6 +121,13 @@ def test_resumo_transacoes_calcula_receitas_e_despesas(client):
     assert data["despesas"] == 30.0
     assert data["saldo"] == 70.0
 
+    r = client.get(
+        "/transactions/summary",
+        params={"user_id": u["id"], "start": "2025-06-02", "end": "2025-06-30"},
+    )
+    assert r.json()["receitas"] == 0.0
+    assert r.json()["despesas"] == 30.0
+
 
 def test_export_sem_transacoes_retorna_404(client):
     u = client.post("/users", json={"name": "U4", "email": "u4@example.com"}).json()
@@ -139,7 +149,7 @@ def test_export_com_transacoes_cria_arquivo(client, tmp_path):
             "category_id": c["id"],
         },
     )
-    r = client.get("/transactions/export", params={"user_id": u["id"]})
+    r = client.get("/transactions/export", params={"user_id": u["id"], "mode": "file"})
     assert r.status_code == 200
     body = r.json()
     assert "arquivo" in body
@@ -153,3 +163,259 @@ def test_update_usuario_email_invalido_retorna_400(client):
     u = client.post("/users", json={"name": "UX", "email": "ux@example.com"}).json()
     r = client.put(f"/users/{u['id']}", json={"name": "UX", "email": "bad-email"})
     assert r.status_code == 422
+
+
+def test_listar_transacoes_paginado_com_cursor(client):
+    u = client.post("/users", json={"name": "U6", "email": "u6@example.com"}).json()
+    c = client.post("/categories", json={"name": "Cat6", "type": "Receita"}).json()
+    for dia in range(1, 6):
+        client.post(
+            "/transactions",
+            json={
+                "amount": float(dia),
+                "date": f"2025-08-0{dia}",
+                "description": None,
+                "type": "Receita",
+                "user_id": u["id"],
+                "category_id": c["id"],
+            },
+        )
+
+    r1 = client.get("/transactions", params={"user_id": u["id"], "limit": 2})
+    assert r1.status_code == 200
+    p1 = r1.json()
+    assert [t["amount"] for t in p1["items"]] == [1.0, 2.0]
+    assert p1["next_cursor"]
+
+    r2 = client.get("/transactions", params={"user_id": u["id"], "limit": 2, "cursor": p1["next_cursor"]})
+    assert [t["amount"] for t in r2.json()["items"]] == [3.0, 4.0]
+
+    r3 = client.get("/transactions", params={"user_id": u["id"], "limit": 2, "cursor": r2.json()["next_cursor"]})
+    assert [t["amount"] for t in r3.json()["items"]] == [5.0]
+    assert r3.json()["next_cursor"] is None
+
+    bad = client.get("/transactions", params={"user_id": u["id"], "cursor": "nao-e-cursor"})
+    assert bad.status_code == 400
+
+    import base64
+    for payload in ('["amount","asc","abc",1]', '["amount","asc",null,1]', '["amount","asc",1e30,1]'):
+        editado = base64.urlsafe_b64encode(payload.encode()).decode()
+        bad = client.get("/transactions", params={"order_by": "amount", "cursor": editado})
+        assert bad.status_code == 400, payload
+        assert bad.json()["detail"] == "Cursor inválido."
+
+
+def test_criar_transacoes_em_lote_com_resultado_por_item(client, monkeypatch):
+    monkeypatch.setenv("MONTHLY_LIMIT", "100.0")
+    reload_settings()
+    u = client.post("/users", json={"name": "U7", "email": "u7@example.com"}).json()
+    cr = client.post("/categories", json={"name": "R7", "type": "Receita"}).json()
+    cd = client.post("/categories", json={"name": "D7", "type": "Despesa"}).json()
+
+    def item(amount, tipo, cat, dia="2025-09-01", user=u["id"]):
+        return {"amount": amount, "date": dia, "description": None, "type": tipo, "user_id": user, "category_id": cat}
+
+    payload = {"items": [
+        item(50.0, "Receita", cr["id"]),
+        item(60.0, "Despesa", cd["id"]),
+        item(50.0, "Despesa", cd["id"]),           # 60 + 50 > 100: limite acumulado no lote
+        item(40.0, "Despesa", cd["id"]),
+        item(-1.0, "Receita", cr["id"]),
+        item(10.0, "Receita", cd["id"]),           # tipo diferente da categoria
+        item(10.0, "Receita", cr["id"], user=99999),
+    ]}
+    r = client.post("/transactions/batch", json=payload)
+    assert r.status_code == 200
+    body = r.json()
+    assert body["created"] == 3 and body["rejected"] == 4
+    assert [x["status"] for x in body["results"]] == [
+        "created", "created", "rejected", "created", "rejected", "rejected", "rejected",
+    ]
+    assert "Limite mensal" in body["results"][2]["detail"]
+
+    tx_id = body["results"][3]["id"]
+    assert client.get(f"/transactions/{tx_id}").json()["amount"] == 40.0
+    summary = client.get("/transactions/summary", params={"user_id": u["id"]}).json()
+    assert summary["despesas"] == 100.0 and summary["receitas"] == 50.0
+
+
+def test_export_streaming_devolve_csv_para_download(client):
+    import csv
+    import io
+
+    u = client.post("/users", json={"name": "U8", "email": "u8@example.com"}).json()
+    c = client.post("/categories", json={"name": "Cat8", "type": "Receita"}).json()
+    for dia in (2, 1):
+        client.post(
+            "/transactions",
+            json={
+                "amount": 7.5,
+                "date": f"2025-10-0{dia}",
+                "description": "x",
+                "type": "Receita",
+                "user_id": u["id"],
+                "category_id": c["id"],
+            },
+        )
+    r = client.get("/transactions/export", params={"user_id": u["id"]})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    assert "attachment" in r.headers["content-disposition"]
+    rows = list(csv.reader(io.StringIO(r.text)))
+    assert rows[0] == ["id", "date", "amount", "type", "description", "user_id", "category_id"]
+    assert [row[1] for row in rows[1:]] == ["2025-10-01", "2025-10-02"]
+    assert rows[1][2] == "7.50"
+
+
+def test_importar_csv_por_upload(client):
+    u = client.post("/users", json={"name": "U9", "email": "u9@example.com"}).json()
+    c = client.post("/categories", json={"name": "Cat9", "type": "Despesa"}).json()
+    conteudo = (
+        "id,date,amount,type,description,user_id,category_id\n"
+        f",2025-03-01,10.00,Despesa,a,{u['id']},{c['id']}\n"
+        f",2025-03-02,-5,Despesa,b,{u['id']},{c['id']}\n"
+    )
+    r = client.post(
+        "/transactions/import",
+        files={"file": ("extrato.csv", conteudo.encode("utf-8"), "text/csv")},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["total"], body["imported"], body["rejected"]) == (2, 1, 1)
+    assert body["errors"][0]["line"] == 3
+
+
+def test_importar_csv_com_bytes_invalidos_no_meio_nao_grava_nada(client):
+    u = client.post("/users", json={"name": "U10", "email": "u10@example.com"}).json()
+    c = client.post("/categories", json={"name": "Cat10", "type": "Receita"}).json()
+    linha = f",2025-03-01,1.00,Receita,ok,{u['id']},{c['id']}\n".encode("utf-8")
+    # mais linhas válidas que um lote (5000) antes do trecho em Latin-1
+    conteudo = (
+        b"id,date,amount,type,description,user_id,category_id\n"
+        + linha * 6000
+        + f",2025-03-02,2.00,Receita,a\xe7\xe3o,{u['id']},{c['id']}\n".encode("latin-1")
+    )
+    r = client.post(
+        "/transactions/import",
+        files={"file": ("extrato.csv", conteudo, "text/csv")},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Arquivo deve estar codificado em UTF-8."
+    assert client.get("/transactions", params={"user_id": u["id"]}).json()["items"] == []
+
+
+def test_valor_acima_do_maximo_e_rejeitado_sem_erro_interno(client):
+    u = client.post("/users", json={"name": "UM", "email": "um@example.com"}).json()
+    c = client.post("/categories", json={"name": "CatMax", "type": "Receita"}).json()
+    item = {"amount": 1e17, "date": "2025-03-01", "description": None, "type": "Receita",
+            "user_id": u["id"], "category_id": c["id"]}
+    assert client.post("/transactions", json=item).status_code == 422
+    assert client.post("/transactions/batch", json={"items": [item]}).status_code == 422
+
+    conteudo = (
+        "id,date,amount,type,description,user_id,category_id\n"
+        f",2025-03-01,1e17,Receita,a,{u['id']},{c['id']}\n"
+        f",2025-03-02,1e13,Receita,b,{u['id']},{c['id']}\n"
+        f",2025-03-03,10.00,Receita,c,{u['id']},{c['id']}\n"
+    )
+    r = client.post(
+        "/transactions/import",
+        files={"file": ("extrato.csv", conteudo.encode("utf-8"), "text/csv")},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["total"], body["imported"], body["rejected"]) == (3, 1, 2)
+    assert [e["line"] for e in body["errors"]] == [2, 3]
+
+
+def test_server_timing_informa_consultas_da_requisicao(client):
+    r = client.get("/users")
+    assert r.status_code == 200
+    db, app = r.headers["server-timing"].split(", ")
+    assert db.startswith("db;dur=") and db.endswith('desc="1 queries"')
+    assert app.startswith("app;dur=")
+
+
+def test_metrics_expoe_formato_prometheus(client):
+    from src.utils.metrics import TRANSACTIONS_CREATED
+
+    antes = TRANSACTIONS_CREATED.dump()
+    antes = antes[0][1] if antes else 0
+    u = client.post("/users", json={"name": "M", "email": "m@example.com"}).json()
+    c = client.post("/categories", json={"name": "CatM", "type": "Despesa"}).json()
+    r = client.post(
+        "/transactions",
+        json={"amount": 5, "date": "2025-01-02", "description": "x", "type": "Despesa",
+              "user_id": u["id"], "category_id": c["id"]},
+    )
+    assert r.status_code == 201
+    client.get(f"/users/{u['id']}")
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+    assert f"fintrack_transactions_created_total {antes + 1}" in text
+    assert 'route="/users/{user_id}"' in text
+    assert "fintrack_http_requests_in_flight 1" in text  # a própria requisição /metrics
+    assert "fintrack_db_query_duration_seconds_count" in text
+    assert 'fintrack_db_pool_checkouts_total{engine="sync"}' in text
+
+
+def test_saldo_do_usuario_atual_e_em_data(client):
+    u = client.post("/users", json={"name": "S", "email": "s@example.com"}).json()
+    rec = client.post("/categories", json={"name": "Sal", "type": "Receita"}).json()
+    desp = client.post("/categories", json={"name": "Mer", "type": "Despesa"}).json()
+    for amount, dt, tipo, cat in ((500, "2025-01-05", "Receita", rec), (120, "2025-02-10", "Despesa", desp)):
+        r = client.post("/transactions", json={
+            "amount": amount, "date": dt, "description": "x", "type": tipo,
+            "user_id": u["id"], "category_id": cat["id"],
+        })
+        assert r.status_code == 201
+
+    r = client.get(f"/users/{u['id']}/balance")
+    assert r.status_code == 200
+    assert r.json() == {"user_id": u["id"], "balance": 380.0, "as_of": None}
+    r = client.get(f"/users/{u['id']}/balance", params={"as_of": "2025-01-31"})
+    assert r.json()["balance"] == 500.0
+    assert client.get("/users/9999/balance").status_code == 404
+
+
+def test_serie_temporal_por_mes(client):
+    u = client.post("/users", json={"name": "T", "email": "t@example.com"}).json()
+    c = client.post("/categories", json={"name": "CatT", "type": "Despesa"}).json()
+    for amount, dt in ((10, "2025-01-05"), (15, "2025-01-20"), (4, "2025-03-01")):
+        client.post("/transactions", json={
+            "amount": amount, "date": dt, "description": "x", "type": "Despesa",
+            "user_id": u["id"], "category_id": c["id"],
+        })
+    r = client.get("/transactions/timeseries", params={"user_id": u["id"], "bucket": "month"})
+    assert r.status_code == 200
+    assert [(p["inicio"], p["despesas"], p["saldo"]) for p in r.json()["series"]] == [
+        ("2025-01-01", 25.0, -25.0), ("2025-03-01", 4.0, -4.0),
+    ]
+    r = client.get("/transactions/timeseries", params={"user_id": u["id"], "bucket": "year"})
+    assert r.status_code == 400
+
+
+def test_relatorio_por_categoria(client):
+    u = client.post("/users", json={"name": "R", "email": "r@example.com"}).json()
+    merc = client.post("/categories", json={"name": "MercR", "type": "Despesa"}).json()
+    laz = client.post("/categories", json={"name": "LazR", "type": "Despesa"}).json()
+    for amount, cat in ((30, merc), (10, merc), (10, laz)):
+        client.post("/transactions", json={
+            "amount": amount, "date": "2025-04-01", "description": "x", "type": "Despesa",
+            "user_id": u["id"], "category_id": cat["id"],
+        })
+    r = client.get("/transactions/by-category", params={"user_id": u["id"], "tipo": "Despesa"})
+    assert r.status_code == 200
+    items = r.json()["items"]
+    assert [(i["name"], i["total"], i["count"], i["share"], i["average"]) for i in items] == [
+        ("MercR", 40.0, 2, 0.8, 20.0), ("LazR", 10.0, 1, 0.2, 10.0),
+    ]
+    # filtro em qualquer caixa, como em GET /transactions
+    minusculo = client.get("/transactions/by-category", params={"user_id": u["id"], "tipo": "despesa"})
+    assert minusculo.status_code == 200
+    assert minusculo.json()["items"] == items
+    bad = client.get("/transactions/by-category", params={"user_id": u["id"], "start": "2025-02-01", "end": "2025-01-01"})
+    assert bad.status_code == 400
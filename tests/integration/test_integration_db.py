@@ -5,6 +5,8 @@ from src.models.transaction import Transaction
 
 import pytest
 
+from config.settings import reload_settings
+
 
 def test_fluxo_basico_repos_user_categoria_transacao(db_session):
     from src.repositories.user_repo import UserRepository
@@ -159,3 +161,678 @@ def test_init_db_idempotente(db_session):
     urepo = UserRepository(db_session)
     u = urepo.add(User(name="Z", email="z@x.com"))
     assert u.id is not None
+
+
+def test_listar_filtrado_no_banco_por_usuario_tipo_e_ordem(db_session):
+    from src.repositories.transaction_repo import TransactionRepository
+
+    trepo = TransactionRepository(db_session)
+    trepo.add(Transaction(amount=30, date=date(2025, 6, 3), type="Despesa", user_id=1, category_id=2))
+    trepo.add(Transaction(amount=10, date=date(2025, 6, 1), type="Receita", user_id=1, category_id=1))
+    trepo.add(Transaction(amount=20, date=date(2025, 6, 2), type="Despesa", user_id=1, category_id=2))
+    trepo.add(Transaction(amount=99, date=date(2025, 6, 1), type="Despesa", user_id=2, category_id=2))
+
+    res = trepo.list_filtered(user_id=1, tipo="despesa", order_by="date", order="desc")
+    assert [t.amount for t in res] == [30, 20]
+    res = trepo.list_filtered(user_id=1, order_by="amount")
+    assert [t.amount for t in res] == [10, 20, 30]
+    with pytest.raises(ValueError):
+        trepo.list_filtered(order_by="nao_existe")
+
+
+def test_paginacao_keyset_percorre_todas_as_paginas(db_session):
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.transaction_service import TransactionService
+
+    trepo = TransactionRepository(db_session)
+    # datas repetidas garantem que o desempate por id é respeitado
+    for i in range(7):
+        trepo.add(Transaction(amount=i + 1, date=date(2025, 7, 1 + i // 2), type="Receita", user_id=1, category_id=1))
+    svc = TransactionService(trepo, None, None)
+
+    vistos, cursor = [], None
+    while True:
+        items, cursor = svc.list_transactions_page(user_id=1, order="desc", limit=3, cursor=cursor)
+        vistos.extend(items)
+        if cursor is None:
+            break
+    esperado = sorted(vistos, key=lambda t: (t.date, t.id), reverse=True)
+    assert [t.id for t in vistos] == [t.id for t in esperado]
+    assert len({t.id for t in vistos}) == 7
+
+
+def test_totais_por_tipo_agregados_no_banco(db_session):
+    from src.repositories.transaction_repo import TransactionRepository
+
+    trepo = TransactionRepository(db_session)
+    trepo.add(Transaction(amount=100, date=date(2025, 9, 1), type="Receita", user_id=1, category_id=1))
+    trepo.add(Transaction(amount=30, date=date(2025, 9, 2), type="Despesa", user_id=1, category_id=2))
+    trepo.add(Transaction(amount=20, date=date(2025, 10, 1), type="Despesa", user_id=1, category_id=2))
+    trepo.add(Transaction(amount=999, date=date(2025, 9, 1), type="Receita", user_id=2, category_id=1))
+
+    assert trepo.totals_by_type(1) == {"Receita": 100.0, "Despesa": 50.0}
+    assert trepo.totals_by_type(1, start=date(2025, 10, 1)) == {"Despesa": 20.0}
+    assert trepo.totals_by_type(1, end=date(2025, 9, 30)) == {"Receita": 100.0, "Despesa": 30.0}
+    assert trepo.totals_by_type(3) == {}
+
+
+def test_consolidado_mensal_acompanha_criar_atualizar_deletar(db_session):
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.repositories.monthly_totals_repo import MonthlyTotalRepository
+
+    trepo = TransactionRepository(db_session)
+    mrepo = MonthlyTotalRepository(db_session)
+    a = trepo.add(Transaction(amount=40, date=date(2025, 5, 1), type="Despesa", user_id=1, category_id=2))
+    b = trepo.add(Transaction(amount=15, date=date(2025, 5, 20), type="Despesa", user_id=1, category_id=2))
+    assert trepo.monthly_total(1, date(2025, 5, 9), "Despesa") == 55
+
+    # mudar data e valor move o valor entre meses
+    b.amount = 25
+    b.date = date(2025, 6, 1)
+    trepo.update(b)
+    assert trepo.monthly_total(1, date(2025, 5, 1), "Despesa") == 40
+    assert trepo.monthly_total(1, date(2025, 6, 1), "Despesa") == 25
+
+    trepo.delete(a)
+    assert trepo.monthly_total(1, date(2025, 5, 1), "Despesa") == 0
+    assert trepo.totals_by_type(1) == {"Despesa": 25.0}
+
+    # rebuild reproduz o estado mantido incrementalmente
+    mrepo.rebuild()
+    assert trepo.monthly_total(1, date(2025, 6, 1), "Despesa") == 25
+    assert mrepo.totals_by_type(1) == {"Despesa": 25.0}
+
+
+def test_consolidado_mensal_com_instancia_expirada_apos_commit(db_session):
+    from src.repositories.transaction_repo import TransactionRepository
+
+    trepo = TransactionRepository(db_session)
+    t = trepo.add(Transaction(amount=30, date=date(2025, 5, 3), type="Despesa", user_id=1, category_id=2))
+    db_session.expire(t)  # sem valores carregados: o histórico não guarda o valor antigo
+    t.amount = 12
+    t.date = date(2025, 7, 1)
+    trepo.update(t)
+    assert trepo.monthly_total(1, date(2025, 5, 1), "Despesa") == 0
+    assert trepo.monthly_total(1, date(2025, 7, 1), "Despesa") == 12
+
+
+def test_consolidado_mensal_acompanha_escritas_de_qualquer_sessao(db_session):
+    from sqlalchemy.orm import Session
+    from src.repositories.balance_repo import SQLBalanceLedger
+    from src.repositories.transaction_repo import TransactionRepository
+
+    # sessão criada direto na engine, fora de SessionLocal
+    with Session(db_session.get_bind()) as outra:
+        t = Transaction(amount=8, date=date(2025, 4, 2), type="Despesa", user_id=1, category_id=2)
+        outra.add(t)
+        outra.commit()
+        t.amount = 5
+        outra.commit()
+
+    trepo = TransactionRepository(db_session)
+    assert trepo.monthly_total(1, date(2025, 4, 1), "Despesa") == 5
+    assert SQLBalanceLedger(db_session).current(1) == -5
+
+
+def test_migracao_preenche_consolidado_de_banco_existente(tmp_path):
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+    from src.models.base import Base
+    from src.repositories.migrations import run_migrations
+    from src.repositories.monthly_totals_repo import MonthlyTotalRepository
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'antigo.db'}")
+    Base.metadata.create_all(bind=engine)
+    # INSERT Core (sem o listener): simula dados gravados antes do consolidado existir
+    with engine.begin() as conn:
+        conn.execute(insert(Transaction.__table__), [
+            {"amount": 10, "date": date(2025, 1, 5), "type": "Receita", "user_id": 1, "category_id": 1},
+            {"amount": 4, "date": date(2025, 1, 6), "type": "Despesa", "user_id": 1, "category_id": 2},
+        ])
+
+    run_migrations(engine)
+    with Session(engine) as s:
+        assert MonthlyTotalRepository(s).totals_by_type(1) == {"Receita": 10.0, "Despesa": 4.0}
+
+
+def test_importar_csv_em_lotes_com_relatorio_de_erros(db_session):
+    import io
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.transaction_service import TransactionService
+    from src.models.user import User
+    from src.models.category import Category
+
+    urepo = UserRepository(db_session)
+    crepo = CategoryRepository(db_session)
+    trepo = TransactionRepository(db_session)
+    u = urepo.add(User(name="Imp", email="imp@x.com"))
+    c = crepo.add(Category(name="Sal", type="Receita"))
+
+    linhas = ["id,date,amount,type,description,user_id,category_id"]
+    for i in range(7):
+        linhas.append(f",2025-02-{i + 1:02d},{i + 1}.00,receita,linha {i},{u.id},{c.id}")
+    linhas.append(f",2025-02-10,abc,Receita,,{u.id},{c.id}")       # linha 9: valor inválido
+    linhas.append(f",2025-02-11,5.00,Receita,,{u.id},9999")        # linha 10: categoria inexistente
+    linhas.append(f',2025-02-12,"1,234.56",Receita,,{u.id},{c.id}')  # linha 11: separadores misturados
+    csv_text = "\n".join(linhas) + "\n"
+
+    svc = TransactionService(trepo, urepo, crepo)
+    res = svc.import_transactions_csv(io.StringIO(csv_text), chunk_size=3)
+    assert (res["total"], res["imported"], res["rejected"]) == (10, 7, 3)
+    assert [e["line"] for e in res["errors"]] == [9, 10, 11]
+    assert "1,234.56" in res["errors"][2]["detail"]
+    assert len(trepo.list_by_user(u.id)) == 7
+    assert trepo.totals_by_type(u.id) == {"Receita": 28.0}
+
+
+def test_importar_csv_converte_cada_valor_para_centavos_uma_vez(db_session, monkeypatch):
+    import io
+    import src.models.types as types
+    import src.services.transaction_service as service_mod
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.transaction_service import TransactionService
+    from src.models.user import User
+    from src.models.category import Category
+
+    urepo = UserRepository(db_session)
+    crepo = CategoryRepository(db_session)
+    trepo = TransactionRepository(db_session)
+    u = urepo.add(User(name="Cent", email="cent@x.com"))
+    c = crepo.add(Category(name="Mercado", type="Despesa"))
+
+    chamadas = []
+    for mod in (types, service_mod):
+        original = mod.to_cents
+        monkeypatch.setattr(mod, "to_cents", lambda v, original=original: chamadas.append(v) or original(v))
+
+    linhas = ["id,date,amount,type,description,user_id,category_id"]
+    linhas += [f',2025-03-{i + 1:02d},"{i},10",Despesa,,{u.id},{c.id}' for i in range(20)]
+    res = TransactionService(trepo, urepo, crepo).import_transactions_csv(io.StringIO("\n".join(linhas)))
+
+    assert res["imported"] == 20
+    # o texto vira centavos no parse; só o total já gravado do mês é convertido
+    assert len(chamadas) <= 1
+    assert trepo.monthly_total(u.id, date(2025, 3, 1), "Despesa") == pytest.approx(192.0)
+
+
+def test_pragmas_sqlite_aplicados_na_conexao(tmp_path, monkeypatch):
+    from sqlalchemy import text
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'p.db'}")
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "full")
+    reload_settings()
+    import src.repositories.db as db_mod
+    importlib.reload(db_mod)
+
+    with db_mod.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 2  # FULL (sobrescrito)
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    db_mod.engine.dispose()
+
+
+def test_engine_assincrona_so_e_criada_no_primeiro_uso(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'lazy.db'}")
+    reload_settings()
+    import src.repositories.db as db_mod
+    importlib.reload(db_mod)
+    assert db_mod._async_engine is None
+
+    # banco sem URL assíncrona: o import funcionou; só o uso assíncrono falha
+    monkeypatch.setenv("DATABASE_URL", "postgresql://u:p@localhost/fintrack")
+    reload_settings()
+    with pytest.raises(ValueError):
+        db_mod.get_async_sessionmaker()
+    assert db_mod._async_engine is None
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'lazy.db'}")
+    reload_settings()
+    factory = db_mod.get_async_sessionmaker()
+    assert db_mod.get_async_sessionmaker() is factory
+    assert db_mod._async_engine.dialect.driver == "aiosqlite"
+    db_mod.engine.dispose()
+
+
+def test_pragmas_sqlite_rejeita_valores_invalidos(monkeypatch):
+    import src.repositories.db as db_mod
+
+    monkeypatch.setenv("SQLITE_JOURNAL_MODE", "WAL; DROP TABLE users")
+    with pytest.raises(ValueError):
+        db_mod.sqlite_pragmas(reload_settings())
+    monkeypatch.delenv("SQLITE_JOURNAL_MODE")
+    monkeypatch.setenv("SQLITE_PROFILE", "sqlite")
+    reload_settings()
+    assert db_mod.sqlite_pragmas() == {}
+
+
+def test_repositorios_async_leem_o_mesmo_banco(tmp_path, monkeypatch):
+    import asyncio
+    from src.models.user import User
+    from src.models.category import Category
+    from src.repositories.user_repo import AsyncUserRepository
+    from src.repositories.category_repo import AsyncCategoryRepository
+    from src.repositories.transaction_repo import AsyncTransactionRepository, TransactionRepository
+    from src.services.transaction_service import AsyncTransactionService, TransactionService
+    from tests.fixtures.fixtures import _init_db_with_env
+
+    db_mod = _init_db_with_env(monkeypatch, f"sqlite:///{tmp_path / 'async.db'}")
+    with db_mod.SessionLocal() as s:
+        u = User(name="Ana", email="ana@x.com")
+        c = Category(name="Mercado", type="Despesa")
+        s.add_all([u, c])
+        s.commit()
+        TransactionRepository(s).bulk_add([
+            {"amount_cents": (i + 1) * 100, "date": date(2025, 1, i + 1), "description": None,
+             "type": "Despesa", "user_id": u.id, "category_id": c.id}
+            for i in range(5)
+        ])
+        uid, cid = u.id, c.id
+        sync_page = TransactionService(TransactionRepository(s), None, None).list_transactions_page(
+            user_id=uid, limit=2
+        )
+
+    async def run():
+        async with db_mod.async_session() as s:
+            users = await AsyncUserRepository(s).list_all()
+            cats = await AsyncCategoryRepository(s).list_by_type("Despesa")
+            svc = AsyncTransactionService(AsyncTransactionRepository(s))
+            page = await svc.list_transactions_page(user_id=uid, limit=2)
+            summary = await svc.summarize(uid)
+            ranged = await svc.summarize(uid, date(2025, 1, 2), date(2025, 1, 3))
+        await db_mod.dispose_async_engine()
+        return users, cats, page, summary, ranged
+
+    users, cats, page, summary, ranged = asyncio.run(run())
+    assert [x.id for x in users] == [uid]
+    assert [x.id for x in cats] == [cid]
+    assert [t.id for t in page[0]] == [t.id for t in sync_page[0]]
+    assert page[1] == sync_page[1]
+    assert summary["despesas"] == 15.0
+    assert ranged["despesas"] == 5.0
+
+
+def test_unit_of_work_um_commit_e_atomicidade(db_session):
+    from sqlalchemy import event
+    from src.models.user import User
+    from src.models.category import Category
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.unit_of_work import UnitOfWork
+
+    commits = []
+    event.listen(db_session, "after_commit", lambda s: commits.append(1))
+    urepo, crepo = UserRepository(db_session), CategoryRepository(db_session)
+
+    with UnitOfWork(db_session):
+        u = urepo.add(User(name="Ana", email="ana@x.com"))
+        assert u.id is not None  # flush já atribui o ID
+        with UnitOfWork(db_session):  # aninhada: não confirma sozinha
+            crepo.add(Category(name="Mercado", type="Despesa"))
+        assert commits == []
+    assert len(commits) == 1
+
+    with pytest.raises(RuntimeError):
+        with UnitOfWork(db_session):
+            urepo.add(User(name="Bia", email="bia@x.com"))
+            raise RuntimeError("falha no meio da unidade")
+    assert [x.email for x in urepo.list_all()] == ["ana@x.com"]
+
+    # fora de uma unidade, cada chamada continua confirmando sozinha
+    urepo.add(User(name="Caio", email="caio@x.com"))
+    assert len(commits) == 2
+
+
+def test_unit_of_work_desfaz_atualizacao_rejeitada(db_session):
+    from src.models.user import User
+    from src.models.category import Category
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.repositories.unit_of_work import UnitOfWork
+    from src.services.transaction_service import TransactionService
+    from src.services.exceptions import ValidacaoError
+
+    urepo, crepo, trepo = UserRepository(db_session), CategoryRepository(db_session), TransactionRepository(db_session)
+    u = urepo.add(User(name="Ana", email="ana@x.com"))
+    c = crepo.add(Category(name="Mercado", type="Despesa"))
+    svc = TransactionService(trepo, urepo, crepo, uow=UnitOfWork(db_session))
+    tx = svc.create_transaction(10.0, date(2025, 1, 5), "x", "Despesa", u.id, c.id)
+
+    with pytest.raises(ValidacaoError):
+        svc.update_transaction(tx.id, 99.0, None, None, "Invalido", None)
+    assert trepo.get(tx.id).amount == 10.0
+    assert svc.summarize(u.id)["despesas"] == 10.0
+
+
+def test_email_duplicado_barrado_pela_constraint_unica(db_session, monkeypatch):
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.unit_of_work import UnitOfWork
+    from src.services.user_service import UserService
+    from src.services.exceptions import ValidacaoError
+
+    repo = UserRepository(db_session)
+    svc = UserService(repo, uow=UnitOfWork(db_session))
+    svc.create_user("Ana", "ana@x.com")
+
+    # simula um cadastro concorrente que passou pela checagem antes do INSERT
+    monkeypatch.setattr(repo, "get_by_email", lambda email: None)
+    with pytest.raises(ValidacaoError):
+        svc.create_user("Ana 2", "ana@x.com")
+    assert [u.email for u in repo.list_all()] == ["ana@x.com"]
+
+
+def test_validacao_de_referencias_em_uma_consulta(db_session):
+    from sqlalchemy import event
+    from src.models.user import User
+    from src.models.category import Category
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.transaction_service import TransactionService
+    from src.services.exceptions import EntidadeNaoEncontradaError
+
+    urepo, crepo, trepo = UserRepository(db_session), CategoryRepository(db_session), TransactionRepository(db_session)
+    u = urepo.add(User(name="Ana", email="ana@x.com"))
+    c = crepo.add(Category(name="Mercado", type="Despesa"))
+    svc = TransactionService(trepo, urepo, crepo)
+
+    uid, cid = u.id, c.id
+    assert trepo.lookup_refs({uid, 999}, {cid, 998}) == ({uid}, {cid: "Despesa"})
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda conn, cur, stmt, params, ctx, many: statements.append(stmt)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        svc.create_transaction(10.0, date(2025, 1, 5), None, "Despesa", uid, cid)
+        svc.create_transactions_batch([
+            {"amount": 1.0, "date": date(2025, 1, 6), "type": "Despesa", "user_id": uid, "category_id": cid},
+            {"amount": 1.0, "date": date(2025, 1, 7), "type": "Despesa", "user_id": 999, "category_id": cid},
+        ])
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    lookups = [s for s in statements if "FROM users" in s or "FROM categories" in s]
+    assert len(lookups) == 2  # uma consulta por escrita (unitária e lote)
+
+    with pytest.raises(EntidadeNaoEncontradaError):
+        svc._validar_user_category(uid, 998, "Despesa")
+
+
+def test_cache_de_categorias_invalidado_por_escrita_e_por_versao(tmp_path, monkeypatch):
+    from src.repositories.category_cache import CategoryCache, read_cache_version
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.unit_of_work import UnitOfWork
+    from src.services.category_service import CategoryService
+    from tests.fixtures.fixtures import _init_db_with_env
+
+    db_mod = _init_db_with_env(monkeypatch, f"sqlite:///{tmp_path / 'cache.db'}")
+    local = CategoryCache(db_mod.SessionLocal, check_interval=60)
+    other_worker = CategoryCache(db_mod.SessionLocal, check_interval=0)
+
+    with db_mod.SessionLocal() as s:
+        svc = CategoryService(CategoryRepository(s), uow=UnitOfWork(s), cache=local)
+        svc.create_category("Salário", "Receita")
+        mercado = svc.create_category("mercado", "Despesa")
+        svc.create_category("Aluguel", "Despesa")
+        assert read_cache_version(s) == 3
+
+        assert [c.name for c in svc.list_categories("Despesa")] == ["Aluguel", "mercado"]
+        assert [c.name for c in other_worker.list_sorted(order="desc")] == ["Salário", "mercado", "Aluguel"]
+        assert local.get(mercado.id).type == "Despesa"
+        assert local.types_by_id({mercado.id, 999}) == {mercado.id: "Despesa"}
+
+        svc.update_category(mercado.id, "Feira", None)
+        assert local.get(mercado.id).name == "Feira"  # invalidado pelo serviço
+        # outro processo percebe a mudança pelo contador de versão
+        assert [c.name for c in other_worker.list_sorted("Despesa")] == ["Aluguel", "Feira"]
+
+        svc.delete_category(mercado.id)
+        assert local.get(mercado.id) is None
+        assert other_worker.get(mercado.id) is None
+
+
+def test_validacao_de_escrita_le_categorias_do_banco_e_nao_do_cache(db_session):
+    from src.models.user import User
+    from src.models.category import Category
+    from src.repositories.category_cache import CategoryCache
+    from src.repositories.user_repo import UserRepository
+    from src.repositories.category_repo import CategoryRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.transaction_service import TransactionService
+    from src.services.exceptions import EntidadeNaoEncontradaError
+
+    urepo, crepo, trepo = UserRepository(db_session), CategoryRepository(db_session), TransactionRepository(db_session)
+    uid = urepo.add(User(name="Ana", email="ana@x.com")).id
+    antiga = crepo.add(Category(name="Mercado", type="Despesa"))
+    import src.repositories.db as db_mod
+    # cópia de outro worker: carregada antes das mudanças e sem reconferir a versão
+    cache = CategoryCache(db_mod.SessionLocal, check_interval=60)
+    cache.refresh()
+    nova = crepo.add(Category(name="Farmácia", type="Despesa"))
+    crepo.delete(antiga)
+    assert cache.get(nova.id) is None and cache.get(antiga.id) is not None
+
+    svc = TransactionService(trepo, urepo, crepo)
+    svc._validar_user_category(uid, nova.id, "Despesa")
+    with pytest.raises(EntidadeNaoEncontradaError):
+        svc._validar_user_category(uid, antiga.id, "Despesa")
+
+
+def test_livro_de_saldos_acompanha_escritas_e_rebuild(db_session):
+    from src.repositories.balance_repo import SQLBalanceLedger
+    from src.repositories.monthly_totals_repo import MonthlyTotalRepository
+    from src.repositories.transaction_repo import TransactionRepository
+    from src.services.finance_service import FinanceService
+
+    trepo = TransactionRepository(db_session)
+    trepo.list = trepo.list_all
+    ledger = SQLBalanceLedger(db_session)
+    with_ledger = FinanceService(trepo, ledger=ledger)
+    scan = FinanceService(trepo)
+
+    trepo.add(Transaction(amount=100, date=date(2025, 3, 10), type="Receita", user_id=1, category_id=1))
+    t = trepo.add(Transaction(amount=40, date=date(2025, 5, 2), type="Despesa", user_id=1, category_id=2))
+    trepo.bulk_add([
+        {"amount_cents": 700, "date": date(2025, 5, 20), "description": None, "type": "Despesa",
+         "user_id": 1, "category_id": 2},
+        {"amount_cents": 500, "date": date(2025, 4, 1), "description": None, "type": "Receita",
+         "user_id": 2, "category_id": 1},
+    ])
+    # retroativa: cria checkpoint de fevereiro e corrige os meses seguintes
+    trepo.add(Transaction(amount=10, date=date(2025, 2, 1), type="Despesa", user_id=1, category_id=2))
+    t.date = date(2025, 1, 15)  # muda de mês
+    trepo.update(t)
+
+    datas = [None, date(2024, 12, 31), date(2025, 1, 15), date(2025, 3, 9), date(2025, 3, 10),
+             date(2025, 5, 19), date(2025, 5, 31), date(2026, 1, 1)]
+    for uid in (1, 2, 3):
+        for d in datas:
+            assert with_ledger.balance(uid, d) == pytest.approx(scan.balance(uid, d)), (uid, d)
+
+    # consolidado mensal também acompanha a mudança de mês da instância expirada
+    assert trepo.monthly_total(1, date(2025, 1, 1), "Despesa") == 40
+    assert trepo.monthly_total(1, date(2025, 5, 1), "Despesa") == 7
+
+    trepo.delete(t)
+    assert ledger.current(1) == pytest.approx(83.0)
+    antes = {d: ledger.as_of(1, d) for d in datas[1:]}
+    MonthlyTotalRepository(db_session).rebuild()
+    assert ledger.current(1) == pytest.approx(83.0)
+    assert {d: ledger.as_of(1, d) for d in datas[1:]} == pytest.approx(antes)
+
+
+def test_valores_em_centavos_inteiros_e_somas_exatas(db_session):
+    from sqlalchemy import text
+    from src.repositories.balance_repo import SQLBalanceLedger
+    from src.repositories.transaction_repo import TransactionRepository
+
+    trepo = TransactionRepository(db_session)
+    for dia in (1, 2, 3):
+        trepo.add(Transaction(amount=0.1, date=date(2025, 7, dia), type="Despesa", user_id=1, category_id=2))
+    trepo.bulk_add([
+        {"amount_cents": 30, "date": date(2025, 7, 4), "description": None, "type": "Receita",
+         "user_id": 1, "category_id": 1},
+    ])
+
+    brutos = db_session.execute(text("SELECT amount, typeof(amount) FROM transactions")).all()
+    assert brutos == [(10, "integer")] * 3 + [(30, "integer")]
+    totais = db_session.execute(text("SELECT total FROM monthly_totals ORDER BY type")).scalars().all()
+    assert totais == [30, 30]
+
+    # em float, 0.1 + 0.1 + 0.1 == 0.30000000000000004
+    assert trepo.totals_by_type(1) == {"Despesa": 0.3, "Receita": 0.3}
+    assert trepo.monthly_total(1, date(2025, 7, 1), "Despesa") == 0.3
+    assert trepo.timeseries(1, "month", None, None) == [("2025-07-01", 0.3, 0.3)]
+    assert SQLBalanceLedger(db_session).current(1) == 0.0
+    assert SQLBalanceLedger(db_session).as_of(1, date(2025, 7, 3)) == -0.3
+
+
+def test_consolidado_e_saldos_gravam_deltas_em_centavos_sem_converter(db_session, monkeypatch):
+    from sqlalchemy import text
+    import src.models.types as types
+    from src.repositories.monthly_totals_repo import apply_rollup_deltas
+
+    def proibido(value):
+        raise AssertionError(f"conversão reais/centavos na escrita: {value!r}")
+
+    monkeypatch.setattr(types, "to_cents", proibido)
+    monkeypatch.setattr(types, "from_cents", proibido)
+    apply_rollup_deltas(db_session, {
+        (1, "2025-03", "Receita"): [1999, 2],
+        (1, "2025-01", "Despesa"): [1, 1],
+    })
+    # segunda rodada: UPDATE do consolidado, dos checkpoints e do saldo corrente
+    apply_rollup_deltas(db_session, {(1, "2025-03", "Receita"): [1, 1]})
+
+    assert db_session.execute(
+        text("SELECT year_month, type, total, count FROM monthly_totals ORDER BY year_month")
+    ).all() == [("2025-01", "Despesa", 1, 1), ("2025-03", "Receita", 2000, 3)]
+    assert db_session.execute(
+        text("SELECT year_month, balance FROM balance_checkpoints ORDER BY year_month")
+    ).all() == [("2025-01", -1), ("2025-03", 1999)]
+    assert db_session.execute(text("SELECT balance FROM user_balances")).scalar() == 1999
+
+
+def test_migracao_converte_valores_em_reais_para_centavos(tmp_path):
+    from sqlalchemy import create_engine, inspect, text
+    from src.models.base import Base
+    from src.repositories.migrations import run_migrations
+    from src.repositories.transaction_repo import TransactionRepository
+    from sqlalchemy.orm import Session
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'antigo.db'}")
+    with engine.begin() as conn:
+        # esquema antigo: valores em reais (FLOAT)
+        conn.exec_driver_sql(
+            "CREATE TABLE transactions (id INTEGER PRIMARY KEY, amount FLOAT NOT NULL, "
+            "date DATE NOT NULL, description VARCHAR(255), type VARCHAR(10) NOT NULL, "
+            "user_id INTEGER NOT NULL, category_id INTEGER NOT NULL)"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_transactions_user_date ON transactions (user_id, date)")
+        conn.exec_driver_sql(
+            "INSERT INTO transactions VALUES "
+            "(1, 1.005, '2025-01-05', 'a', 'Despesa', 1, 2), "
+            "(2, 0.1, '2025-01-06', NULL, 'Despesa', 1, 2), "
+            "(3, 0.2, '2025-02-01', NULL, 'Receita', 1, 1)"
+        )
+    Base.metadata.create_all(bind=engine)
+
+    run_migrations(engine)
+    run_migrations(engine)  # idempotente
+
+    with engine.connect() as conn:
+        linhas = conn.execute(text("SELECT id, amount, typeof(amount), description FROM transactions")).all()
+    assert linhas == [(1, 101, "integer", "a"), (2, 10, "integer", None), (3, 20, "integer", None)]
+    nomes = {ix["name"] for ix in inspect(engine).get_indexes("transactions")}
+    assert {"ix_transactions_user_date", "ix_transactions_user_type_date"} <= nomes
+    assert "transactions_old" not in inspect(engine).get_table_names()
+
+    with Session(engine) as s:
+        trepo = TransactionRepository(s)
+        assert trepo.get(1).amount == 1.01
+        assert trepo.monthly_total(1, date(2025, 1, 1), "Despesa") == 1.11
+        assert trepo.totals_by_type(1) == {"Despesa": 1.11, "Receita": 0.2}
+
+
+def _banco_com_valores_em_reais(path, amount_not_null=True):
+    from sqlalchemy import create_engine
+    from src.models.base import Base
+
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE transactions (id INTEGER PRIMARY KEY, "
+            f"amount FLOAT{' NOT NULL' if amount_not_null else ''}, "
+            "date DATE NOT NULL, description VARCHAR(255), type VARCHAR(10) NOT NULL, "
+            "user_id INTEGER NOT NULL, category_id INTEGER NOT NULL)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO transactions VALUES "
+            "(1, 1.5, '2025-01-05', NULL, 'Despesa', 1, 2), "
+            "(2, 0.1, '2025-01-06', NULL, 'Despesa', 1, 2)"
+        )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_migracao_para_centavos_que_falha_na_copia_nao_altera_o_banco(tmp_path):
+    from sqlalchemy import inspect, text
+    from sqlalchemy.exc import IntegrityError
+    from src.repositories.migrations import run_migrations
+
+    engine = _banco_com_valores_em_reais(tmp_path / "falha.db", amount_not_null=False)
+    with engine.begin() as conn:
+        # valor nulo: a cópia para a coluna NOT NULL falha depois do RENAME/CREATE
+        conn.exec_driver_sql("INSERT INTO transactions VALUES (3, NULL, '2025-01-07', NULL, 'Despesa', 1, 2)")
+
+    with pytest.raises(IntegrityError):
+        run_migrations(engine)
+
+    assert "transactions_old" not in inspect(engine).get_table_names()
+    tipo = {c["name"]: c["type"] for c in inspect(engine).get_columns("transactions")}["amount"]
+    assert "FLOAT" in str(tipo)
+    with engine.connect() as conn:
+        linhas = conn.execute(text("SELECT id, amount FROM transactions ORDER BY id")).all()
+    assert linhas == [(1, 1.5), (2, 0.1), (3, None)]
+
+
+def test_migracao_para_centavos_recupera_sobra_de_copia_interrompida(tmp_path):
+    from sqlalchemy import inspect, text
+    from src.repositories.migrations import run_migrations
+
+    engine = _banco_com_valores_em_reais(tmp_path / "sobra.db")
+    # estado deixado pela versão sem transação: antiga renomeada, nova vazia
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE transactions RENAME TO transactions_old")
+    Transaction.__table__.create(bind=engine)
+
+    run_migrations(engine)
+
+    assert "transactions_old" not in inspect(engine).get_table_names()
+    with engine.connect() as conn:
+        linhas = conn.execute(text("SELECT id, amount FROM transactions ORDER BY id")).all()
+        totais = conn.execute(text("SELECT total FROM monthly_totals")).scalars().all()
+    assert linhas == [(1, 150), (2, 10)]
+    assert totais == [160]
+
+
+def test_migracao_para_centavos_nao_mistura_sobra_divergente(tmp_path):
+    from sqlalchemy import insert
+    from src.repositories.migrations import run_migrations
+
+    engine = _banco_com_valores_em_reais(tmp_path / "diverge.db")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ALTER TABLE transactions RENAME TO transactions_old")
+    Transaction.__table__.create(bind=engine)
+    with engine.begin() as conn:  # escrita feita na tabela nova depois da falha
+        conn.execute(insert(Transaction.__table__), [
+            {"id": 1, "amount": 9, "date": date(2025, 2, 1), "type": "Receita", "user_id": 1, "category_id": 1},
+        ])
+
+    with pytest.raises(RuntimeError):
+        run_migrations(engine)
@@ -0,0 +1,160 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from src.models.transaction import Transaction
+
+
+def _capture_sql(session, fn):
+    """Executa `fn` e devolve as instruções SQL (com parâmetros) emitidas."""
+    captured = []
+    engine = session.get_bind()
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+    return captured
+
+
+def _query_plan(session, statement, parameters):
+    conn = session.connection().connection.driver_connection
+    return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+
+
+def _plans(session, fn):
+    """Planos (EXPLAIN QUERY PLAN) de cada SELECT emitido por `fn`."""
+    statements = _capture_sql(session, fn)
+    assert statements, "nenhuma consulta capturada"
+    return [" | ".join(_query_plan(session, st, params)) for st, params in statements]
+
+
+def _assert_uses_index(session, fn):
+    for plan in _plans(session, fn):
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+        assert "SCAN transactions" not in plan, plan
+
+
+@pytest.fixture
+def trepo(db_session):
+    from src.repositories.transaction_repo import TransactionRepository
+
+    repo = TransactionRepository(db_session)
+    repo.add(Transaction(amount=10, date=date(2025, 1, 1), type="Receita", user_id=1, category_id=1))
+    repo.add(Transaction(amount=5, date=date(2025, 1, 2), type="Despesa", user_id=1, category_id=2))
+    return repo
+
+
+def test_indices_compostos_existem(db_session):
+    from sqlalchemy import inspect
+
+    nomes = {ix["name"] for ix in inspect(db_session.get_bind()).get_indexes("transactions")}
+    assert {"ix_transactions_user_date", "ix_transactions_user_type_date"} <= nomes
+
+
+def test_list_by_user_usa_indice(db_session, trepo):
+    _assert_uses_index(db_session, lambda: trepo.list_by_user(1))
+
+
+def test_list_filtered_por_usuario_e_tipo_usa_indice(db_session, trepo):
+    _assert_uses_index(db_session, lambda: trepo.list_filtered(user_id=1, tipo="Despesa"))
+
+
+def test_pagina_por_usuario_usa_indice(db_session, trepo):
+    _assert_uses_index(
+        db_session,
+        lambda: trepo.list_page(user_id=1, limit=1, after=(date(2025, 1, 1), 1)),
+    )
+
+
+def test_exportacao_por_usuario_usa_indice_e_ordem_do_indice(db_session, trepo):
+    (plan,) = _plans(db_session, lambda: list(trepo.iter_rows_by_user(1)))
+    assert "SEARCH transactions USING INDEX ix_transactions_user_date (user_id=?)" in plan, plan
+    # ORDER BY date, id sai do próprio índice (user_id, date, rowid): sem ordenar em memória
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_limite_mensal_le_consolidado_pela_chave_primaria(db_session, trepo):
+    # monthly_total (create_transaction) e monthly_totals (lote/importação)
+    for fn in (
+        lambda: trepo.monthly_total(1, date(2025, 1, 15), "Despesa"),
+        lambda: trepo.monthly_totals({(1, "2025-01"), (2, "2025-02")}, "Despesa"),
+    ):
+        for plan in _plans(db_session, fn):
+            assert "SEARCH monthly_totals USING INDEX" in plan, plan
+            assert "(user_id=? AND year_month=? AND type=?)" in plan, plan
+            assert "SCAN" not in plan, plan
+
+
+def test_migracao_cria_indices_em_banco_existente(tmp_path):
+    from sqlalchemy import create_engine, inspect
+    from src.repositories.migrations import run_migrations
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'antigo.db'}")
+    with engine.begin() as conn:
+        # esquema antigo: tabela sem os índices compostos
+        conn.exec_driver_sql(
+            "CREATE TABLE transactions (id INTEGER PRIMARY KEY, amount FLOAT NOT NULL, "
+            "date DATE NOT NULL, description VARCHAR(255), type VARCHAR(10) NOT NULL, "
+            "user_id INTEGER NOT NULL, category_id INTEGER NOT NULL)"
+        )
+    from src.models.base import Base
+
+    Base.metadata.create_all(bind=engine)  # como em init_db: não toca a tabela existente
+    nomes = {ix["name"] for ix in inspect(engine).get_indexes("transactions")}
+    assert "ix_transactions_user_date" not in nomes
+
+    run_migrations(engine)
+    run_migrations(engine)  # idempotente
+
+    nomes = {ix["name"] for ix in inspect(engine).get_indexes("transactions")}
+    assert {"ix_transactions_user_date", "ix_transactions_user_type_date"} <= nomes
+
+
+def test_totais_por_tipo_usa_indice(db_session, trepo):
+    _assert_uses_index(
+        db_session,
+        lambda: trepo.totals_by_type(1, start=date(2025, 1, 1), end=date(2025, 1, 31)),
+    )
+
+
+def test_serie_temporal_usa_indice_e_agrupa_por_periodo(db_session, trepo):
+    from src.models.transaction import Transaction
+
+    # 2025-01-05 é domingo: pertence à semana iniciada na segunda 2024-12-30
+    trepo.add(Transaction(amount=7, date=date(2025, 1, 5), type="Despesa", user_id=1, category_id=2))
+    trepo.add(Transaction(amount=3, date=date(2025, 1, 6), type="Despesa", user_id=1, category_id=2))
+    trepo.add(Transaction(amount=50, date=date(2025, 2, 1), type="Receita", user_id=1, category_id=1))
+    trepo.add(Transaction(amount=99, date=date(2025, 1, 6), type="Receita", user_id=2, category_id=1))
+
+    assert trepo.timeseries(1, "week") == [
+        ("2024-12-30", 10.0, 12.0), ("2025-01-06", 0.0, 3.0), ("2025-01-27", 50.0, 0.0),
+    ]
+    assert trepo.timeseries(1, "month") == [("2025-01-01", 10.0, 15.0), ("2025-02-01", 50.0, 0.0)]
+    assert trepo.timeseries(1, "day", start=date(2025, 1, 2), end=date(2025, 1, 5)) == [
+        ("2025-01-02", 0.0, 5.0), ("2025-01-05", 0.0, 7.0),
+    ]
+    _assert_uses_index(db_session, lambda: trepo.timeseries(1, "month", date(2025, 1, 1), date(2025, 1, 31)))
+
+
+def test_relatorio_por_categoria_usa_indice_e_junta_categorias(db_session, trepo):
+    from src.models.category import Category
+    from src.models.transaction import Transaction
+
+    db_session.add_all([Category(id=1, name="Salário", type="Receita"), Category(id=2, name="Mercado", type="Despesa"),
+                        Category(id=3, name="Lazer", type="Despesa")])
+    db_session.commit()
+    trepo.add(Transaction(amount=15, date=date(2025, 1, 3), type="Despesa", user_id=1, category_id=3))
+    trepo.add(Transaction(amount=20, date=date(2025, 3, 3), type="Despesa", user_id=1, category_id=2))
+
+    assert trepo.category_breakdown(1, end=date(2025, 1, 31)) == [
+        (3, "Lazer", "Despesa", 15.0, 1), (1, "Salário", "Receita", 10.0, 1), (2, "Mercado", "Despesa", 5.0, 1),
+    ]
+    assert trepo.category_breakdown(1, tipo="Despesa")[0] == (2, "Mercado", "Despesa", 25.0, 2)
+    _assert_uses_index(db_session, lambda: trepo.category_breakdown(1, date(2025, 1, 1), date(2025, 1, 31)))
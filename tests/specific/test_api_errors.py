@@ -3,6 +3,10 @@ from pathlib import Path
 
 os.environ["DATABASE_URL"] = "sqlite:///./test_specific.db"
 
+from config.settings import reload_settings
+
+reload_settings()
+
 from src.repositories.db import init_db  
 
 dbfile = Path("test_specific.db")
@@ -0,0 +1,53 @@
+import pytest
+from pydantic import ValidationError
+
+from config.settings import Settings, get_settings, reload_settings
+
+
+def test_settings_le_e_converte_variaveis(monkeypatch):
+    monkeypatch.setenv("MONTHLY_LIMIT", " 150.5 ")
+    monkeypatch.setenv("LOG_LEVEL", "debug")
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "")
+    s = Settings.from_env()
+    assert s.monthly_limit == 150.5
+    assert s.log_level == "DEBUG"
+    assert s.sqlite_synchronous is None  # vazio = não definido
+
+
+@pytest.mark.parametrize("name,value", [("MONTHLY_LIMIT", "abc"), ("MONTHLY_LIMIT", "-1"), ("LOG_LEVEL", "VERBOSO")])
+def test_settings_invalidas_sao_rejeitadas(monkeypatch, name, value):
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValidationError):
+        Settings.from_env()
+
+
+def test_get_settings_em_cache_ate_o_reload(monkeypatch):
+    first = get_settings()
+    assert get_settings() is first
+
+    monkeypatch.setenv("MONTHLY_LIMIT", "42")
+    assert get_settings().monthly_limit == first.monthly_limit
+    assert reload_settings().monthly_limit == 42.0
+    assert get_settings() is not first
+
+
+def test_servico_usa_settings_injetadas_sem_reler_ambiente(monkeypatch):
+    from unittest.mock import Mock
+    from src.services.transaction_service import TransactionService
+
+    monkeypatch.setenv("MONTHLY_LIMIT", "999")
+    svc = TransactionService(Mock(), Mock(), Mock(), settings=Settings(monthly_limit=10.0))
+    assert svc.monthly_limit == 10.0
+
+
+def test_limite_em_centavos_calculado_uma_vez_nas_settings(monkeypatch):
+    from unittest.mock import Mock
+    from src.services import transaction_service
+    from src.services.transaction_service import TransactionService
+
+    settings = Settings(monthly_limit=0.3)
+    assert settings.monthly_limit_cents == 30
+    # construir o serviço por requisição só lê o valor já convertido
+    monkeypatch.setattr(transaction_service, "to_cents", Mock(side_effect=AssertionError))
+    svc = TransactionService(Mock(), Mock(), Mock(), settings=settings)
+    assert svc.monthly_limit_cents == 30
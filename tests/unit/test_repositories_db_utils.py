@@ -0,0 +1,53 @@
+from unittest.mock import Mock
+
+from sqlalchemy.orm import Session
+
+from src.repositories._db_utils import DBProxy, resolve_session
+
+
+def test_session_real_e_usada_sem_proxy():
+    s = Session()
+    assert resolve_session(s) is s
+
+
+def test_gerador_e_desembrulhado_na_construcao():
+    s = Session()
+
+    def dep():
+        yield s
+
+    assert resolve_session(dep()) is s
+
+
+def test_objeto_sem_sessao_fica_em_proxy_preguicoso():
+    vazio = iter(())
+    resolved = resolve_session(vazio)
+    assert isinstance(resolved, DBProxy)
+
+
+def test_proxy_resolve_uma_unica_vez():
+    session = Mock()
+
+    def dep():
+        yield session
+
+    proxy = DBProxy(dep())
+    assert proxy.query is session.query
+    assert proxy._resolved
+    assert proxy.add is session.add
+
+
+def test_commit_or_flush_fora_de_unidade_confirma_e_atualiza():
+    from src.repositories.unit_of_work import commit_or_flush, UOW_DEPTH_KEY
+
+    db = Mock()
+    obj = object()
+    commit_or_flush(db, obj)
+    db.commit.assert_called_once()
+    db.refresh.assert_called_once_with(obj)
+    db.flush.assert_not_called()
+
+    db = Mock(info={UOW_DEPTH_KEY: 1})
+    commit_or_flush(db, obj)
+    db.flush.assert_called_once()
+    db.commit.assert_not_called()
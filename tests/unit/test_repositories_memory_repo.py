@@ -161,3 +161,25 @@ def test_alias_list_equivale_list_all():
     a = SimpleNamespace(id=1)
     repo = _make_repo_with_storage([a])
     assert repo.list() == repo.list_all()
+
+
+def test_repositorio_de_transacoes_mantem_livro_de_saldos():
+    from datetime import date
+    from src.repositories.memory_repo import MemoryTransactionRepository
+
+    repo = MemoryTransactionRepository()
+    repo.add(SimpleNamespace(amount=100, type="Receita", user_id=1, date=date(2025, 3, 10)))
+    t = repo.add(SimpleNamespace(amount=30, type="Despesa", user_id=1, date=date(2025, 5, 2)))
+    repo.add(SimpleNamespace(amount=5, type="Despesa", user_id=1, date=date(2025, 1, 1)))
+    ledger = repo.ledger
+    assert ledger.current(1) == 65
+    assert ledger.as_of(1, date(2024, 12, 31)) == 0
+    assert ledger.as_of(1, date(2025, 3, 9)) == -5
+    assert ledger.as_of(1, date(2025, 4, 30)) == 95
+
+    repo.update(t.id, date=date(2025, 2, 1))
+    assert ledger.as_of(1, date(2025, 2, 28)) == -35
+    assert ledger.as_of(1, date(2025, 4, 30)) == 65
+    repo.delete(t.id)
+    assert ledger.current(1) == 95
+    assert ledger.current(2) == 0
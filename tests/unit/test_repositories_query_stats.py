@@ -0,0 +1,45 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+from src.repositories.query_stats import (
+    current_query_stats, install_query_stats, start_query_stats,
+)
+
+
+def test_contadores_somam_consultas_do_contexto():
+    engine = create_engine("sqlite://")
+    install_query_stats(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # fora de uma requisição: não conta
+        stats = start_query_stats()
+        assert current_query_stats() is stats
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    assert stats.count == 2
+    assert stats.total_ms > 0
+
+
+def test_consulta_lenta_loga_sql_e_parametros(caplog):
+    engine = create_engine("sqlite://")
+    install_query_stats(engine, slow_query_ms=1e-6)
+    with caplog.at_level(logging.WARNING, logger="fintrack"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :x"), {"x": 42})
+    (record,) = [r for r in caplog.records if r.name == "fintrack.sql"]
+    assert "SELECT ?" in record.getMessage()
+    assert "42" in record.getMessage()
+    assert record.duration_ms > 0
+
+
+def test_erro_de_sql_nao_desalinha_medicoes():
+    engine = create_engine("sqlite://")
+    install_query_stats(engine)
+    stats = start_query_stats()
+    with engine.connect() as conn:
+        try:
+            conn.execute(text("SELECT * FROM tabela_inexistente"))
+        except Exception:
+            pass
+        assert conn.info["query_started"] == []
+    assert stats.count == 0
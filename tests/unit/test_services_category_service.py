@@ -67,3 +67,20 @@ def test_get_and_update_and_delete_flow():
     with pytest.raises(ValidacaoError):
         svc.update_category(9, name=None, type_="X")
     svc.delete_category(9)
+
+
+def test_cache_serve_listas_e_e_invalidado_nas_escritas():
+    a = make_cat("A", "Receita", 1)
+    repo = make_repo([a])
+    cache = Mock()
+    cache.list_sorted.return_value = [a]
+    svc = CategoryService(repo, cache=cache)
+
+    assert svc.list_categories("Receita", "desc") == [a]
+    cache.list_sorted.assert_called_once_with("Receita", "desc")
+    repo.list_by_type.assert_not_called()
+
+    svc.create_category("B", "Despesa")
+    svc.update_category(1, "C", None)
+    svc.delete_category(1)
+    assert cache.invalidate.call_count == 3
@@ -107,3 +107,21 @@ def test_listar_retorna_lista():
     repo = _make_repo_with_storage()
     svc = FinanceService(repo)
     assert isinstance(svc.list_all(), list)
+
+
+def test_saldo_usa_livro_quando_configurado_e_filtra_data_sem_ele():
+    from datetime import date
+
+    ledger = Mock()
+    ledger.current.return_value = 10.0
+    ledger.as_of.return_value = 3.0
+    repo = _make_repo_with_storage()
+    svc = FinanceService(repo, ledger=ledger)
+    assert svc.balance(1) == 10.0
+    assert svc.balance(1, date(2025, 1, 31)) == 3.0
+    ledger.as_of.assert_called_once_with(1, date(2025, 1, 31))
+    repo.list.assert_not_called()
+
+    repo.add(SimpleNamespace(amount=100, type="Receita", user_id=1, date=date(2025, 1, 5)))
+    repo.add(SimpleNamespace(amount=30, type="Despesa", user_id=1, date=date(2025, 2, 5)))
+    assert FinanceService(repo).balance(1, date(2025, 1, 31)) == 100
@@ -4,15 +4,30 @@ from types import SimpleNamespace
 
 import pytest
 
+from config.settings import reload_settings
+
 from src.services.transaction_service import TransactionService
 from src.services.exceptions import ValidacaoError, EntidadeNaoEncontradaError
 
 
+def make_service(tx_repo, user_repo, cat_repo):
+    """TransactionService cuja validação combinada (tx_repo.lookup_refs) responde
+    a partir dos fakes de usuário e categoria."""
+    def lookup_refs(user_ids, category_ids):
+        users = {u for u in user_ids if user_repo.get(u)}
+        cats = {c: cat.type for c in category_ids if (cat := cat_repo.get(c))}
+        return users, cats
+
+    tx_repo.lookup_refs.side_effect = lookup_refs
+    return TransactionService(tx_repo, user_repo, cat_repo)
+
+
 def make_repo_with_get(return_value=None):
     m = Mock()
     m.get.return_value = return_value
     m.list_all.return_value = []
     m.list_by_user.return_value = []
+    m.monthly_total.return_value = 0.0
     m.add.return_value = return_value
     return m
 
@@ -21,7 +36,7 @@ def test_criar_valor_invalido_levanta_erro_com_mock():
     tx_repo = make_repo_with_get()
     user_repo = make_repo_with_get()
     cat_repo = make_repo_with_get()
-    svc = TransactionService(tx_repo, user_repo, cat_repo)
+    svc = make_service(tx_repo, user_repo, cat_repo)
     with pytest.raises(ValidacaoError):
         svc.create_transaction(-1, date.today(), "x", "Receita", 1, 1)
 
@@ -30,7 +45,7 @@ def test_criar_tipo_invalido_levanta_erro_com_mock():
     tx_repo = make_repo_with_get()
     user_repo = make_repo_with_get()
     cat_repo = make_repo_with_get()
-    svc = TransactionService(tx_repo, user_repo, cat_repo)
+    svc = make_service(tx_repo, user_repo, cat_repo)
     with pytest.raises(ValidacaoError):
         svc.create_transaction(10, date.today(), "x", "Invalid", 1, 1)
 
@@ -39,7 +54,7 @@ def test_validar_usuario_falta_levanta_erro_com_mock():
     tx_repo = make_repo_with_get()
     user_repo = make_repo_with_get(return_value=None)
     cat_repo = make_repo_with_get()
-    svc = TransactionService(tx_repo, user_repo, cat_repo)
+    svc = make_service(tx_repo, user_repo, cat_repo)
     with pytest.raises(EntidadeNaoEncontradaError):
         svc._validar_user_category(1, 1, "Receita")
 
@@ -48,7 +63,7 @@ def test_validar_categoria_falta_levanta_erro_com_mock():
     tx_repo = make_repo_with_get()
     user_repo = make_repo_with_get(return_value=Mock(id=1))
     cat_repo = make_repo_with_get(return_value=None)
-    svc = TransactionService(tx_repo, user_repo, cat_repo)
+    svc = make_service(tx_repo, user_repo, cat_repo)
     with pytest.raises(EntidadeNaoEncontradaError):
         svc._validar_user_category(1, 2, "Receita")
 
@@ -57,19 +72,19 @@ def test_validar_tipo_incompativel_levanta_erro_com_mock():
     tx_repo = make_repo_with_get()
     user_repo = make_repo_with_get(return_value=Mock(id=1))
     cat_repo = make_repo_with_get(return_value=Mock(id=2, type="Despesa"))
-    svc = TransactionService(tx_repo, user_repo, cat_repo)
+    svc = make_service(tx_repo, user_repo, cat_repo)
     with pytest.raises(ValidacaoError):
         svc._validar_user_category(1, 2, "Receita")
 
 
 def test_limite_mensal_aplicado_com_mock(monkeypatch):
     monkeypatch.setenv("MONTHLY_LIMIT", "50.0")
+    reload_settings()
     tx_repo = Mock()
-    existing = Mock(amount=40, date=date(2025, 1, 2), type="Despesa", user_id=1)
-    tx_repo.list_by_user.return_value = [existing]
+    tx_repo.monthly_total.return_value = 40.0
     user_repo = make_repo_with_get(return_value=Mock(id=1))
     cat_repo = make_repo_with_get(return_value=Mock(id=2, type="Despesa"))
-    svc = TransactionService(tx_repo, user_repo, cat_repo)
+    svc = make_service(tx_repo, user_repo, cat_repo)
     with pytest.raises(ValidacaoError):
         svc.create_transaction(20, date(2025, 1, 3), "x", "Despesa", 1, 2)
 
@@ -104,6 +119,22 @@ def _make_repo_with_storage(items=None):
     def list_by_user(user_id):
         return [i for i in storage if getattr(i, "user_id", None) == user_id]
 
+    def monthly_total(user_id, dt, tipo):
+        return sum(
+            i.amount for i in storage
+            if getattr(i, "user_id", None) == user_id
+            and i.type == tipo
+            and (i.date.year, i.date.month) == (dt.year, dt.month)
+        )
+
+    def list_filtered(user_id=None, tipo=None, order_by="date", order="asc"):
+        items = [
+            i for i in storage
+            if (user_id is None or getattr(i, "user_id", None) == user_id)
+            and (tipo is None or i.type.lower() == tipo.lower())
+        ]
+        return sorted(items, key=lambda t: getattr(t, order_by), reverse=order == "desc")
+
     def delete(obj):
         for i, x in enumerate(storage):
             if getattr(x, "id", None) == getattr(obj, "id", None):
@@ -122,37 +153,39 @@ def _make_repo_with_storage(items=None):
     repo.get.side_effect = get
     repo.list_all.side_effect = list_all
     repo.list_by_user.side_effect = list_by_user
+    repo.list_filtered.side_effect = list_filtered
+    repo.monthly_total.side_effect = monthly_total
     repo.delete.side_effect = delete
     repo.update.side_effect = update
     return repo
 
 
 def test_criar_valor_invalido_levanta_erro_com_fakes():
-    svc = TransactionService(_make_repo_with_storage(), _make_repo_with_storage(), _make_repo_with_storage())
+    svc = make_service(_make_repo_with_storage(), _make_repo_with_storage(), _make_repo_with_storage())
     with pytest.raises(ValidacaoError):
         svc.create_transaction(-1, date.today(), None, "Receita", 1, 1)
 
 
 def test_criar_tipo_invalido_levanta_erro_com_fakes():
-    svc = TransactionService(_make_repo_with_storage(), _make_repo_with_storage(), _make_repo_with_storage())
+    svc = make_service(_make_repo_with_storage(), _make_repo_with_storage(), _make_repo_with_storage())
     with pytest.raises(ValidacaoError):
         svc.create_transaction(10, date.today(), None, "Invalid", 1, 1)
 
 
 def test_validar_user_category_usuario_ausente_levanta_erro():
-    svc = TransactionService(_make_repo_with_storage(), _make_repo_with_storage(), _make_repo_with_storage())
+    svc = make_service(_make_repo_with_storage(), _make_repo_with_storage(), _make_repo_with_storage())
     with pytest.raises(EntidadeNaoEncontradaError):
         svc._validar_user_category(999, 1, "Receita")
 
 
 def test_validar_user_category_categoria_ausente_levanta_erro():
-    svc = TransactionService(_make_repo_with_storage(), _make_repo_with_storage([make_user(1)]), _make_repo_with_storage())
+    svc = make_service(_make_repo_with_storage(), _make_repo_with_storage([make_user(1)]), _make_repo_with_storage())
     with pytest.raises(EntidadeNaoEncontradaError):
         svc._validar_user_category(1, 999, "Receita")
 
 
 def test_validar_user_category_tipo_incompativel():
-    svc = TransactionService(_make_repo_with_storage(), _make_repo_with_storage([make_user(1)]), _make_repo_with_storage([make_category(type_="Despesa", cid=2)]))
+    svc = make_service(_make_repo_with_storage(), _make_repo_with_storage([make_user(1)]), _make_repo_with_storage([make_category(type_="Despesa", cid=2)]))
     with pytest.raises(ValidacaoError):
         svc._validar_user_category(1, 2, "Receita")
 
@@ -160,7 +193,7 @@ def test_validar_user_category_tipo_incompativel():
 def test_despesas_do_mes_soma_apenas_despesas():
     t1 = SimpleNamespace(amount=100, date=date(2025, 1, 5), type="Despesa", user_id=1)
     t2 = SimpleNamespace(amount=50, date=date(2025, 1, 6), type="Receita", user_id=1)
-    svc = TransactionService(_make_repo_with_storage([t1, t2]), _make_repo_with_storage(), _make_repo_with_storage())
+    svc = make_service(_make_repo_with_storage([t1, t2]), _make_repo_with_storage(), _make_repo_with_storage())
     assert svc._despesas_do_mes(1, date(2025, 1, 1)) == 100
 
 
@@ -169,7 +202,7 @@ def test_criar_obter_deletar_fluxo():
     tx_repo = _make_repo_with_storage([tx])
     us = _make_repo_with_storage([make_user(1)])
     cr = _make_repo_with_storage([make_category(type_="Receita", cid=1)])
-    svc = TransactionService(tx_repo, us, cr)
+    svc = make_service(tx_repo, us, cr)
     created = svc.create_transaction(20, date(2025, 3, 1), None, "Receita", 1, 1)
     got = svc.get_transaction(created.id)
     assert got.id == created.id
@@ -180,21 +213,181 @@ def test_criar_obter_deletar_fluxo():
 
 def test_criar_transacao_limite_mensal_excedido(monkeypatch):
     monkeypatch.setenv("MONTHLY_LIMIT", "50.0")
+    reload_settings()
     existing = SimpleNamespace(amount=40, date=date(2025, 5, 1), type="Despesa", user_id=1)
     repo = _make_repo_with_storage([existing])
     us = _make_repo_with_storage([make_user(1)])
     cr = _make_repo_with_storage([make_category(type_="Despesa", cid=2)])
-    svc = TransactionService(repo, us, cr)
+    svc = make_service(repo, us, cr)
     with pytest.raises(ValidacaoError):
         svc.create_transaction(20, date(2025, 5, 2), None, "Despesa", 1, 2)
 
 
+def test_limite_mensal_comparado_em_centavos(monkeypatch):
+    # 0.1 + 0.2 em float passa de 0.3; em centavos fica exatamente no limite
+    monkeypatch.setenv("MONTHLY_LIMIT", "0.3")
+    reload_settings()
+    existing = SimpleNamespace(amount=0.1, date=date(2025, 5, 1), type="Despesa", user_id=1)
+    repo = _make_repo_with_storage([existing])
+    us = _make_repo_with_storage([make_user(1)])
+    cr = _make_repo_with_storage([make_category(type_="Despesa", cid=2)])
+    svc = make_service(repo, us, cr)
+    svc.create_transaction(0.2, date(2025, 5, 2), None, "Despesa", 1, 2)
+    with pytest.raises(ValidacaoError):
+        svc.create_transaction(0.01, date(2025, 5, 3), None, "Despesa", 1, 2)
+    # valor que arredonda para zero centavo não é aceito
+    with pytest.raises(ValidacaoError):
+        svc.create_transaction(0.004, date(2025, 6, 1), None, "Despesa", 1, 2)
+    with pytest.raises(ValidacaoError, match="no máximo"):
+        svc.create_transaction(1e13, date(2025, 6, 1), None, "Despesa", 1, 2)
+    with pytest.raises(ValidacaoError, match="inválido"):
+        svc.create_transaction(1e17, date(2025, 6, 1), None, "Despesa", 1, 2)
+
+
 def test_listar_transacoes_filtrar_e_ordenar():
     a = SimpleNamespace(id=1, amount=10, date=date(2025, 1, 1), type="Receita", user_id=1)
     b = SimpleNamespace(id=2, amount=5, date=date(2025, 1, 2), type="Despesa", user_id=2)
     tx_repo = _make_repo_with_storage([a, b])
-    svc = TransactionService(tx_repo, _make_repo_with_storage(), _make_repo_with_storage())
+    svc = make_service(tx_repo, _make_repo_with_storage(), _make_repo_with_storage())
     assert svc.list_transactions(user_id=1) == [a]
     assert svc.list_transactions(tipo="Despesa") == [b]
     res3 = svc.list_transactions(order_by="amount", order="desc")
     assert res3[0].amount == 10
+
+
+def test_listar_transacoes_order_by_invalido_levanta_erro():
+    tx_repo = _make_repo_with_storage()
+    svc = make_service(tx_repo, _make_repo_with_storage(), _make_repo_with_storage())
+    with pytest.raises(ValidacaoError):
+        svc.list_transactions(order_by="description; DROP TABLE users")
+    tx_repo.list_filtered.assert_not_called()
+
+
+def _cursor(*payload):
+    import base64
+    import json
+
+    return base64.urlsafe_b64encode(json.dumps(list(payload)).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("payload", [
+    ("amount", "asc", "abc", 1),
+    ("amount", "asc", None, 1),
+    ("amount", "asc", [1], 1),
+    ("amount", "asc", 1e30, 1),
+    ("amount", "asc", True, 1),
+    ("user_id", "asc", "x", 1),
+    ("id", "asc", 1.5, 1),
+    ("date", "asc", 20250101, 1),
+    ("type", "asc", 1, 1),
+    ("amount", "asc", 1.5, True),
+    ("amount", "asc", 1.5, "1"),
+])
+def test_cursor_com_valor_de_tipo_errado_e_invalido(payload):
+    from src.services.transaction_service import _decode_cursor
+
+    with pytest.raises(ValidacaoError, match="Cursor inválido"):
+        _decode_cursor(_cursor(*payload), payload[0], "asc")
+
+
+def test_cursor_valido_devolve_chave_convertida():
+    from src.services.transaction_service import _decode_cursor
+
+    assert _decode_cursor(_cursor("date", "desc", "2025-01-02", 7), "date", "desc") == (date(2025, 1, 2), 7)
+    assert _decode_cursor(_cursor("amount", "asc", 10, 3), "amount", "asc") == (10, 3)
+    assert _decode_cursor(_cursor("user_id", "asc", 4, 3), "user_id", "asc") == (4, 3)
+
+
+def test_resumo_usa_totais_do_repositorio_e_valida_periodo():
+    tx_repo = Mock()
+    tx_repo.totals_by_type.return_value = {"Receita": 100.0, "Despesa": 30.0}
+    svc = TransactionService(tx_repo, Mock(), Mock())
+    res = svc.summarize(1, start=date(2025, 1, 1), end=date(2025, 1, 31))
+    assert res == {"user_id": 1, "receitas": 100.0, "despesas": 30.0, "saldo": 70.0}
+    tx_repo.totals_by_type.assert_called_once_with(1, start=date(2025, 1, 1), end=date(2025, 1, 31))
+    with pytest.raises(ValidacaoError):
+        svc.summarize(1, start=date(2025, 2, 1), end=date(2025, 1, 1))
+
+
+def test_serie_temporal_calcula_saldo_e_valida_periodo():
+    tx_repo = Mock()
+    tx_repo.timeseries.return_value = [("2025-01-06", 100.0, 30.0), ("2025-01-13", 0.0, 5.0)]
+    svc = TransactionService(tx_repo, Mock(), Mock())
+    res = svc.timeseries(1, "week", start=date(2025, 1, 1))
+    assert res["bucket"] == "week"
+    assert res["series"] == [
+        {"inicio": "2025-01-06", "receitas": 100.0, "despesas": 30.0, "saldo": 70.0},
+        {"inicio": "2025-01-13", "receitas": 0.0, "despesas": 5.0, "saldo": -5.0},
+    ]
+    tx_repo.timeseries.assert_called_once_with(1, "week", date(2025, 1, 1), None)
+    with pytest.raises(ValidacaoError):
+        svc.timeseries(1, "hour")
+    with pytest.raises(ValidacaoError):
+        svc.timeseries(1, "day", start=date(2025, 2, 1), end=date(2025, 1, 1))
+    assert tx_repo.timeseries.call_count == 1
+
+
+def test_relatorio_por_categoria_calcula_participacao_e_ticket_medio():
+    tx_repo = Mock()
+    tx_repo.category_breakdown.return_value = [
+        (2, "Mercado", "Despesa", 75.0, 3), (1, "Salário", "Receita", 50.0, 1), (3, "Lazer", "Despesa", 25.0, 1),
+    ]
+    svc = TransactionService(tx_repo, Mock(), Mock())
+    res = svc.category_breakdown(1, start=date(2025, 1, 1))
+    mercado, salario, lazer = res["items"]
+    assert (mercado["share"], mercado["average"], mercado["count"]) == (0.75, 25.0, 3)
+    assert (salario["share"], lazer["share"]) == (1.0, 0.25)
+    tx_repo.category_breakdown.assert_called_once_with(1, date(2025, 1, 1), None, None)
+    with pytest.raises(ValidacaoError):
+        svc.category_breakdown(1, tipo="Outro")
+    svc.category_breakdown(1, tipo="RECEITA")
+    tx_repo.category_breakdown.assert_called_with(1, None, None, "Receita")
+
+
+def test_servico_async_valida_argumentos_antes_do_repositorio():
+    import asyncio
+    from unittest.mock import AsyncMock
+    from src.services.transaction_service import AsyncTransactionService
+
+    repo = SimpleNamespace(list_page=AsyncMock(), totals_by_type=AsyncMock(return_value={"Receita": 10.0}))
+    svc = AsyncTransactionService(repo)
+
+    with pytest.raises(ValidacaoError):
+        asyncio.run(svc.list_transactions_page(order_by="description"))
+    with pytest.raises(ValidacaoError):
+        asyncio.run(svc.summarize(1, date(2025, 2, 1), date(2025, 1, 1)))
+    repo.list_page.assert_not_called()
+
+    assert asyncio.run(svc.summarize(1))["saldo"] == 10.0
+
+
+def test_validacao_usa_uma_consulta_combinada():
+    tx_repo = make_repo_with_get()
+    user_repo, cat_repo = Mock(), Mock()
+    tx_repo.lookup_refs.return_value = ({1}, {2: "Despesa"})
+    svc = TransactionService(tx_repo, user_repo, cat_repo)
+    svc._validar_user_category(1, 2, "despesa")
+    tx_repo.lookup_refs.assert_called_once_with({1}, {2})
+    user_repo.get.assert_not_called()
+    cat_repo.get.assert_not_called()
+
+
+def test_logs_do_servico_sao_preguicosos_e_estruturados(monkeypatch, caplog):
+    import logging
+    from src.services import transaction_service as ts_mod
+
+    tx_repo = _make_repo_with_storage()
+    svc = make_service(tx_repo, _make_repo_with_storage([make_user(1)]), _make_repo_with_storage([make_category(cid=1)]))
+
+    # nível desabilitado: nenhum registro é criado nem formatado
+    monkeypatch.setattr(ts_mod.log, "log", Mock(side_effect=AssertionError("não deveria logar")))
+    with caplog.at_level(logging.WARNING, logger="fintrack"):
+        svc.create_transaction(10, date(2025, 1, 1), None, "Receita", 1, 1)
+    monkeypatch.undo()
+
+    with caplog.at_level(logging.INFO, logger="fintrack"):
+        created = svc.create_transaction(5, date(2025, 1, 2), None, "Receita", 1, 1)
+    (record,) = [r for r in caplog.records if r.name.endswith("TransactionService")]
+    assert record.getMessage() == f"Transação criada com sucesso (ID={created.id}, tipo=Receita, valor=5.00)."
+    assert (record.entity, record.id, record.user_id) == ("transaction", created.id, 1)
+    assert record.duration_ms >= 0
@@ -17,6 +17,7 @@ def make_repo(users=None):
         return None
 
     m.get.side_effect = lambda i: _get(i)
+    m.get_by_email.side_effect = lambda e: next((u for u in users if u.email == e), None)
     m.add.side_effect = lambda obj: setattr(obj, "id", 1) or obj
     m.update.side_effect = lambda obj: obj
     m.delete.side_effect = lambda obj: None
@@ -66,3 +67,27 @@ def test_delete_user_flow_calls_repo_delete():
     svc = UserService(repo)
     svc.delete_user(5)
     repo.delete.assert_called()
+
+
+def test_create_user_usa_busca_por_email_e_nao_lista_todos():
+    repo = make_repo()
+    svc = UserService(repo)
+    svc.create_user("Ana", " ana@x.com ")
+    repo.get_by_email.assert_called_once_with("ana@x.com")
+    repo.list_all.assert_not_called()
+
+
+def test_integrity_error_no_insert_vira_validacao():
+    from sqlalchemy.exc import IntegrityError
+
+    repo = make_repo()
+    repo.add.side_effect = IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+    svc = UserService(repo)
+    with pytest.raises(ValidacaoError):
+        svc.create_user("Ana", "ana@x.com")
+
+    u = Mock(id=1, name="Ana", email="ana@x.com")
+    repo = make_repo([u])
+    repo.update.side_effect = IntegrityError("UPDATE", {}, Exception("UNIQUE constraint failed"))
+    with pytest.raises(ValidacaoError):
+        UserService(repo).update_user(1, email="bia@x.com")
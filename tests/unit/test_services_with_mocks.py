@@ -3,6 +3,8 @@ from unittest.mock import Mock
 
 import pytest
 
+from config.settings import reload_settings
+
 from src.services.user_service import UserService
 from src.services.transaction_service import TransactionService
 from src.services.exceptions import ValidacaoError
@@ -10,7 +12,7 @@ from src.services.exceptions import ValidacaoError
 
 def test_create_user_success_and_duplicate_email():
     repo = Mock()
-    repo.list_all.return_value = []
+    repo.get_by_email.return_value = None
 
     created = Mock(id=1, name="Alice", email="alice@example.com")
     repo.add.return_value = created
@@ -20,15 +22,14 @@ def test_create_user_success_and_duplicate_email():
     out = svc.create_user("Alice", "alice@email.com")
     assert out.id == 1
     repo.add.assert_called_once()
-    repo.list_all.return_value = [Mock(email="alice@email.com", id=2)]
+    repo.get_by_email.return_value = Mock(email="alice@email.com", id=2)
     with pytest.raises(ValidacaoError):
         svc.create_user("Alice", "alice@email.com")
 
 
 def test_transaction_create_limit_and_success_using_mocks(monkeypatch):
     tx_repo = Mock()
-    existing = Mock(amount=40, date=date(2025, 6, 1), type="Despesa", user_id=1)
-    tx_repo.list_by_user.return_value = [existing]
+    tx_repo.monthly_total.return_value = 40.0
 
     user_repo = Mock()
     user_repo.get.return_value = Mock(id=1)
@@ -36,14 +37,16 @@ def test_transaction_create_limit_and_success_using_mocks(monkeypatch):
     cat_repo.get.return_value = Mock(id=2, type="Despesa")
 
     monkeypatch.setenv("MONTHLY_LIMIT", "50.0")
+    reload_settings()
 
+    tx_repo.lookup_refs.return_value = ({1}, {2: "Despesa"})
     svc = TransactionService(tx_repo, user_repo, cat_repo)
 
 
     with pytest.raises(ValidacaoError):
         svc.create_transaction(20, date(2025, 6, 2), None, "Despesa", 1, 2)
 
-    tx_repo.list_by_user.return_value = []
+    tx_repo.monthly_total.return_value = 0.0
     created = Mock(id=5, amount=10, date=date(2025, 6, 2), type="Despesa", user_id=1)
     tx_repo.add.return_value = created
 
@@ -1,7 +1,14 @@
 import os
 import csv
 
-from src.utils.file_export import export_transactions_to_csv, import_transactions_from_csv
+import pytest
+
+from src.utils.file_export import (
+    ensure_utf8,
+    export_transactions_to_csv,
+    import_transactions_from_csv,
+    iter_transactions_csv,
+)
 from datetime import date
 
 from pathlib import Path
@@ -94,3 +101,61 @@ def test_exportar_formatacao_valor_2(tmp_path, monkeypatch):
     with open(path, newline="", encoding="utf-8") as f:
         rows = list(csv.reader(f))
     assert rows[1][2] == "1.50"
+
+
+def test_iter_csv_gera_pedacos_com_cabecalho_e_linhas():
+    txs = (
+        SimpleNamespace(id=i, amount=1.0, date=date(2025, 1, 1), type="Receita", description=None, user_id=1, category_id=1)
+        for i in range(5)
+    )
+    chunks = list(iter_transactions_csv(txs, rows_per_chunk=2))
+    assert len(chunks) == 3
+    rows = list(csv.reader("".join(chunks).splitlines()))
+    assert rows[0][0] == "id"
+    assert [r[0] for r in rows[1:]] == ["0", "1", "2", "3", "4"]
+
+
+def test_parse_linha_converte_tipos_e_formatos():
+    from src.utils.file_export import parse_transaction_row
+
+    row = {"id": "", "date": "05/03/2025", "amount": "1.234,56", "type": "despesa",
+           "description": "  ", "user_id": "3", "category_id": "4"}
+    parsed = parse_transaction_row(row)
+    assert parsed == {"amount_cents": 123456, "date": date(2025, 3, 5), "description": None,
+                      "type": "Despesa", "user_id": 3, "category_id": 4}
+    assert parse_transaction_row({**row, "date": "2025-03-05", "amount": "10.5"})["amount_cents"] == 1050
+
+
+def test_parse_linha_invalida_levanta_value_error():
+    import pytest
+    from src.utils.file_export import parse_transaction_row
+
+    base = {"date": "2025-01-01", "amount": "1", "type": "Receita", "user_id": "1", "category_id": "1"}
+    for campo, valor in (("amount", "abc"), ("date", "31/02/2025"), ("user_id", "x")):
+        with pytest.raises(ValueError):
+            parse_transaction_row({**base, campo: valor})
+
+
+def test_parse_valor_aceita_so_formatos_sem_ambiguidade():
+    import pytest
+    from src.utils.file_export import parse_transaction_row
+
+    base = {"date": "2025-01-01", "type": "Receita", "user_id": "1", "category_id": "1"}
+    for valor, esperado in (("1.234,56", 123456), ("1234,5", 123450), ("12.345.678,90", 1234567890),
+                            ("1234.56", 123456), ("7", 700), (" 0,99 ", 99), ("0.07", 7)):
+        assert parse_transaction_row({**base, "amount": valor})["amount_cents"] == esperado
+    # separadores misturados ou fora do lugar viram erro da linha, não outro valor
+    for valor in ("1,234.56", "1.234.56", "1,234,56", "12.34,56", "1.234", "1,234", "1.2345", "1e3", "-5"):
+        with pytest.raises(ValueError, match="Valor inválido"):
+            parse_transaction_row({**base, "amount": valor})
+
+
+def test_ensure_utf8_confere_o_arquivo_inteiro_e_volta_ao_inicio():
+    import io
+
+    ok = io.BytesIO("ação\n".encode("utf-8") * 10)
+    ensure_utf8(ok, block_size=3)  # caractere multibyte cortado entre blocos
+    assert ok.tell() == 0
+
+    with pytest.raises(UnicodeDecodeError):
+        ensure_utf8(io.BytesIO(b"a" * 100 + "ç".encode("latin-1")), block_size=16)
@@ -0,0 +1,33 @@
+import json
+from datetime import date
+
+import pytest
+
+from src.utils import json_response
+from src.utils.json_response import TRANSACTION_FIELDS, FastJSONResponse, dumps, rows_to_dicts
+
+
+ROW = (10.5, date(2025, 1, 2), None, "Receita", 1, 2, 7)
+
+
+def test_rows_to_dicts_segue_a_ordem_dos_campos():
+    (item,) = rows_to_dicts([ROW], TRANSACTION_FIELDS)
+    assert list(item) == ["amount", "date", "description", "type", "user_id", "category_id", "id"]
+    assert item["date"] == date(2025, 1, 2) and item["id"] == 7
+
+
+@pytest.mark.parametrize("com_orjson", [True, False])
+def test_dumps_com_e_sem_orjson(monkeypatch, com_orjson):
+    if not com_orjson:
+        monkeypatch.setattr(json_response, "orjson", None)
+    payload = {"items": rows_to_dicts([ROW], TRANSACTION_FIELDS), "next_cursor": None, "nome": "Ação"}
+    decoded = json.loads(dumps(payload))
+    assert decoded["items"][0]["date"] == "2025-01-02"
+    assert decoded["items"][0]["amount"] == 10.5
+    assert decoded["nome"] == "Ação"
+
+
+def test_fast_json_response_define_content_type():
+    resp = FastJSONResponse([{"id": 1}])
+    assert resp.media_type == "application/json"
+    assert json.loads(resp.body) == [{"id": 1}]
@@ -4,6 +4,8 @@ import importlib
 import logging
 from pathlib import Path
 
+from config.settings import reload_settings
+
 def test_obter_logger_retorna_logger():
     from src.utils.logger import get_logger
     lg = get_logger('tests')
@@ -13,6 +15,7 @@ def test_obter_logger_retorna_logger():
 def test_logger_escreve_arquivo(tmp_path, monkeypatch):
     log_path = tmp_path / 'mylogs' / 'app.log'
     monkeypatch.setenv('LOG_FILE', str(log_path))
+    reload_settings()
     import src.utils.logger as logger_mod
     importlib.reload(logger_mod)
     lg = logger_mod.get_logger('t')
@@ -22,6 +25,7 @@ def test_logger_escreve_arquivo(tmp_path, monkeypatch):
 def test_logger_child_e_nome(monkeypatch):
     tmp = Path(".tmp_logs")
     monkeypatch.setenv("LOG_FILE", str(tmp / "app.log"))
+    reload_settings()
     import src.utils.logger as logger_mod
     importlib.reload(logger_mod)
     child = logger_mod.get_logger("mymod")
@@ -32,8 +36,107 @@ def test_logger_child_e_nome(monkeypatch):
 def test_logger_escreve_arquivo_2(monkeypatch, tmp_path):
     logfile = tmp_path / "mylogs.log"
     monkeypatch.setenv("LOG_FILE", str(logfile))
+    reload_settings()
     import src.utils.logger as logger_mod
     importlib.reload(logger_mod)
     log = logger_mod.get_logger("tst")
     log.warning("hello world")
     assert logfile.exists()
+
+
+def test_modo_fila_grava_no_flush_e_reload_nao_acumula_handlers(monkeypatch, tmp_path):
+    logfile = tmp_path / "fila.log"
+    monkeypatch.setenv("LOG_FILE", str(logfile))
+    monkeypatch.setenv("LOG_MODE", "queue")
+    reload_settings()
+    import src.utils.logger as logger_mod
+    importlib.reload(logger_mod)
+    importlib.reload(logger_mod)
+
+    fintrack = logging.getLogger("fintrack")
+    assert [type(h).__name__ for h in fintrack.handlers] == ["BoundedQueueHandler"]
+
+    logger_mod.get_logger("fila").info("registro %s", 1)
+    logger_mod.flush_logging()
+    assert "registro 1" in logfile.read_text(encoding="utf-8")
+    logger_mod.start_logging()
+
+
+def test_fila_cheia_descarta_info_e_preserva_avisos():
+    import queue
+    from src.utils.logger import BoundedQueueHandler
+
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy="drop")
+    rec = lambda level: logging.makeLogRecord({"levelno": level, "msg": "m"})
+    handler.enqueue(rec(logging.INFO))
+    handler.enqueue(rec(logging.INFO))
+    assert handler.dropped == 1
+
+    # WARNING não é descartado: espera vaga na fila
+    import threading
+    t = threading.Thread(target=handler.enqueue, args=(rec(logging.WARNING),))
+    t.start()
+    t.join(0.05)
+    assert t.is_alive()
+    handler.queue.get_nowait()
+    t.join(1)
+    assert not t.is_alive()
+    assert handler.queue.get_nowait().levelno == logging.WARNING
+    assert handler.dropped == 1
+
+
+def test_fila_cheia_espera_no_maximo_block_timeout(monkeypatch):
+    import queue
+    from src.utils.logger import BoundedQueueHandler
+
+    handler = BoundedQueueHandler(queue.Queue(maxsize=1), policy="block")
+    monkeypatch.setattr(handler, "block_timeout", 0.01)
+    rec = logging.makeLogRecord({"levelno": logging.ERROR, "msg": "m"})
+    handler.enqueue(rec)
+    handler.enqueue(rec)
+    assert handler.dropped == 1
+
+
+def test_depois_do_flush_grava_direto_sem_bloquear(monkeypatch, tmp_path):
+    logfile = tmp_path / "parado.log"
+    monkeypatch.setenv("LOG_FILE", str(logfile))
+    monkeypatch.setenv("LOG_MODE", "queue")
+    monkeypatch.setenv("LOG_QUEUE_SIZE", "5")
+    monkeypatch.setenv("LOG_QUEUE_POLICY", "block")
+    reload_settings()
+    import src.utils.logger as logger_mod
+    importlib.reload(logger_mod)
+
+    logger_mod.flush_logging()
+    log = logger_mod.get_logger("parado")
+    for i in range(20):  # mais que a fila comporta, sem consumidor
+        log.warning("depois do flush %s", i)
+    assert "depois do flush 19" in logfile.read_text(encoding="utf-8")
+    assert logger_mod.queue_handler.queue.empty()
+    logger_mod.start_logging()
+
+
+def test_modo_sync_usa_handler_de_arquivo_direto(monkeypatch, tmp_path):
+    monkeypatch.setenv("LOG_FILE", str(tmp_path / "sync.log"))
+    monkeypatch.setenv("LOG_MODE", "sync")
+    reload_settings()
+    import src.utils.logger as logger_mod
+    importlib.reload(logger_mod)
+    assert logging.getLogger("fintrack").handlers == [logger_mod.rotating_handler]
+    logger_mod.get_logger("s").warning("direto")
+    assert "direto" in (tmp_path / "sync.log").read_text(encoding="utf-8")
+
+
+def test_json_formatter_emite_campos_estruturados():
+    import json
+    from src.utils.logger import JsonFormatter
+
+    record = logging.makeLogRecord({
+        "name": "fintrack.TransactionService", "levelno": logging.INFO, "levelname": "INFO",
+        "msg": "Transação criada (ID=%s).", "args": (7,),
+        "entity": "transaction", "id": 7, "user_id": 3, "duration_ms": 1.25,
+    })
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Transação criada (ID=7)."
+    assert (entry["entity"], entry["id"], entry["user_id"], entry["duration_ms"]) == ("transaction", 7, 3, 1.25)
+    assert entry["level"] == "INFO" and entry["logger"] == "fintrack.TransactionService"
@@ -0,0 +1,66 @@
+import json
+import os
+
+from src.utils.metrics import Registry
+
+
+def test_histograma_renderiza_faixas_cumulativas():
+    reg = Registry()
+    h = reg.histogram("lat_seconds", "Latência.", ("route",), buckets=(0.1, 1.0))
+    h.observe(0.05, "/a")
+    h.observe(0.5, "/a")
+    h.observe(3.0, "/a")
+    text = reg.render()
+    assert '# TYPE lat_seconds histogram' in text
+    assert 'lat_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'lat_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'lat_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'lat_seconds_sum{route="/a"} 3.55' in text
+    assert 'lat_seconds_count{route="/a"} 3' in text
+
+
+def test_contador_e_gauge_com_labels_escapados():
+    reg = Registry()
+    c = reg.counter("eventos_total", "Eventos.", ("nome",))
+    g = reg.gauge("em_andamento", "Em andamento.")
+    c.inc('a"b')
+    c.inc('a"b', amount=2)
+    g.inc()
+    g.inc()
+    g.dec()
+    text = reg.render()
+    assert 'eventos_total{nome="a\\"b"} 3' in text
+    assert "em_andamento 1" in text
+
+
+def test_render_soma_snapshots_de_outros_workers(tmp_path):
+    reg = Registry()
+    c = reg.counter("criadas_total", "Criadas.")
+    h = reg.histogram("lat_seconds", "Latência.", buckets=(1.0,))
+    c.inc(amount=2)
+    h.observe(0.5)
+    outro = {"criadas_total": [[[], 5]], "lat_seconds": [[[], [[0, 1], 2.0, 1]]]}
+    (tmp_path / "999999.json").write_text(json.dumps(outro))
+    (tmp_path / "lixo.json.tmp").write_text("{")  # escrita em andamento: ignorada
+
+    text = reg.render(str(tmp_path))
+    assert "criadas_total 7" in text
+    assert 'lat_seconds_bucket{le="1"} 1' in text
+    assert 'lat_seconds_bucket{le="+Inf"} 2' in text
+    assert "lat_seconds_count 2" in text
+
+    reg.write_snapshot(str(tmp_path))
+    assert {p.name for p in tmp_path.glob("*.json")} == {"999999.json", f"{os.getpid()}.json"}
+
+
+def test_contagens_de_varias_threads_sao_somadas():
+    import threading
+
+    reg = Registry()
+    c = reg.counter("eventos_total", "Eventos.")
+    threads = [threading.Thread(target=lambda: [c.inc() for _ in range(1000)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c.dump() == [[[], 4000]]
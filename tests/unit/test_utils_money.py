@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+import pytest
+
+from src.utils.money import from_cents, sum_money, to_cents
+
+
+@pytest.mark.parametrize(
+    "valor, centavos",
+    [(10, 1000), (0.1, 10), (1.005, 101), (2.675, 268), (-1.005, -101), (Decimal("19.999"), 2000)],
+)
+def test_to_cents_arredonda_meio_centavo_para_cima(valor, centavos):
+    assert to_cents(valor) == centavos
+
+
+def test_from_cents_volta_para_reais():
+    assert from_cents(101) == 1.01
+    assert from_cents(to_cents(0.1) + to_cents(0.2)) == 0.3
+
+
+def test_sum_money_nao_acumula_erro_de_ponto_flutuante():
+    assert sum([0.1] * 10) != 1.0
+    assert sum_money([0.1] * 10) == 1.0
+
+
+@pytest.mark.parametrize("valor", [float("nan"), float("inf"), 1e17, -1e17, 1e30, 10**17])
+def test_to_cents_rejeita_valores_nao_finitos_ou_fora_do_int64(valor):
+    with pytest.raises(ValueError):
+        to_cents(valor)